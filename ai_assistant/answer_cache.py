@@ -0,0 +1,143 @@
+# ai_assistant/answer_cache.py
+
+import hashlib
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from crm.services.text_normalization import normalize_name
+
+ARABIC_SCRIPT = re.compile('[\u0600-\u06ff\u0750-\u077f]')
+INDEX_KEY = 'ai:answers:lru'
+METRIC_KEYS = ('hits', 'misses', 'hit_us', 'miss_us')
+
+
+def question_language(question):
+    """
+    The language the assistant answers in: it replies in the language of
+    the question, so Arabic script means Arabic and anything else English.
+    """
+    return 'ar' if ARABIC_SCRIPT.search(question or '') else 'en'
+
+
+def normalize_question(question):
+    """
+    Folds a question so trivially different spellings share an answer:
+    case, punctuation, spacing, Latin accents and Arabic letter variants
+    and diacritics are ignored. "What is Ihram?" and "what is ihram"
+    normalize alike.
+    """
+    return normalize_name(question)
+
+
+class AnswerCache:
+    """
+    Caches assistant answers per normalized question and language in the
+    Django cache, so the questions agents repeat (ihram, visa, vaccines)
+    are answered in milliseconds without spending API quota.
+
+    Entries expire after AI_CACHE_TIMEOUT seconds. An index of the entry
+    keys, most recently used last, keeps at most AI_CACHE_MAX_ENTRIES
+    answers and evicts the least recently used. The index is advisory:
+    concurrent writers may lose an update, which at worst leaves an entry
+    to expire by its TTL.
+
+    Hit and miss counts and their total latency are kept as counters in
+    the same cache; see stats().
+    """
+    @staticmethod
+    def key_for(question):
+        normalized = normalize_question(question)
+        if not normalized:
+            return None
+        digest = hashlib.sha256(normalized.encode()).hexdigest()[:32]
+        return f"ai:answer:{question_language(question)}:{digest}"
+
+    @classmethod
+    def get(cls, question):
+        """Returns the cached answer to `question`, or None."""
+        key = cls.key_for(question)
+        answer = cache.get(key) if key else None
+        if answer is not None:
+            cls._touch(key)
+        return answer
+
+    @classmethod
+    def set(cls, question, answer):
+        key = cls.key_for(question)
+        if key:
+            cache.set(key, answer, settings.AI_CACHE_TIMEOUT)
+            cls._touch(key)
+
+    @classmethod
+    def get_or_compute(cls, question, compute):
+        """
+        Returns the cached answer to `question`, or calls compute(question),
+        which returns (answer, cacheable), and caches the answer when it is
+        cacheable. Error messages should not be cacheable.
+        """
+        started = time.perf_counter()
+        answer = cls.get(question)
+        if answer is not None:
+            cls.record(True, started)
+            return answer
+
+        answer, cacheable = compute(question)
+        if cacheable:
+            cls.set(question, answer)
+        cls.record(False, started)
+        return answer
+
+    @staticmethod
+    def _touch(key):
+        index = [k for k in cache.get(INDEX_KEY, []) if k != key]
+        index.append(key)
+        evicted = index[:-settings.AI_CACHE_MAX_ENTRIES] if len(index) > settings.AI_CACHE_MAX_ENTRIES else []
+        if evicted:
+            cache.delete_many(evicted)
+            index = index[len(evicted):]
+        cache.set(INDEX_KEY, index, settings.AI_CACHE_TIMEOUT)
+
+    @staticmethod
+    def _incr(key, delta):
+        key = f"ai:metrics:{key}"
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            if not cache.add(key, delta, timeout=None):
+                cache.incr(key, delta)
+
+    @classmethod
+    def record(cls, hit, started):
+        """Counts a hit or miss that took since `started` (perf_counter)."""
+        counter, latency = ('hits', 'hit_us') if hit else ('misses', 'miss_us')
+        cls._incr(counter, 1)
+        cls._incr(latency, int((time.perf_counter() - started) * 1_000_000))
+
+    @staticmethod
+    def stats():
+        """
+        Returns the hit rate and the average latency of hits and misses
+        (in milliseconds) since the counters were last reset.
+        """
+        values = cache.get_many([f"ai:metrics:{k}" for k in METRIC_KEYS])
+        hits, misses, hit_us, miss_us = (values.get(f"ai:metrics:{k}", 0) for k in METRIC_KEYS)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else 0.0,
+            'avg_hit_ms': round(hit_us / hits / 1000, 3) if hits else 0.0,
+            'avg_miss_ms': round(miss_us / misses / 1000, 3) if misses else 0.0,
+            'entries': len(cache.get(INDEX_KEY, [])),
+        }
+
+    @staticmethod
+    def reset_stats():
+        cache.delete_many([f"ai:metrics:{k}" for k in METRIC_KEYS])
+
+    @staticmethod
+    def clear():
+        cache.delete_many(cache.get(INDEX_KEY, []) + [INDEX_KEY])
@@ -5,22 +5,54 @@ import json
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
+from core.services.http_client import get_session
+from .answer_cache import AnswerCache
+
 class OpenRouterService:
     """
     A service to interact with the OpenRouter.ai API for AI completions.
     This version is updated to match OpenRouter's recommended request format.
     """
-    API_URL = "https://openrouter.ai/api/v1/chat/completions"
-    
+    # The endpoint is settings.OPENROUTER_API_URL, so tests and local
+    # development can point it at a fake completion server.
+
     # Define site details as recommended by OpenRouter for API calls
     SITE_URL = "http://127.0.0.1:8000" # Use your actual domain in production
     SITE_TITLE = "HajjUmrahFlow"
 
+    @staticmethod
+    def session():
+        """
+        The shared, pooled HTTP session for the completion API. Gateway
+        errors are retried, as a completion has no side effects. Rate limits
+        (429) are not: urllib3 would wait out any Retry-After the API sends,
+        holding the request thread, and each retry spends more quota.
+        """
+        return get_session(
+            'ai',
+            connect_timeout=settings.AI_HTTP_CONNECT_TIMEOUT,
+            pool_size=settings.AI_HTTP_MAX_KEEPALIVE,
+            retry_statuses=(502, 503, 504),
+            retry_methods=('POST',),
+        )
+
     @staticmethod
     def get_ai_response(question: str) -> str:
-        api_key = settings.OPENROUTER_API_KEY
-        if not api_key:
+        """
+        Answers a question, from the AnswerCache when the same question was
+        asked before. Only successful completions are cached.
+        """
+        if not settings.OPENROUTER_API_KEY:
             return str(_("AI service is not configured. API key is missing."))
+        return AnswerCache.get_or_compute(question, OpenRouterService.request_completion)
+
+    @staticmethod
+    def build_request(question: str, stream: bool = False):
+        """
+        Returns the headers and JSON payload of a chat completion request.
+        With `stream`, the API answers with server-sent events.
+        """
+        api_key = settings.OPENROUTER_API_KEY
 
         system_prompt = (
             "You are a helpful assistant for a travel agency specializing in Hajj and Umrah trips. "
@@ -47,10 +79,21 @@ class OpenRouterService:
             ]
         }
         # --- END OF MODEL SELECTION ---
+        if stream:
+            payload["stream"] = True
+        return headers, payload
+
+    @staticmethod
+    def request_completion(question: str):
+        """
+        Calls the completion API. Returns (text, ok); on failure the text is
+        a message for the user and ok is False.
+        """
+        headers, payload = OpenRouterService.build_request(question)
 
         try:
-            response = requests.post(
-                url=OpenRouterService.API_URL,
+            response = OpenRouterService.session().post(
+                url=settings.OPENROUTER_API_URL,
                 headers=headers,
                 data=json.dumps(payload),
                 timeout=30
@@ -59,19 +102,19 @@ class OpenRouterService:
             response.raise_for_status()
             
             data = response.json()
-            return data['choices'][0]['message']['content']
+            return data['choices'][0]['message']['content'], True
 
         except requests.exceptions.HTTPError as http_err:
             error_details = response.json().get('error', {}).get('message', response.text)
             print(f"HTTP error occurred: {http_err} - Details: {error_details}")
             if response.status_code == 401:
-                return str(_("Authentication error. Please check your OpenRouter API key."))
-            return str(_(f"An API error occurred: {response.status_code}"))
+                return str(_("Authentication error. Please check your OpenRouter API key.")), False
+            return str(_(f"An API error occurred: {response.status_code}")), False
             
         except requests.exceptions.RequestException as e:
             print(f"Error connecting to OpenRouter API: {e}")
-            return str(_("Sorry, I am having trouble connecting to the AI service. Please check your network connection."))
+            return str(_("Sorry, I am having trouble connecting to the AI service. Please check your network connection.")), False
             
         except (KeyError, IndexError) as e:
             print(f"Unexpected API response format: {e}")
-            return str(_("Sorry, I received an unexpected response from the AI service."))
\ No newline at end of file
+            return str(_("Sorry, I received an unexpected response from the AI service.")), False
\ No newline at end of file
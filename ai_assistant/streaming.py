@@ -0,0 +1,135 @@
+# ai_assistant/streaming.py
+
+import json
+import time
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext as _
+
+from core.services import http_client
+from .answer_cache import AnswerCache
+from .services import OpenRouterService
+
+
+def get_async_client():
+    """The pooled async client for the completion API."""
+    return http_client.get_async_client(
+        'ai',
+        max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+        max_keepalive=settings.AI_HTTP_MAX_KEEPALIVE,
+        connect_timeout=settings.AI_HTTP_CONNECT_TIMEOUT,
+        read_timeout=settings.AI_HTTP_READ_TIMEOUT,
+    )
+
+
+class CompletionStreamError(Exception):
+    """A streamed completion failed; the message is meant for the user."""
+
+
+async def stream_completion(question):
+    """
+    Yields the answer to `question` piece by piece as the completion API
+    streams it (OpenAI-style server-sent events ending with [DONE]).
+    """
+    headers, payload = OpenRouterService.build_request(question, stream=True)
+    try:
+        async with get_async_client().stream(
+            'POST', settings.OPENROUTER_API_URL, headers=headers, json=payload
+        ) as response:
+            if response.status_code == 401:
+                raise CompletionStreamError(_("Authentication error. Please check your OpenRouter API key."))
+            if response.status_code >= 400:
+                raise CompletionStreamError(_("An API error occurred: %(status)s") % {'status': response.status_code})
+            async for line in response.aiter_lines():
+                # Blank lines separate events; ":" lines are keep-alive comments.
+                if not line.startswith('data:'):
+                    continue
+                data = line[5:].strip()
+                if data == '[DONE]':
+                    return
+                try:
+                    delta = json.loads(data)['choices'][0].get('delta', {}).get('content')
+                except (ValueError, KeyError, IndexError, AttributeError):
+                    raise CompletionStreamError(_("Sorry, I received an unexpected response from the AI service."))
+                if delta:
+                    yield delta
+    except httpx.HTTPError:
+        raise CompletionStreamError(
+            _("Sorry, I am having trouble connecting to the AI service. Please check your network connection.")
+        )
+
+
+class StreamLimiter:
+    """
+    Caps the AI streams a user has open at once (AI_STREAM_MAX_PER_USER),
+    counted in the shared cache so the limit holds across ASGI workers.
+    The counter expires after the read timeout, so a worker that dies
+    mid-stream cannot lock a user out for good.
+    """
+    @staticmethod
+    def _key(user_id):
+        return f"ai:streams:{user_id}"
+
+    @classmethod
+    async def acquire(cls, user_id):
+        key = cls._key(user_id)
+        timeout = int(settings.AI_HTTP_READ_TIMEOUT * 2)
+        if await cache.aadd(key, 1, timeout=timeout):
+            count = 1
+        else:
+            try:
+                count = await cache.aincr(key)
+            except ValueError:
+                await cache.aadd(key, 1, timeout=timeout)
+                count = 1
+        if count > settings.AI_STREAM_MAX_PER_USER:
+            await cls.release(user_id)
+            return False
+        return True
+
+    @classmethod
+    async def release(cls, user_id):
+        try:
+            await cache.adecr(cls._key(user_id))
+        except ValueError:
+            pass
+
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def answer_events(question, user_id):
+    """
+    Server-sent events answering `question`: "token" events carrying text,
+    then "done", or "error" with a message. Cached answers are sent as a
+    single token; streamed answers are cached once complete. Releases the
+    user's StreamLimiter slot when the stream ends or the client leaves.
+    """
+    started = time.perf_counter()
+    try:
+        cached = await sync_to_async(AnswerCache.get)(question)
+        if cached is not None:
+            await sync_to_async(AnswerCache.record)(True, started)
+            yield sse('token', {'text': cached})
+            yield sse('done', {'cached': True})
+            return
+
+        parts = []
+        try:
+            async for token in stream_completion(question):
+                parts.append(token)
+                yield sse('token', {'text': token})
+        except CompletionStreamError as e:
+            yield sse('error', {'error': str(e)})
+            return
+
+        if parts:
+            await sync_to_async(AnswerCache.set)(question, ''.join(parts))
+        await sync_to_async(AnswerCache.record)(False, started)
+        yield sse('done', {'cached': False})
+    finally:
+        await StreamLimiter.release(user_id)
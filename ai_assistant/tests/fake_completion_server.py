@@ -0,0 +1,107 @@
+# ai_assistant/tests/fake_completion_server.py
+
+"""
+A local stand-in for the OpenRouter chat completions API.
+
+It answers every question with "You asked: <question>", as one JSON
+completion or, when the request sets "stream": true, as server-sent
+events carrying one word each and ending with [DONE].
+
+Tests start it in a thread with FakeCompletionServer(); for manual
+testing run it on its own and point the app at it:
+
+    python -m ai_assistant.tests.fake_completion_server --port 8765
+    OPENROUTER_API_URL=http://127.0.0.1:8765/chat/completions OPENROUTER_API_KEY=fake ...
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class CompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        server.requests.append(body)
+        if server.status != 200:
+            self._send(server.status, 'application/json', json.dumps({'error': {'message': 'fake failure'}}).encode())
+            return
+
+        question = body['messages'][-1]['content']
+        words = f"You asked: {question}".split(' ')
+        if not body.get('stream'):
+            answer = {'choices': [{'message': {'role': 'assistant', 'content': ' '.join(words)}}]}
+            self._send(200, 'application/json', json.dumps(answer).encode())
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        self._chunk(b': FAKE PROCESSING\n\n')
+        for i, word in enumerate(words):
+            time.sleep(server.delay)
+            delta = {'choices': [{'delta': {'content': word if i == 0 else ' ' + word}}]}
+            self._chunk(f"data: {json.dumps(delta)}\n\n".encode())
+        self._chunk(b'data: [DONE]\n\n')
+        self._chunk(b'')
+
+    def _send(self, status, content_type, payload):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+class FakeCompletionServer:
+    """
+    Runs the fake API on a free local port for the duration of a `with`
+    block. `status` makes every request fail with that HTTP status and
+    `delay` pauses between streamed words. `requests` records the JSON
+    bodies received.
+    """
+    def __init__(self, status=200, delay=0.0, port=0):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), CompletionHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.status = status
+        self.httpd.delay = delay
+        self.httpd.requests = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/chat/completions"
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.05, help="seconds between streamed words")
+    args = parser.parse_args()
+    with FakeCompletionServer(delay=args.delay, port=args.port) as fake:
+        print(f"Fake completion API on {fake.url}")
+        threading.Event().wait()
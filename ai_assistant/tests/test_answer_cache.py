@@ -0,0 +1,75 @@
+# ai_assistant/tests/test_answer_cache.py
+
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from users.models import CustomUser
+from ai_assistant.answer_cache import AnswerCache, normalize_question, question_language
+from ai_assistant.services import OpenRouterService
+
+
+@override_settings(OPENROUTER_API_KEY='test-key', AI_CACHE_MAX_ENTRIES=3)
+class AnswerCacheTest(TestCase):
+    """
+    Tests the normalized, language-aware answer cache in front of the
+    completion API.
+    """
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(
+            OpenRouterService, 'request_completion', side_effect=lambda q: (f'answer to {q}', True)
+        )
+        self.completion = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_normalization_and_language(self):
+        self.assertEqual(normalize_question('  What is IHRAM? '), normalize_question('what is ihram'))
+        self.assertEqual(normalize_question('ما هو الإحرام؟'), normalize_question('ما هو الاحرام'))
+        self.assertEqual(question_language('ما هو الإحرام؟'), 'ar')
+        self.assertEqual(question_language('What is ihram?'), 'en')
+
+    def test_repeated_questions_skip_the_api(self):
+        first = OpenRouterService.get_ai_response('What is Ihram?')
+        second = OpenRouterService.get_ai_response('what is ihram')
+        self.assertEqual(first, second)
+        self.assertEqual(self.completion.call_count, 1)
+
+        OpenRouterService.get_ai_response('ما هو الإحرام؟')
+        self.assertEqual(self.completion.call_count, 2)
+
+        stats = AnswerCache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+        self.assertAlmostEqual(stats['hit_rate'], 1 / 3, places=3)
+        self.assertEqual(stats['entries'], 2)
+
+    def test_errors_are_not_cached(self):
+        self.completion.side_effect = lambda q: ('Sorry', False)
+        OpenRouterService.get_ai_response('Visa rules?')
+        self.completion.side_effect = lambda q: ('Visa answer', True)
+        self.assertEqual(OpenRouterService.get_ai_response('Visa rules?'), 'Visa answer')
+
+    def test_least_recently_used_answer_is_evicted(self):
+        for question in ('visa', 'vaccines', 'ihram'):
+            OpenRouterService.get_ai_response(question)
+        OpenRouterService.get_ai_response('visa')  # now most recently used
+        OpenRouterService.get_ai_response('zamzam')  # evicts "vaccines"
+        self.assertEqual(AnswerCache.stats()['entries'], 3)
+
+        self.completion.reset_mock()
+        OpenRouterService.get_ai_response('visa')
+        self.assertEqual(self.completion.call_count, 0)
+        OpenRouterService.get_ai_response('vaccines')
+        self.assertEqual(self.completion.call_count, 1)
+
+    def test_stats_view_is_for_managers(self):
+        url = reverse('ai_assistant:cache-stats')
+        self.assertRedirects(self.client.get(url), f"{reverse('login')}?next={url}", fetch_redirect_response=False)
+        agent = CustomUser.objects.create_user(username='agent', email='agent@test.com', role='agent')
+        manager = CustomUser.objects.create_user(username='boss', email='boss@test.com', role='manager')
+        self.client.force_login(agent)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(manager)
+        self.assertEqual(self.client.get(url).json()['hits'], 0)
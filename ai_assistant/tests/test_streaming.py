@@ -0,0 +1,120 @@
+# ai_assistant/tests/test_streaming.py
+
+import json
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from users.models import CustomUser
+from ai_assistant.services import OpenRouterService
+from ai_assistant.streaming import StreamLimiter
+from .fake_completion_server import FakeCompletionServer
+
+
+def parse_events(body):
+    events = []
+    for block in body.decode().strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+@override_settings(OPENROUTER_API_KEY='test-key', AI_STREAM_MAX_PER_USER=1)
+class AskAIStreamViewTest(TestCase):
+    """
+    Tests the async server-sent events endpoint against a local fake
+    completion server.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = CustomUser.objects.create_user(username='agent', email='agent@test.com', role='agent')
+        cls.url = reverse('ai_assistant:ask-stream')
+
+    def setUp(self):
+        cache.clear()
+
+    async def ask(self, question):
+        response = await self.async_client.post(self.url, {'question': question}, content_type='application/json')
+        if not response.streaming:
+            return response, None
+        return response, parse_events(b''.join([chunk async for chunk in response.streaming_content]))
+
+    async def test_tokens_are_streamed_then_cached(self):
+        await self.async_client.aforce_login(self.agent)
+        with FakeCompletionServer() as fake, self.settings(OPENROUTER_API_URL=fake.url):
+            response, events = await self.ask('What is ihram?')
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+            tokens = [data['text'] for event, data in events if event == 'token']
+            self.assertGreater(len(tokens), 1)
+            self.assertEqual(''.join(tokens), 'You asked: What is ihram?')
+            self.assertEqual(events[-1], ('done', {'cached': False}))
+            self.assertTrue(fake.requests[0]['stream'])
+
+            _, events = await self.ask('what is IHRAM')
+            self.assertEqual(events, [('token', {'text': 'You asked: What is ihram?'}), ('done', {'cached': True})])
+            self.assertEqual(len(fake.requests), 1)
+
+    async def test_api_errors_become_error_events(self):
+        await self.async_client.aforce_login(self.agent)
+        with FakeCompletionServer(status=500) as fake, self.settings(OPENROUTER_API_URL=fake.url):
+            _, events = await self.ask('Visa rules?')
+        self.assertEqual(events[0][0], 'error')
+        self.assertIn('500', events[0][1]['error'])
+
+    async def test_per_user_concurrency_limit(self):
+        await self.async_client.aforce_login(self.agent)
+        self.assertTrue(await StreamLimiter.acquire(self.agent.pk))
+        response, _ = await self.ask('Vaccines?')
+        self.assertEqual(response.status_code, 429)
+
+        await StreamLimiter.release(self.agent.pk)
+        with FakeCompletionServer() as fake, self.settings(OPENROUTER_API_URL=fake.url):
+            response, _ = await self.ask('Vaccines?')
+            self.assertEqual(response.status_code, 200)
+            # The finished stream gave its slot back.
+            response, _ = await self.ask('Zamzam?')
+            self.assertEqual(response.status_code, 200)
+
+    async def test_login_required(self):
+        response, _ = await self.ask('Hello')
+        self.assertEqual(response.status_code, 401)
+
+    def test_blocking_client_against_fake_server(self):
+        with FakeCompletionServer() as fake, self.settings(OPENROUTER_API_URL=fake.url):
+            self.assertEqual(OpenRouterService.request_completion('Hi'), ('You asked: Hi', True))
+
+
+class StreamUrlTest(TestCase):
+    """
+    Tests that pages only offer the streaming endpoint when served over
+    ASGI, where its responses are actually streamed.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = CustomUser.objects.create_user(username='stream_agent', email='stream_agent@test.com', role='agent')
+
+    def test_wsgi_pages_fall_back_to_the_plain_endpoint(self):
+        self.client.force_login(self.agent)
+        response = self.client.get(reverse('dashboard'))
+        self.assertContains(response, 'data-ai-ask-url')
+        self.assertNotContains(response, 'data-ai-stream-url')
+
+    async def test_asgi_pages_offer_the_stream(self):
+        await self.async_client.aforce_login(self.agent)
+        response = await self.async_client.get(reverse('dashboard'))
+        self.assertContains(response, f'data-ai-stream-url="{reverse("ai_assistant:ask-stream")}"')
+
+
+@override_settings(OPENROUTER_API_KEY='test-key')
+class CompletionRetryTest(SimpleTestCase):
+    """
+    Tests which failures of the completion API are retried.
+    """
+
+    def test_rate_limits_are_not_retried(self):
+        with FakeCompletionServer(status=429) as fake, self.settings(OPENROUTER_API_URL=fake.url):
+            text, ok = OpenRouterService.request_completion('What is ihram?')
+        self.assertFalse(ok)
+        self.assertEqual(len(fake.requests), 1)
@@ -1,10 +1,12 @@
 # ai_assistant/urls.py
 
 from django.urls import path
-from .views import AskAIView
+from .views import AskAIView, AskAIStreamView, AICacheStatsView
 
 app_name = 'ai_assistant'
 
 urlpatterns = [
     path('ask/', AskAIView.as_view(), name='ask'),
+    path('ask/stream/', AskAIStreamView.as_view(), name='ask-stream'),
+    path('cache-stats/', AICacheStatsView.as_view(), name='cache-stats'),
 ]
\ No newline at end of file
@@ -1,10 +1,14 @@
 # ai_assistant/views.py
 
 import json
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
+from users.mixins import ManagerRequiredMixin
+from .answer_cache import AnswerCache
 from .services import OpenRouterService
+from .streaming import StreamLimiter, answer_events
 
 class AskAIView(LoginRequiredMixin, View):
     """
@@ -25,4 +29,40 @@ class AskAIView(LoginRequiredMixin, View):
             return JsonResponse({'answer': ai_response})
 
         except json.JSONDecodeError:
-            return JsonResponse({'error': 'Invalid JSON in request body.'}, status=400)
\ No newline at end of file
+            return JsonResponse({'error': 'Invalid JSON in request body.'}, status=400)
+
+class AskAIStreamView(View):
+    """
+    Streams the answer to a question as server-sent events. The view is
+    async: under core.asgi it holds no worker thread while waiting on the
+    AI service, so slow completions cannot starve the views serving
+    bookings. Each user may have AI_STREAM_MAX_PER_USER streams open.
+    """
+    async def post(self, request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return JsonResponse({'error': 'Authentication required.'}, status=401)
+        try:
+            question = json.loads(request.body).get('question')
+        except (json.JSONDecodeError, AttributeError):
+            return JsonResponse({'error': 'Invalid JSON in request body.'}, status=400)
+        if not question:
+            return JsonResponse({'error': 'No question provided.'}, status=400)
+        if not settings.OPENROUTER_API_KEY:
+            return JsonResponse({'error': 'AI service is not configured.'}, status=503)
+        if not await StreamLimiter.acquire(user.pk):
+            return JsonResponse({'error': 'Too many questions in progress. Please wait for an answer.'}, status=429)
+
+        response = StreamingHttpResponse(answer_events(question, user.pk), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx from buffering the stream.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class AICacheStatsView(LoginRequiredMixin, ManagerRequiredMixin, View):
+    """
+    Returns the answer cache hit rate and latency metrics as JSON.
+    """
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(AnswerCache.stats())
@@ -1,7 +1,7 @@
 # bookings/admin.py
 
 from django.contrib import admin
-from .models import Booking, Payment
+from .models import Booking, Payment, Outbox
 
 class PaymentInline(admin.TabularInline):
     """
@@ -52,4 +52,13 @@ class PaymentAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         if not obj.pk: # If creating a new payment
             obj.recorded_by = request.user
-        super().save_model(request, obj, form, change)
\ No newline at end of file
+        super().save_model(request, obj, form, change)
+
+@admin.register(Outbox)
+class OutboxAdmin(admin.ModelAdmin):
+    """
+    Admin view for queued n8n webhook events, mainly to inspect failures.
+    """
+    list_display = ('event_type', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status', 'event_type')
+    readonly_fields = ('event_type', 'webhook_url', 'payload', 'attempts', 'last_error', 'created_at', 'sent_at')
@@ -0,0 +1,117 @@
+# bookings/api/filters.py
+
+import datetime
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from bookings.models import Booking
+
+
+def parse_moment(value):
+    """
+    Parses an ISO date or datetime query value. Plain dates mean midnight
+    in the current time zone; naive datetimes are made aware.
+    """
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            if day is None:
+                return None
+            moment = datetime.datetime.combine(day, datetime.time.min)
+    except ValueError:
+        return None
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class BookingFilterBackend(BaseFilterBackend):
+    """
+    Server-side filtering for the bookings API, used by the n8n reminder
+    workflows. Supported query parameters:
+
+    - status: one status or a comma-separated list
+    - trip, customer: ids
+    - booking_date_after / booking_date_before
+    - departure_after / departure_before (the trip's departure date)
+    - last_reminder_sent_after / last_reminder_sent_before
+    - last_reminder_sent_isnull: true or false
+    - reminder_due_before: never reminded, or last reminded before this moment
+
+    Dates accept YYYY-MM-DD or an ISO 8601 datetime. Invalid values are
+    rejected with a 400 instead of being ignored.
+    """
+    RANGE_FILTERS = {
+        'booking_date_after': 'booking_date__gte',
+        'booking_date_before': 'booking_date__lt',
+        'departure_after': 'trip__departure_date__gte',
+        'departure_before': 'trip__departure_date__lt',
+        'last_reminder_sent_after': 'last_reminder_sent_at__gte',
+        'last_reminder_sent_before': 'last_reminder_sent_at__lt',
+    }
+    ID_FILTERS = {'trip': 'trip_id', 'customer': 'customer_id'}
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        errors = {}
+
+        status = params.get('status')
+        if status:
+            statuses = [s.strip() for s in status.split(',') if s.strip()]
+            unknown = set(statuses) - set(Booking.Status.values)
+            if unknown:
+                errors['status'] = f"Unknown status: {', '.join(sorted(unknown))}."
+            else:
+                queryset = queryset.filter(status__in=statuses)
+
+        for param, lookup in self.ID_FILTERS.items():
+            value = params.get(param)
+            if value:
+                if value.isdigit():
+                    queryset = queryset.filter(**{lookup: int(value)})
+                else:
+                    errors[param] = "Enter a valid id."
+
+        for param, lookup in self.RANGE_FILTERS.items():
+            value = params.get(param)
+            if value:
+                moment = parse_moment(value)
+                if moment is None:
+                    errors[param] = "Enter a valid date or datetime."
+                else:
+                    queryset = queryset.filter(**{lookup: moment})
+
+        isnull = params.get('last_reminder_sent_isnull')
+        if isnull:
+            if isnull.lower() in ('true', '1'):
+                queryset = queryset.filter(last_reminder_sent_at__isnull=True)
+            elif isnull.lower() in ('false', '0'):
+                queryset = queryset.filter(last_reminder_sent_at__isnull=False)
+            else:
+                errors['last_reminder_sent_isnull'] = "Use true or false."
+
+        due = params.get('reminder_due_before')
+        if due:
+            moment = parse_moment(due)
+            if moment is None:
+                errors['reminder_due_before'] = "Enter a valid date or datetime."
+            else:
+                queryset = queryset.filter(
+                    Q(last_reminder_sent_at__isnull=True) | Q(last_reminder_sent_at__lt=moment)
+                )
+
+        if errors:
+            raise ValidationError(errors)
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        names = ['status', *self.ID_FILTERS, *self.RANGE_FILTERS, 'last_reminder_sent_isnull', 'reminder_due_before']
+        return [
+            {'name': name, 'required': False, 'in': 'query', 'schema': {'type': 'string'}}
+            for name in names
+        ]
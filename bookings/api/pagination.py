@@ -0,0 +1,16 @@
+# bookings/api/pagination.py
+
+from rest_framework.pagination import CursorPagination
+
+
+class BookingCursorPagination(CursorPagination):
+    """
+    Cursor pagination for the bookings API. Each page is an index range
+    scan from the cursor, so deep pages cost the same as the first one and
+    a client paging while bookings are created never sees duplicates.
+    Follow `next` until it is null to read all matching bookings.
+    """
+    ordering = ('-booking_date', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
@@ -4,8 +4,9 @@ from rest_framework import serializers
 from bookings.models import Booking, Payment
 from crm.api.serializers import CustomerSerializer
 from trips.api.serializers import TripSerializer
+from core.api.sparse_fieldsets import SparseFieldsetSerializerMixin
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Payment model.
     """
@@ -14,7 +15,7 @@ class PaymentSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Booking model.
     Provides a nested representation of related customer and trip data.
@@ -23,6 +24,9 @@ class BookingSerializer(serializers.ModelSerializer):
     customer = CustomerSerializer(read_only=True)
     trip = TripSerializer(read_only=True)
     payments = PaymentSerializer(many=True, read_only=True)
+    # Read from the cached total instead of aggregating payments per booking.
+    amount_paid = serializers.DecimalField(source='amount_paid_total', max_digits=10, decimal_places=2, read_only=True)
+    balance_due = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
 
     class Meta:
         model = Booking
@@ -31,4 +35,5 @@ class BookingSerializer(serializers.ModelSerializer):
             'balance_due', 'booking_date', 'created_by', 'last_reminder_sent_at',
             'payments'
         ]
-        read_only_fields = fields
\ No newline at end of file
+        read_only_fields = fields
+        field_sources = {'balance_due': ['total_amount', 'amount_paid_total']}
\ No newline at end of file
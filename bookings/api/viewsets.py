@@ -1,19 +1,36 @@
 # bookings/api/viewsets.py
 
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Prefetch
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from core.api.sparse_fieldsets import SparseFieldsetViewSetMixin
 from bookings.models import Booking, Payment
+from bookings.services.payment_import import PaymentImportService
+from users.permissions import IsManager, IsAccountant
+from .filters import BookingFilterBackend
+from .pagination import BookingCursorPagination
 from .serializers import BookingSerializer, PaymentSerializer
 
-class BookingViewSet(viewsets.ReadOnlyModelViewSet):
+class BookingViewSet(SparseFieldsetViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows bookings to be viewed.
     This is essential for n8n to fetch booking details for automation.
+    Results are filtered server-side (see BookingFilterBackend) and
+    cursor-paginated, e.g. /api/v1/bookings/bookings/?status=pending_payment
     """
-    queryset = Booking.objects.all().select_related('customer', 'trip').order_by('-booking_date')
+    # Customer and trip are joined and payments prefetched in one extra
+    # query per page. The money and seat figures are stored columns
+    # (Booking.amount_paid_total, Trip.booked_seats_count), so serializing
+    # a page costs the same number of queries whatever its size.
+    queryset = Booking.objects.all().select_related('customer', 'trip').prefetch_related(
+        Prefetch('payments', queryset=Payment.objects.order_by('-payment_date', '-id'))
+    ).order_by('-booking_date')
     serializer_class = BookingSerializer
     permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [BookingFilterBackend]
+    pagination_class = BookingCursorPagination
 
     @action(detail=True, methods=['post'])
     def add_payment(self, request, pk=None):
@@ -24,17 +41,45 @@ class BookingViewSet(viewsets.ReadOnlyModelViewSet):
         booking = self.get_object()
         serializer = PaymentSerializer(data=request.data)
         if serializer.is_valid():
+            # Payment signals update the booking's cached total and status.
             serializer.save(booking=booking, recorded_by=request.user)
-            booking.save() # Trigger signals or status updates on the booking
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class PaymentViewSet(viewsets.ModelViewSet):
+class PaymentViewSet(SparseFieldsetViewSetMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing payments directly.
     """
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
-    permission_classes = [permissions.IsAuthenticated]
\ No newline at end of file
+    permission_classes = [permissions.IsAuthenticated]
+
+    @action(detail=False, methods=['post'], url_path='bulk-import',
+            permission_classes=[permissions.IsAuthenticated, IsManager | IsAccountant])
+    def bulk_import(self, request):
+        """
+        Imports many payments in one all-or-nothing batch.
+        Endpoint: /api/v1/bookings/payments/bulk-import/
+        Accepts either a JSON list of rows ({booking_id, amount_paid,
+        payment_date, payment_method}) or a multipart upload of a .csv/.xlsx
+        file in the `file` field.
+        """
+        if 'file' in request.FILES:
+            try:
+                rows = PaymentImportService.parse_file(request.FILES['file'])
+            except (DjangoValidationError, ValueError, KeyError, OSError) as e:
+                return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        elif isinstance(request.data, list):
+            rows = request.data
+        else:
+            return Response(
+                {'detail': 'Send a JSON list of payment rows or a file upload.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        result = PaymentImportService.import_rows(rows, request.user)
+        if result['errors']:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_201_CREATED)
\ No newline at end of file
@@ -1,6 +1,7 @@
 # bookings/forms.py
 
 from django import forms
+from django.utils.translation import gettext_lazy as _
 from .models import Booking, Payment
 from trips.models import Trip # Correctly imported from the 'trips' app
 
@@ -17,7 +18,7 @@ class BookingForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         self.fields['trip'].queryset = Trip.objects.filter(
             status__in=['scheduled', 'active']
-        )
+        ).with_occupancy()
         self.fields['total_amount'].help_text = "Defaults to trip price, can be overridden."
     
     def clean(self):
@@ -36,4 +37,13 @@ class PaymentForm(forms.ModelForm):
         fields = ['amount_paid', 'payment_date', 'payment_method']
         widgets = {
             'payment_date': forms.DateInput(attrs={'type': 'date'}),
-        }
\ No newline at end of file
+        }
+
+class PaymentImportForm(forms.Form):
+    """
+    Upload form for a bank statement export to be imported as payments.
+    """
+    file = forms.FileField(
+        label=_("Payments file"),
+        help_text=_("A .csv or .xlsx file with the columns: booking_id, amount_paid, payment_date, payment_method."),
+    )
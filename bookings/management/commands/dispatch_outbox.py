@@ -0,0 +1,43 @@
+# bookings/management/commands/dispatch_outbox.py
+
+import time
+from django.core.management.base import BaseCommand
+
+from bookings.services.outbox_dispatcher import OutboxDispatcher
+
+
+class Command(BaseCommand):
+    """
+    A Django management command that delivers queued n8n webhook events.
+    Runs as a long-lived worker by default; use --once from cron instead.
+    Usage: python manage.py dispatch_outbox [--once] [--batch-size N] [--interval S]
+    """
+    help = 'Delivers pending Outbox events to their n8n webhooks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the due events and exit.')
+        parser.add_argument('--batch-size', type=int, default=None, help='Events claimed per batch.')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to sleep when idle.')
+
+    def handle(self, *args, **options):
+        dispatcher = OutboxDispatcher(batch_size=options['batch_size'])
+        total_sent = total_failed = 0
+        try:
+            while True:
+                sent, failed = dispatcher.dispatch_batch()
+                total_sent += sent
+                total_failed += failed
+                if sent or failed:
+                    self.stdout.write(f"Dispatched batch: {sent} sent, {failed} failed.")
+                    # A batch made of failures only would otherwise be retried immediately.
+                    if sent:
+                        continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            dispatcher.close()
+
+        self.stdout.write(self.style.SUCCESS(f"Outbox dispatch finished: {total_sent} sent, {total_failed} failed."))
@@ -0,0 +1,38 @@
+# bookings/management/commands/send_reminders.py
+
+import time
+from django.core.management.base import BaseCommand
+
+from bookings.services.reminder_scheduler import ReminderScheduler, REMINDER_KINDS
+
+
+class Command(BaseCommand):
+    """
+    A Django management command that sends the payment and document
+    reminders in batches, one n8n webhook per batch. Runs once by default
+    (e.g. from cron); use --worker to keep checking for due bookings.
+    Usage: python manage.py send_reminders [--kind payment|documents] [--batch-size N] [--worker] [--interval S]
+    """
+    help = 'Sends due payment and document reminders in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=list(REMINDER_KINDS), action='append', help='Reminder to send (default: all).')
+        parser.add_argument('--batch-size', type=int, default=None, help='Bookings claimed per batch.')
+        parser.add_argument('--worker', action='store_true', help='Keep running, checking for due bookings.')
+        parser.add_argument('--interval', type=float, default=300.0, help='Seconds between checks in worker mode.')
+
+    def handle(self, *args, **options):
+        scheduler = ReminderScheduler(batch_size=options['batch_size'])
+        try:
+            while True:
+                totals = scheduler.run(options['kind'])
+                for kind, count in totals.items():
+                    if count or not options['worker']:
+                        self.stdout.write(f"{kind}: {count} bookings reminded.")
+                if not options['worker']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS("Reminder run finished."))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:50
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def populate_amount_paid_total(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    bookings = Booking.objects.annotate(total=Sum("payments__amount_paid")).filter(total__isnull=False)
+    for booking in bookings.iterator():
+        Booking.objects.filter(pk=booking.pk).update(amount_paid_total=booking.total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0003_outbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="booking",
+            name="amount_paid_total",
+            field=models.DecimalField(
+                decimal_places=2,
+                default=0,
+                editable=False,
+                max_digits=10,
+                verbose_name="Amount Paid",
+            ),
+        ),
+        migrations.RunPython(populate_amount_paid_total, migrations.RunPython.noop),
+    ]
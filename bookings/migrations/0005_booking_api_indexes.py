@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0004_booking_amount_paid_total"),
+        ("crm", "0001_initial"),
+        ("trips", "0005_trip_booked_seats_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["-booking_date", "-id"], name="booking_date_cursor_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["status", "-booking_date", "-id"],
+                name="booking_status_cursor_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["status", "last_reminder_sent_at"], name="booking_reminder_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0005_booking_api_indexes"),
+        ("crm", "0002_customer_search_fields"),
+        ("trips", "0005_trip_booked_seats_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["pending_payment", "pending_documents"])
+                ),
+                fields=["status", "last_reminder_sent_at", "id"],
+                name="booking_reminder_due_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0006_booking_reminder_due_idx"),
+        ("crm", "0003_communication_log_archive"),
+        ("trips", "0006_trip_expense_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Superseded by booking_status_cursor_idx and booking_reminder_due_idx.
+        migrations.RemoveIndex(
+            model_name="booking",
+            name="booking_reminder_idx",
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["created_by", "status", "-booking_date"],
+                name="booking_agent_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["trip", "status"], name="booking_trip_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                condition=models.Q(("status", "cancelled"), _negated=True),
+                fields=["trip", "amount_paid_total"],
+                name="booking_trip_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                fields=["payment_date", "created_at"], name="payment_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                fields=["booking", "amount_paid"], name="payment_booking_amount_idx"
+            ),
+        ),
+        # The single-column foreign key indexes are dropped only once the
+        # composite indexes that replace them exist.
+        migrations.AlterField(
+            model_name="booking",
+            name="created_by",
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="created_bookings",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="booking",
+            name="trip",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="bookings",
+                to="trips.trip",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="booking",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="payments",
+                to="bookings.booking",
+            ),
+        ),
+    ]
@@ -1,10 +1,60 @@
 # bookings/models.py
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from trips.models import Trip
+
+
+class BookingQuerySet(models.QuerySet):
+    """
+    Custom queryset for bookings with reusable annotations.
+    """
+    @staticmethod
+    def _payments_total():
+        payments_total = Subquery(
+            Payment.objects.filter(booking=OuterRef('pk'))
+            .order_by()
+            .values('booking')
+            .annotate(total=Sum('amount_paid'))
+            .values('total')
+        )
+        return Coalesce(payments_total, 0, output_field=models.DecimalField(max_digits=12, decimal_places=2))
+
+    def with_financials(self):
+        """
+        Annotates each booking with `payments_total` and `outstanding_balance`
+        computed live from its payments, independent of the cached
+        amount_paid_total column. Useful for ad-hoc reports and audits.
+        """
+        return self.annotate(
+            payments_total=self._payments_total()
+        ).annotate(
+            outstanding_balance=F('total_amount') - F('payments_total')
+        )
+
+    def payment_status_transitions(self):
+        """
+        Narrows the queryset to bookings whose status must change given their
+        cached payment total (see Booking.sync_payment_status).
+        """
+        fully_paid = Q(amount_paid_total__gte=F('total_amount')) & ~Q(status=Booking.Status.FULLY_PAID)
+        first_payment = Q(amount_paid_total__lt=F('total_amount'), status=Booking.Status.PENDING_PAYMENT)
+        return self.exclude(status=Booking.Status.CANCELLED).filter(fully_paid | first_payment)
+
+    def refresh_amount_paid_totals(self):
+        """
+        Recomputes amount_paid_total for the selected bookings in a single
+        UPDATE, e.g. after payments were inserted with bulk_create().
+        """
+        return self.update(amount_paid_total=self._payments_total())
+
+
 class Booking(models.Model):
     """
     Represents a booking that links a Customer to a Trip.
@@ -19,12 +69,15 @@ class Booking(models.Model):
         CANCELLED = 'cancelled', _('Cancelled')
 
     customer = models.ForeignKey('crm.Customer', on_delete=models.CASCADE, related_name='bookings')
-    trip = models.ForeignKey('trips.Trip', on_delete=models.CASCADE, related_name='bookings')
+    # Both foreign keys are indexed by the composite indexes in Meta, which
+    # lead with the same column.
+    trip = models.ForeignKey('trips.Trip', on_delete=models.CASCADE, related_name='bookings', db_index=False)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
         null=True,
-        related_name='created_bookings'
+        related_name='created_bookings',
+        db_index=False
     )
     
     booking_date = models.DateTimeField(auto_now_add=True)
@@ -37,12 +90,22 @@ class Booking(models.Model):
     )
     
     last_reminder_sent_at = models.DateTimeField(_("Last Reminder Sent"), null=True, blank=True)
-    
+    # Running total of this booking's payments, maintained by Payment.save()
+    # and payment deletion so that balances need no aggregate query.
+    amount_paid_total = models.DecimalField(
+        _("Amount Paid"), max_digits=10, decimal_places=2, default=0, editable=False
+    )
+
+    objects = BookingQuerySet.as_manager()
+
     _original_status = None
+    _original_trip_id = None
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._original_status = self.status
+        # Read through __dict__ so that deferred fields are not loaded here.
+        self._original_status = self.__dict__.get('status')
+        self._original_trip_id = self.__dict__.get('trip_id')
 
     def __str__(self):
         return f"Booking for {self.customer.full_name} on {self.trip.name}"
@@ -53,16 +116,84 @@ class Booking(models.Model):
             raise ValidationError(_("There are no available seats for this trip."))
 
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+        # amount_paid_total is only changed through Payment's F() updates;
+        # never write back a possibly stale in-memory copy of it.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != 'amount_paid_total' and f.attname not in deferred
+            ]
+        if 'total_amount' in self.__dict__:
+            self.total_amount = self._meta.get_field('total_amount').to_python(self.total_amount)
+        with transaction.atomic():
+            self._sync_trip_seat_counters()
+            super().save(*args, **kwargs)
         self._original_status = self.status
+        self._original_trip_id = self.trip_id
+
+    def _sync_trip_seat_counters(self):
+        """
+        Keeps Trip.booked_seats_count in step with this booking's lifecycle:
+        creation, cancellation, un-cancellation and moving to another trip.
+        """
+        if not self._state.adding:
+            # Start from the stored row, locked until the save commits: the
+            # in-memory originals may be stale (or deferred), and a second
+            # request cancelling the same booking must not count it twice.
+            self._original_status, self._original_trip_id = (
+                Booking.objects.select_for_update().filter(pk=self.pk).values_list('status', 'trip_id').get()
+            )
+
+        deltas = {}
+        if not self._state.adding and self._original_status != self.Status.CANCELLED:
+            deltas[self._original_trip_id] = deltas.get(self._original_trip_id, 0) - 1
+        if self.status != self.Status.CANCELLED:
+            deltas[self.trip_id] = deltas.get(self.trip_id, 0) + 1
+
+        # Lock trips in a stable order so concurrent moves cannot deadlock.
+        for trip_id in sorted(t for t, delta in deltas.items() if delta and t is not None):
+            new_count = Trip.adjust_booked_seats(trip_id, deltas[trip_id])
+            if new_count is not None and trip_id == self.trip_id and self._meta.get_field('trip').is_cached(self):
+                self.trip.booked_seats_count = new_count
+                self.trip.clear_occupancy_annotations()
 
     @property
     def amount_paid(self):
-        return self.payments.aggregate(total=models.Sum('amount_paid'))['total'] or 0
+        return self.amount_paid_total
 
     @property
     def balance_due(self):
-        return self.total_amount - self.amount_paid
+        return self.total_amount - self.amount_paid_total
+
+    @classmethod
+    def sync_payment_status(cls, booking_id):
+        """
+        Applies the payment-driven status transition in one conditional UPDATE:
+        fully paid bookings become FULLY_PAID, and PENDING_PAYMENT bookings
+        with a remaining balance become CONFIRMED. Rows whose status would not
+        change (and cancelled bookings) are not written at all.
+        Returns the number of bookings updated.
+        """
+        return cls.objects.filter(pk=booking_id).payment_status_transitions().update(
+            status=cls.payment_status_expression()
+        )
+
+    @classmethod
+    def payment_status_expression(cls):
+        return Case(
+            When(amount_paid_total__gte=F('total_amount'), then=Value(cls.Status.FULLY_PAID)),
+            When(status=cls.Status.PENDING_PAYMENT, then=Value(cls.Status.CONFIRMED)),
+            default=F('status'),
+        )
+
+    @classmethod
+    def adjust_amount_paid(cls, booking_id, delta):
+        """
+        Atomically shifts the cached payment total of a booking by `delta`.
+        """
+        if booking_id is not None and delta:
+            cls.objects.filter(pk=booking_id).update(amount_paid_total=F('amount_paid_total') + delta)
 
     def get_status_badge_class(self):
         """
@@ -82,6 +213,30 @@ class Booking(models.Model):
         verbose_name = _("Booking")
         verbose_name_plural = _("Bookings")
         ordering = ['-booking_date']
+        indexes = [
+            # Cursor pagination of the bookings API walks this order.
+            models.Index(fields=['-booking_date', '-id'], name='booking_date_cursor_idx'),
+            # Status filters (e.g. the n8n reminder runs) paged in the same order.
+            models.Index(fields=['status', '-booking_date', '-id'], name='booking_status_cursor_idx'),
+            # Only the bookings the reminder scheduler (and the n8n reminder
+            # filters) can pick up.
+            models.Index(
+                fields=['status', 'last_reminder_sent_at', 'id'],
+                name='booking_reminder_due_idx',
+                condition=models.Q(status__in=['pending_payment', 'pending_documents']),
+            ),
+            # An agent's dashboard lists: their bookings in one status, newest first.
+            models.Index(fields=['created_by', 'status', '-booking_date'], name='booking_agent_status_idx'),
+            # Per-trip filters from the API, seat counts and the trips' bookings.
+            models.Index(fields=['trip', 'status'], name='booking_trip_status_idx'),
+            # Manifests and revenue per trip skip cancelled bookings; the paid
+            # total is in the index so the sums are index-only scans.
+            models.Index(
+                fields=['trip', 'amount_paid_total'],
+                name='booking_trip_active_idx',
+                condition=~models.Q(status='cancelled'),
+            ),
+        ]
 
 
 class Payment(models.Model):
@@ -93,7 +248,8 @@ class Payment(models.Model):
         BANK_TRANSFER = 'bank_transfer', _('Bank Transfer')
         ONLINE = 'online', _('Online')
 
-    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name='payments')
+    # Indexed by payment_booking_amount_idx below.
+    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name='payments', db_index=False)
     amount_paid = models.DecimalField(_("Amount Paid"), max_digits=10, decimal_places=2)
     payment_date = models.DateField(_("Payment Date"))
     payment_method = models.CharField(
@@ -110,9 +266,52 @@ class Payment(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    _original_amount = None
+    _original_booking_id = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._original_amount = self.__dict__.get('amount_paid')
+        self._original_booking_id = self.__dict__.get('booking_id')
+
     def __str__(self):
         return f"Payment of {self.amount_paid} for {self.booking}"
 
+    def save(self, *args, **kwargs):
+        """
+        Saves the payment and moves the difference it makes into the cached
+        Booking.amount_paid_total in the same transaction.
+        """
+        self.amount_paid = self._meta.get_field('amount_paid').to_python(self.amount_paid)
+        with transaction.atomic():
+            if not self._state.adding:
+                # The cached total was built from the stored row, not from
+                # this instance's possibly stale or deferred copy. Locking it
+                # makes concurrent edits of the payment apply one at a time.
+                stored = (
+                    Payment.objects.select_for_update().filter(pk=self.pk)
+                    .values_list('amount_paid', 'booking_id').first()
+                )
+                if stored is not None:
+                    self._original_amount, self._original_booking_id = stored
+            # Adjusted before the row is written so that post_save receivers
+            # already see the new balance.
+            if self._state.adding or self._original_booking_id != self.booking_id:
+                if not self._state.adding:
+                    Booking.adjust_amount_paid(self._original_booking_id, -self._original_amount)
+                Booking.adjust_amount_paid(self.booking_id, self.amount_paid)
+            elif self._original_amount is not None:
+                Booking.adjust_amount_paid(self.booking_id, self.amount_paid - self._original_amount)
+            self.refresh_cached_booking_total()
+            super().save(*args, **kwargs)
+        self._original_amount = self.amount_paid
+        self._original_booking_id = self.booking_id
+
+    def refresh_cached_booking_total(self):
+        """Reloads the payment total on an already loaded booking instance."""
+        if self._meta.get_field('booking').is_cached(self):
+            self.booking.refresh_from_db(fields=['amount_paid_total'])
+
     def clean(self):
         if self.amount_paid <= 0:
             raise ValidationError(_("Amount paid must be a positive number."))
@@ -120,4 +319,89 @@ class Payment(models.Model):
     class Meta:
         verbose_name = _("Payment")
         verbose_name_plural = _("Payments")
-        ordering = ['-payment_date']
\ No newline at end of file
+        ordering = ['-payment_date']
+        indexes = [
+            # Date-range sums on the dashboards and reports, and the recent
+            # payments list (read backwards).
+            models.Index(fields=['payment_date', 'created_at'], name='payment_date_idx'),
+            # Per-booking payment sums (refresh_amount_paid_totals) without
+            # reading the table.
+            models.Index(fields=['booking', 'amount_paid'], name='payment_booking_amount_idx'),
+        ]
+
+class SeatHold(models.Model):
+    """
+    A short-lived claim on one seat of a trip, taken while an agent moves
+    through the booking wizard. Active holds count against the trip's
+    capacity until they expire or are converted into a booking.
+    """
+    trip = models.ForeignKey('trips.Trip', on_delete=models.CASCADE, related_name='seat_holds')
+    held_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name='seat_holds'
+    )
+    expires_at = models.DateTimeField(_("Expires At"), db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Seat hold on {self.trip_id} until {self.expires_at}"
+
+    class Meta:
+        verbose_name = _("Seat Hold")
+        verbose_name_plural = _("Seat Holds")
+        ordering = ['expires_at']
+
+
+class Outbox(models.Model):
+    """
+    A webhook event waiting to be delivered to n8n.
+    Rows are written in the same transaction as the change that caused
+    them and are sent later by the `dispatch_outbox` worker, so a slow or
+    unreachable n8n instance never delays a save or loses an event.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        # Claimed by a dispatcher; next_attempt_at is when its lease ends.
+        SENDING = 'sending', _('Sending')
+        SENT = 'sent', _('Sent')
+        FAILED = 'failed', _('Failed')
+
+    event_type = models.CharField(_("Event Type"), max_length=50)
+    webhook_url = models.URLField(_("Webhook URL"), max_length=500)
+    payload = models.JSONField(_("Payload"))
+    status = models.CharField(
+        _("Status"),
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(_("Attempts"), default=0)
+    next_attempt_at = models.DateTimeField(_("Next Attempt At"), default=timezone.now)
+    last_error = models.TextField(_("Last Error"), blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(_("Sent At"), null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.event_type} event ({self.get_status_display()})"
+
+    @classmethod
+    def enqueue(cls, event_type, webhook_url, payload):
+        """
+        Records an event for delivery. Returns None when the target webhook
+        is not configured, matching the previous behaviour of skipping it.
+        """
+        if not webhook_url:
+            if settings.DEBUG:
+                print(f"WARNING: No webhook URL configured for '{event_type}'. Skipping event.")
+            return None
+        return cls.objects.create(event_type=event_type, webhook_url=webhook_url, payload=payload)
+
+    class Meta:
+        verbose_name = _("Outbox Event")
+        verbose_name_plural = _("Outbox Events")
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
@@ -0,0 +1,117 @@
+# bookings/services/outbox_dispatcher.py
+
+import datetime
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from bookings.models import Outbox
+from core.services.http_client import build_session
+
+
+def log_webhook_attempt(url, payload, response):
+    """Logs the outcome of a webhook attempt for debugging."""
+    if settings.DEBUG:
+        print(f"--- Webhook Attempt ---")
+        print(f"URL: {url}")
+        print(f"Payload: {payload}")
+        if response is not None:
+            print(f"Status Code: {response.status_code}")
+            print(f"Response: {response.text[:200]}") # Print first 200 chars
+        else:
+            print("Status: FAILED (Request exception)")
+        print(f"-----------------------")
+
+
+class OutboxDispatcher:
+    """
+    A service class that delivers pending Outbox events to their webhooks.
+    Due events are claimed in batches with SELECT ... FOR UPDATE SKIP LOCKED
+    and leased to the claiming worker, so several workers can run side by
+    side without sending an event twice.
+    One HTTP session is kept per dispatcher, reusing keep-alive connections
+    to n8n across events and batches.
+    """
+    def __init__(self, batch_size=None, max_attempts=None, timeout=None, session=None):
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+        self.timeout = timeout or settings.OUTBOX_HTTP_TIMEOUT
+        self.session = session or self._build_session()
+
+    @staticmethod
+    def _build_session():
+        # Error statuses are not retried here: a failed event goes back to
+        # the outbox and is retried later with backoff.
+        return build_session(
+            'webhooks',
+            pool_size=settings.OUTBOX_HTTP_POOL_SIZE,
+            read_timeout=settings.OUTBOX_HTTP_TIMEOUT,
+        )
+
+    def retry_delay(self, attempts):
+        """Exponential backoff: base, 2*base, 4*base, ... capped at one day."""
+        seconds = settings.OUTBOX_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+        return datetime.timedelta(seconds=min(seconds, 24 * 60 * 60))
+
+    def claim_batch(self):
+        """
+        Claims up to `batch_size` due events in a short transaction. They
+        are marked SENDING and leased until OUTBOX_LEASE_SECONDS from now;
+        events whose lease ran out (their worker died mid-batch) are due
+        again.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            events = list(
+                Outbox.objects.select_for_update(skip_locked=True)
+                .filter(status__in=[Outbox.Status.PENDING, Outbox.Status.SENDING], next_attempt_at__lte=now)
+                .order_by('next_attempt_at')[:self.batch_size]
+            )
+            lease_until = now + datetime.timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+            Outbox.objects.filter(pk__in=[event.pk for event in events]).update(
+                status=Outbox.Status.SENDING, next_attempt_at=lease_until
+            )
+        return events
+
+    def dispatch_batch(self):
+        """
+        Sends one batch of due events and returns a (sent, failed) tuple.
+        Webhooks are called outside any transaction and each outcome is
+        saved as soon as it is known, so a crash mid-batch only resends the
+        events whose outcome was not recorded yet.
+        """
+        sent = failed = 0
+        for event in self.claim_batch():
+            if self._send(event):
+                sent += 1
+            else:
+                failed += 1
+            event.save(update_fields=['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'])
+        return sent, failed
+
+    def _send(self, event):
+        event.attempts += 1
+        response = None
+        try:
+            response = self.session.post(event.webhook_url, json=event.payload, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            log_webhook_attempt(event.webhook_url, event.payload, response)
+            event.last_error = str(e)[:1000]
+            if event.attempts >= self.max_attempts:
+                event.status = Outbox.Status.FAILED
+            else:
+                event.status = Outbox.Status.PENDING
+                event.next_attempt_at = timezone.now() + self.retry_delay(event.attempts)
+            return False
+
+        log_webhook_attempt(event.webhook_url, event.payload, response)
+        event.status = Outbox.Status.SENT
+        event.sent_at = timezone.now()
+        event.last_error = ''
+        return True
+
+    def close(self):
+        self.session.close()
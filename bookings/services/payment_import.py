@@ -0,0 +1,188 @@
+# bookings/services/payment_import.py
+
+import csv
+import io
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.translation import gettext as _
+from openpyxl import load_workbook
+
+from bookings.models import Booking, Payment, Outbox
+from core.services.dashboard_metrics import DashboardMetrics
+
+
+class PaymentImportService:
+    """
+    A service class for importing many payments at once, e.g. from a bank
+    statement. Rows are validated together, inserted with bulk_create and
+    the affected bookings are recomputed with set-based UPDATEs instead of
+    running the per-payment signals.
+    """
+    COLUMNS = ('booking_id', 'amount_paid', 'payment_date', 'payment_method')
+    BATCH_SIZE = 1000
+
+    @classmethod
+    def parse_file(cls, uploaded_file):
+        """
+        Reads rows from an uploaded .csv or .xlsx file into a list of dicts
+        keyed by the header row.
+        """
+        name = (uploaded_file.name or '').lower()
+        if name.endswith('.xlsx'):
+            return cls.parse_xlsx(uploaded_file)
+        if name.endswith('.csv'):
+            return cls.parse_csv(uploaded_file)
+        raise ValidationError(_("Unsupported file type. Please upload a .csv or .xlsx file."))
+
+    @staticmethod
+    def parse_csv(uploaded_file):
+        text = io.TextIOWrapper(uploaded_file, encoding='utf-8-sig')
+        return [
+            {(key or '').strip(): value for key, value in row.items()}
+            for row in csv.DictReader(text)
+        ]
+
+    @staticmethod
+    def parse_xlsx(uploaded_file):
+        workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = [str(h).strip() if h is not None else '' for h in next(rows, ())]
+            return [
+                dict(zip(headers, values))
+                for values in rows
+                if any(v not in (None, '') for v in values)
+            ]
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def parse_booking_id(value):
+        """
+        Returns `value` as a booking id. Spreadsheets hand numbers over as
+        floats, so whole floats are accepted; fractional ones are not
+        truncated to another booking but raise ValueError.
+        """
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().isdigit():
+            return int(value.strip())
+        raise ValueError(value)
+
+    @classmethod
+    def validate(cls, rows):
+        """
+        Converts raw rows into unsaved Payment instances.
+        Returns (payments, errors) where errors is a list of
+        {'row': <1-based row number>, 'errors': {...}} entries.
+        All booking ids are checked with a single query.
+        """
+        amount_field = Payment._meta.get_field('amount_paid')
+        date_field = Payment._meta.get_field('payment_date')
+        methods = set(Payment.PaymentMethod.values)
+
+        booking_ids = set()
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            try:
+                booking_ids.add(cls.parse_booking_id(row.get('booking_id')))
+            except ValueError:
+                pass
+        existing = set(Booking.objects.filter(pk__in=booking_ids).values_list('pk', flat=True))
+
+        payments, errors = [], []
+        for number, row in enumerate(rows, 1):
+            if not isinstance(row, dict):
+                errors.append({'row': number, 'errors': {'row': _("Each row must be an object.")}})
+                continue
+            row_errors = {}
+            try:
+                booking_id = cls.parse_booking_id(row.get('booking_id'))
+                if booking_id not in existing:
+                    row_errors['booking_id'] = _("Booking does not exist.")
+            except ValueError:
+                booking_id = None
+                row_errors['booking_id'] = _("A valid booking id is required.")
+
+            try:
+                amount = amount_field.clean(row.get('amount_paid'), None)
+                if amount <= 0:
+                    row_errors['amount_paid'] = _("Amount paid must be a positive number.")
+            except ValidationError as e:
+                row_errors['amount_paid'] = ' '.join(e.messages)
+
+            try:
+                payment_date = date_field.clean(row.get('payment_date'), None)
+            except ValidationError as e:
+                row_errors['payment_date'] = ' '.join(e.messages)
+
+            method = str(row.get('payment_method') or Payment.PaymentMethod.BANK_TRANSFER).strip()
+            if method not in methods:
+                row_errors['payment_method'] = _("Unknown payment method.")
+
+            if row_errors:
+                errors.append({'row': number, 'errors': row_errors})
+                continue
+            payments.append(Payment(
+                booking_id=booking_id,
+                amount_paid=amount,
+                payment_date=payment_date,
+                payment_method=method,
+            ))
+        return payments, errors
+
+    @classmethod
+    def import_rows(cls, rows, user):
+        """
+        Validates and imports rows as one all-or-nothing batch.
+        Returns a dict with the number of created payments and any row errors;
+        nothing is written if a single row is invalid.
+        """
+        payments, errors = cls.validate(rows)
+        if errors or not payments:
+            return {'created': 0, 'errors': errors}
+
+        for payment in payments:
+            payment.recorded_by = user
+
+        with transaction.atomic():
+            Payment.objects.bulk_create(payments, batch_size=cls.BATCH_SIZE)
+
+            # One aggregate-and-update pass for the cached totals, then one
+            # conditional UPDATE for the payment-driven status transitions.
+            affected = Booking.objects.filter(pk__in={p.booking_id for p in payments})
+            affected.refresh_amount_paid_totals()
+            affected.payment_status_transitions().update(status=Booking.payment_status_expression())
+
+            cls._queue_receipts(payments)
+            # bulk_create skips the signals, so drop the cached dashboards here.
+            DashboardMetrics.invalidate()
+
+        return {'created': len(payments), 'errors': []}
+
+    @classmethod
+    def _queue_receipts(cls, payments):
+        """Writes the receipt webhook events for all payments in one batch."""
+        webhook_url = settings.N8N_PAYMENT_RECEIPT_WEBHOOK_URL
+        if not webhook_url:
+            return
+        customer_ids = dict(
+            Booking.objects.filter(pk__in={p.booking_id for p in payments}).values_list('pk', 'customer_id')
+        )
+        Outbox.objects.bulk_create([
+            Outbox(
+                event_type='payment_receipt',
+                webhook_url=webhook_url,
+                payload={
+                    'payment_id': payment.pk,
+                    'booking_id': payment.booking_id,
+                    'customer_id': customer_ids[payment.booking_id],
+                },
+            )
+            for payment in payments
+        ], batch_size=cls.BATCH_SIZE)
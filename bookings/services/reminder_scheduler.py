@@ -0,0 +1,134 @@
+# bookings/services/reminder_scheduler.py
+
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from bookings.models import Booking, Outbox
+
+
+# What each reminder covers, where its batches go and how n8n logs it.
+REMINDER_KINDS = {
+    'payment': {
+        'status': Booking.Status.PENDING_PAYMENT,
+        'webhook_setting': 'N8N_PAYMENT_REMINDER_WEBHOOK_URL',
+        'triggered_by': 'Daily Payment Reminder',
+        'subject': "Reminder: Payment Due for your booking on {trip}. Balance: {balance}",
+    },
+    'documents': {
+        'status': Booking.Status.PENDING_DOCUMENTS,
+        'webhook_setting': 'N8N_DOCUMENT_REMINDER_WEBHOOK_URL',
+        'triggered_by': 'Document Submission Reminder',
+        'subject': "Reminder: Please Submit Your Documents for trip {trip}",
+    },
+}
+
+
+class ReminderScheduler:
+    """
+    A service class that sends the payment and document reminders.
+
+    Due bookings (in the reminder's status and never reminded, or last
+    reminded more than REMINDER_INTERVAL_HOURS ago) are read through the
+    partial booking_reminder_due_idx index and claimed in batches with
+    SELECT ... FOR UPDATE SKIP LOCKED, so several schedulers can run side
+    by side. Each batch, in one transaction, queues a single outbox
+    webhook carrying every booking and stamps
+    Booking.last_reminder_sent_at. Memory and transaction size stay
+    bounded by the batch size however many bookings are due.
+
+    The n8n workflows (scripts/n8n/03 and 04) send reminders by email
+    only, so customers without an email address are not claimed. n8n
+    writes the CommunicationLog rows itself, through the bulk log
+    endpoint, once it knows whether each email went out.
+    """
+    def __init__(self, batch_size=None, interval=None):
+        self.batch_size = batch_size or settings.REMINDER_BATCH_SIZE
+        self.interval = interval or datetime.timedelta(hours=settings.REMINDER_INTERVAL_HOURS)
+
+    def due(self, kind, now=None):
+        """Returns the bookings due for the `kind` reminder."""
+        cutoff = (now or timezone.now()) - self.interval
+        return Booking.objects.filter(
+            Q(last_reminder_sent_at__isnull=True) | Q(last_reminder_sent_at__lt=cutoff),
+            status=REMINDER_KINDS[kind]['status'],
+            # Neither NULL nor blank: the reminders go out by email.
+            customer__email__gt='',
+        )
+
+    def send_batch(self, kind):
+        """
+        Claims and reminds one batch of due bookings. Returns how many
+        bookings it covered; 0 when none are due or the webhook is not
+        configured.
+        """
+        reminder = REMINDER_KINDS[kind]
+        webhook_url = getattr(settings, reminder['webhook_setting'])
+        if not webhook_url:
+            return 0
+
+        with transaction.atomic():
+            now = timezone.now()
+            bookings = list(
+                self.due(kind, now)
+                .select_for_update(skip_locked=True, of=('self',))
+                .select_related('customer', 'trip')
+                .only(
+                    'id', 'status', 'total_amount', 'amount_paid_total', 'last_reminder_sent_at',
+                    'customer__id', 'customer__full_name', 'customer__email', 'customer__phone_number',
+                    'trip__id', 'trip__name', 'trip__departure_date',
+                )
+                .order_by('pk')[:self.batch_size]
+            )
+            if not bookings:
+                return 0
+
+            items = []
+            for booking in bookings:
+                balance = booking.total_amount - booking.amount_paid_total
+                items.append({
+                    'booking_id': booking.id,
+                    'subject': reminder['subject'].format(trip=booking.trip.name, balance=balance),
+                    'customer': {
+                        'id': booking.customer.id,
+                        'full_name': booking.customer.full_name,
+                        'email': booking.customer.email,
+                        'phone_number': booking.customer.phone_number,
+                    },
+                    'trip': {
+                        'id': booking.trip.id,
+                        'name': booking.trip.name,
+                        'departure_date': booking.trip.departure_date.isoformat(),
+                    },
+                    'balance_due': str(balance),
+                    'previous_reminder_at': (
+                        booking.last_reminder_sent_at.isoformat() if booking.last_reminder_sent_at else None
+                    ),
+                })
+
+            Outbox.enqueue(f'{kind}_reminder_batch', webhook_url, {
+                'reminder': kind,
+                'sent_at': now.isoformat(),
+                'triggered_by': reminder['triggered_by'],
+                'bookings': items,
+            })
+            Booking.objects.filter(pk__in=[b.pk for b in bookings]).update(last_reminder_sent_at=now)
+        return len(bookings)
+
+    def run(self, kinds=None):
+        """
+        Sends every due reminder of the given kinds (default: all) and
+        returns {kind: bookings reminded}.
+        """
+        totals = {}
+        for kind in kinds or REMINDER_KINDS:
+            totals[kind] = 0
+            while True:
+                count = self.send_batch(kind)
+                totals[kind] += count
+                if count < self.batch_size:
+                    break
+        return totals
@@ -0,0 +1,125 @@
+# bookings/services/seat_reservation.py
+
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from trips.models import Trip
+from bookings.models import Booking, SeatHold
+
+
+class NoSeatsAvailable(Exception):
+    """Raised when a trip has no free seat left for a hold or a booking."""
+
+
+# Trips the booking wizard offers, and what "all" means for availability.
+BOOKABLE_TRIP_STATUSES = (Trip.Status.SCHEDULED, Trip.Status.ACTIVE)
+
+
+class SeatReservationService:
+    """
+    A service class that hands out trip seats without overselling.
+    Every capacity check runs while holding a row lock on the trip, so
+    concurrent agents booking the same trip are serialized by the database.
+    """
+    @staticmethod
+    def hold_duration():
+        return datetime.timedelta(seconds=settings.SEAT_HOLD_TTL_SECONDS)
+
+    @staticmethod
+    def _lock_trip(trip_id):
+        """
+        Locks the trip row, drops its expired holds and returns the trip
+        together with a queryset of the holds that still count.
+        """
+        trip = Trip.objects.select_for_update().get(pk=trip_id)
+        now = timezone.now()
+        trip.seat_holds.filter(expires_at__lte=now).delete()
+        return trip, trip.seat_holds.filter(expires_at__gt=now)
+
+    @staticmethod
+    def _ensure_capacity(trip, active_holds, hold_id=None):
+        if hold_id is not None:
+            active_holds = active_holds.exclude(pk=hold_id)
+        if trip.booked_seats_count + active_holds.count() >= trip.total_seats:
+            raise NoSeatsAvailable(_("Sorry, no seats are available for this trip."))
+
+    @staticmethod
+    def availability(trip_ids=None, exclude_hold_id=None):
+        """
+        Returns the seat availability of many trips, ordered by id, from one
+        grouped query: booked seats come from the denormalized counter and
+        active holds are counted per trip. Without `trip_ids`, every
+        bookable trip is included. The caller's own hold can be left out
+        with `exclude_hold_id` so it does not block the seat it reserves.
+        No locks are taken; booking still re-checks under the trip lock.
+        """
+        active = Q(seat_holds__expires_at__gt=timezone.now())
+        if exclude_hold_id:
+            active &= ~Q(seat_holds__pk=exclude_hold_id)
+        trips = Trip.objects.all()
+        if trip_ids is None:
+            trips = trips.filter(status__in=BOOKABLE_TRIP_STATUSES)
+        else:
+            trips = trips.filter(pk__in=trip_ids)
+        rows = trips.annotate(
+            held_seats=Count('seat_holds', filter=active)
+        ).values('id', 'total_seats', 'held_seats', booked_seats=F('booked_seats_count')).order_by('id')
+
+        result = []
+        for row in rows:
+            row['available_seats'] = max(row['total_seats'] - row['booked_seats'] - row['held_seats'], 0)
+            row['seats_available'] = row['available_seats'] > 0
+            result.append(row)
+        return result
+
+    @classmethod
+    def hold_seat(cls, trip_id, user, hold_id=None):
+        """
+        Reserves one seat on a trip for a limited time and returns the hold.
+        Passing the id of an existing hold on the same trip extends it
+        instead of taking a second seat.
+        """
+        with transaction.atomic():
+            trip, active_holds = cls._lock_trip(trip_id)
+            expires_at = timezone.now() + cls.hold_duration()
+
+            hold = active_holds.filter(pk=hold_id).first() if hold_id else None
+            if hold is not None:
+                hold.expires_at = expires_at
+                hold.save(update_fields=['expires_at'])
+                return hold
+
+            cls._ensure_capacity(trip, active_holds)
+            return SeatHold.objects.create(trip=trip, held_by=user, expires_at=expires_at)
+
+    @staticmethod
+    def release_hold(hold_id):
+        """Gives a held seat back, e.g. when the wizard is restarted."""
+        if hold_id:
+            SeatHold.objects.filter(pk=hold_id).delete()
+
+    @classmethod
+    def book_seat(cls, trip_id, customer_id, user, hold_id=None, status=Booking.Status.PENDING_DOCUMENTS):
+        """
+        Creates a booking for the trip, consuming the caller's hold if it is
+        still active. Raises NoSeatsAvailable when the trip is full.
+        """
+        with transaction.atomic():
+            trip, active_holds = cls._lock_trip(trip_id)
+            cls._ensure_capacity(trip, active_holds, hold_id=hold_id)
+
+            booking = Booking.objects.create(
+                customer_id=customer_id,
+                trip=trip,
+                created_by=user,
+                total_amount=trip.price_per_person,
+                status=status
+            )
+            if hold_id:
+                SeatHold.objects.filter(pk=hold_id).delete()
+            return booking
@@ -1,87 +1,66 @@
 # bookings/signals.py
 
-import requests
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.conf import settings
-from .models import Booking, Payment
-
-# A simple logging function for development
-def log_webhook_attempt(url, payload, response):
-    """Logs the outcome of a webhook attempt for debugging."""
-    if settings.DEBUG:
-        print(f"--- Webhook Attempt ---")
-        print(f"URL: {url}")
-        print(f"Payload: {payload}")
-        if response:
-            print(f"Status Code: {response.status_code}")
-            print(f"Response: {response.text[:200]}") # Print first 200 chars
-        else:
-            print("Status: FAILED (Request exception)")
-        print(f"-----------------------")
-
+from trips.models import Trip
+from .models import Booking, Payment, Outbox
 
 @receiver(post_save, sender=Booking)
 def trigger_new_booking_workflow(sender, instance, created, **kwargs):
     """
-    Sends a webhook to n8n when a new booking is created.
-    This fulfills requirement 004-FR-BOK.
+    Queues a webhook to n8n when a new booking is created.
+    This fulfills requirement 004-FR-BOK. The event is written to the
+    outbox in the booking's transaction and delivered by `dispatch_outbox`.
     """
     if created: # Only trigger on creation
-        webhook_url = settings.N8N_NEW_BOOKING_WEBHOOK_URL
-        if not webhook_url:
-            if settings.DEBUG:
-                print("WARNING: N8N_NEW_BOOKING_WEBHOOK_URL is not set. Skipping webhook.")
-            return
-
         payload = {
             'booking_id': instance.id,
-            'customer_id': instance.customer.id,
-            'trip_id': instance.trip.id,
+            'customer_id': instance.customer_id,
+            'trip_id': instance.trip_id,
         }
-        
-        try:
-            # Use a timeout to prevent blocking the main thread for too long.
-            response = requests.post(webhook_url, json=payload, timeout=5)
-            log_webhook_attempt(webhook_url, payload, response)
-        except requests.exceptions.RequestException as e:
-            log_webhook_attempt(webhook_url, payload, None)
-            # In a production environment, this error should be sent to a proper logging service.
-            print(f"ERROR: Webhook request failed: {e}")
+        Outbox.enqueue('new_booking', settings.N8N_NEW_BOOKING_WEBHOOK_URL, payload)
+
+@receiver(post_delete, sender=Booking)
+def release_seat_on_booking_delete(sender, instance, **kwargs):
+    """
+    Gives the seat of a deleted, non-cancelled booking back to its trip so
+    that Trip.booked_seats_count stays accurate.
+    """
+    if instance.status != Booking.Status.CANCELLED:
+        with transaction.atomic():
+            Trip.adjust_booked_seats(instance.trip_id, -1)
+
+@receiver(post_delete, sender=Payment)
+def release_deleted_payment(sender, instance, **kwargs):
+    """
+    Removes a deleted payment's amount from its booking's cached total.
+    """
+    Booking.adjust_amount_paid(instance.booking_id, -instance.amount_paid)
 
 @receiver(post_save, sender=Payment)
 def handle_new_payment(sender, instance, created, **kwargs):
     """
     Handles logic after a payment is saved.
     1. Updates the associated booking's status. (Requirement 002-FR-FIN)
-    2. Sends a webhook to n8n to trigger a receipt workflow. (Requirement 003-FR-FIN)
+    2. Queues a webhook to n8n to trigger a receipt workflow. (Requirement 003-FR-FIN)
     """
-    booking = instance.booking
-    
-    # 1. Update Booking Status
-    if booking.balance_due <= 0:
-        booking.status = Booking.Status.FULLY_PAID
-    elif booking.status == Booking.Status.PENDING_PAYMENT:
-        booking.status = Booking.Status.CONFIRMED
-    booking.save()
+    # 1. Update Booking Status with a single conditional UPDATE; nothing is
+    # written when the status stays the same.
+    if Booking.sync_payment_status(instance.booking_id):
+        booking_field = Payment._meta.get_field('booking')
+        if booking_field.is_cached(instance):
+            # Keep an already loaded booking in step so a later save()
+            # does not write the old status back.
+            instance.booking.refresh_from_db(fields=['status'])
+            instance.booking._original_status = instance.booking.status
 
-    # 2. Trigger Receipt Webhook (only on creation)
+    # 2. Queue Receipt Webhook (only on creation)
     if created:
-        webhook_url = settings.N8N_PAYMENT_RECEIPT_WEBHOOK_URL
-        if not webhook_url:
-            if settings.DEBUG:
-                print("WARNING: N8N_PAYMENT_RECEIPT_WEBHOOK_URL is not set. Skipping webhook.")
-            return
-
         payload = {
             'payment_id': instance.id,
-            'booking_id': booking.id,
-            'customer_id': booking.customer.id,
+            'booking_id': instance.booking_id,
+            'customer_id': instance.booking.customer_id,
         }
-        
-        try:
-            response = requests.post(webhook_url, json=payload, timeout=5)
-            log_webhook_attempt(webhook_url, payload, response)
-        except requests.exceptions.RequestException as e:
-            log_webhook_attempt(webhook_url, payload, None)
-            print(f"ERROR: Webhook request failed: {e}")
\ No newline at end of file
+        Outbox.enqueue('payment_receipt', settings.N8N_PAYMENT_RECEIPT_WEBHOOK_URL, payload)
@@ -0,0 +1,215 @@
+# bookings/tests/test_api.py
+
+import datetime
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from crm.models import Customer
+from trips.models import Trip
+from users.models import CustomUser
+from bookings.models import Booking, Payment
+
+BOOKINGS_URL = '/api/v1/bookings/bookings/'
+
+
+class BookingApiFilterTest(TestCase):
+    """
+    Tests server-side filtering and cursor pagination of the bookings API,
+    as used by the n8n reminder workflows.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(username='n8n', email='n8n@test.com', role='manager')
+        now = timezone.now()
+        cls.trip_a = Trip.objects.create(
+            name='Trip A', departure_date=now + datetime.timedelta(days=30),
+            return_date=now + datetime.timedelta(days=40), total_seats=50, price_per_person=1000
+        )
+        cls.trip_b = Trip.objects.create(
+            name='Trip B', departure_date=now + datetime.timedelta(days=90),
+            return_date=now + datetime.timedelta(days=100), total_seats=50, price_per_person=1000
+        )
+        statuses = [Booking.Status.PENDING_PAYMENT, Booking.Status.PENDING_DOCUMENTS, Booking.Status.CONFIRMED]
+        for i in range(12):
+            customer = Customer.objects.create(
+                full_name=f'Pilgrim {i}', phone_number=f'800{i}', passport_number=f'A{i}',
+                passport_expiry_date=now.date() + datetime.timedelta(days=365 * 5),
+                date_of_birth=datetime.date(1980, 1, 1)
+            )
+            Booking.objects.create(
+                customer=customer, trip=cls.trip_a if i % 2 else cls.trip_b,
+                total_amount=1000, status=statuses[i % 3]
+            )
+        # Spread the booking dates so the range filters have something to cut.
+        for i, booking in enumerate(Booking.objects.order_by('pk')):
+            Booking.objects.filter(pk=booking.pk).update(
+                booking_date=now - datetime.timedelta(days=i),
+                last_reminder_sent_at=now - datetime.timedelta(days=2) if i < 4 else None,
+            )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get(self, **params):
+        response = self.client.get(BOOKINGS_URL, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_status_filter(self):
+        body = self.get(status='pending_payment')
+        self.assertEqual(len(body['results']), 4)
+        self.assertTrue(all(b['status'] == 'pending_payment' for b in body['results']))
+
+        body = self.get(status='pending_payment,confirmed', trip=self.trip_a.pk)
+        self.assertEqual({b['trip']['id'] for b in body['results']}, {self.trip_a.pk})
+        self.assertEqual(len(body['results']), 4)
+
+    def test_date_and_reminder_filters(self):
+        today = timezone.localdate()
+        body = self.get(booking_date_after=(today - datetime.timedelta(days=2)).isoformat())
+        self.assertEqual(len(body['results']), 3)
+
+        self.assertEqual(len(self.get(last_reminder_sent_isnull='true')['results']), 8)
+        due = self.get(reminder_due_before=(timezone.now() - datetime.timedelta(days=1)).isoformat().replace('+00:00', 'Z'))
+        self.assertEqual(len(due['results']), 12)
+        due = self.get(reminder_due_before=(timezone.now() - datetime.timedelta(days=3)).date().isoformat())
+        self.assertEqual(len(due['results']), 8)
+
+    def test_invalid_filters_are_rejected(self):
+        response = self.client.get(BOOKINGS_URL, {'status': 'lost', 'trip': 'abc', 'booking_date_after': 'soon'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {'status', 'trip', 'booking_date_after'})
+
+    def test_cursor_pagination_walks_every_booking_once(self):
+        seen = []
+        body = self.get(page_size=5)
+        pages = 1
+        while True:
+            seen.extend(b['id'] for b in body['results'])
+            if not body['next']:
+                break
+            response = self.client.get(body['next'])
+            body = response.json()
+            pages += 1
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(len(seen), 12)
+        self.assertEqual(len(set(seen)), 12)
+        expected = list(Booking.objects.order_by('-booking_date', '-id').values_list('pk', flat=True))
+        self.assertEqual(seen, expected)
+
+
+class BookingPageFixture:
+    """
+    100 bookings spread over 5 trips, each with two payments.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(username='api', email='api@test.com', role='manager')
+        now = timezone.now()
+        cls.trips = [
+            Trip.objects.create(
+                name=f'Trip {i}', departure_date=now + datetime.timedelta(days=30 + i),
+                return_date=now + datetime.timedelta(days=40 + i), total_seats=100, price_per_person=1000
+            ) for i in range(5)
+        ]
+        customers = Customer.objects.bulk_create([
+            Customer(
+                full_name=f'Pilgrim {i}', phone_number=f'810{i:04d}', passport_number=f'Q{i:05d}',
+                passport_expiry_date=now.date() + datetime.timedelta(days=365 * 5),
+                date_of_birth=datetime.date(1980, 1, 1)
+            ) for i in range(100)
+        ])
+        bookings = Booking.objects.bulk_create([
+            Booking(customer=c, trip=cls.trips[i % 5], total_amount=1000, booking_date=now - datetime.timedelta(minutes=i))
+            for i, c in enumerate(customers)
+        ])
+        Payment.objects.bulk_create([
+            Payment(booking=b, amount_paid=100, payment_date=now.date()) for b in bookings for _ in range(2)
+        ])
+        Booking.objects.all().refresh_amount_paid_totals()
+        call_command('reconcile_seat_counts', stdout=StringIO())
+
+
+class BookingApiQueryCountTest(BookingPageFixture, TestCase):
+    """
+    Guards the bookings API against N+1 queries: a page costs the same
+    number of queries for 10 bookings as for 100.
+    """
+
+    def test_page_query_count_is_constant(self):
+        self.client.force_login(self.user)
+        counts = {}
+        for size in (10, 100):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(BOOKINGS_URL, {'page_size': size})
+            self.assertEqual(len(response.json()['results']), size)
+            counts[size] = len(queries)
+
+        self.assertEqual(counts[10], counts[100])
+        # session, user, bookings page, payments prefetch
+        self.assertLessEqual(counts[100], 4)
+
+        first = response.json()['results'][0]
+        self.assertEqual(len(first['payments']), 2)
+        self.assertEqual(first['amount_paid'], '200.00')
+        self.assertEqual(first['balance_due'], '800.00')
+
+
+class SparseFieldsetApiTest(BookingPageFixture, TestCase):
+    """
+    Tests ?fields= and ?expand= on the bookings, trips and customers APIs.
+    """
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_n8n_reminder_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(BOOKINGS_URL, {
+                'fields': 'id,status,customer.phone_number,balance_due', 'page_size': 100
+            })
+        first = response.json()['results'][0]
+        self.assertEqual(set(first), {'id', 'status', 'customer', 'balance_due'})
+        self.assertEqual(set(first['customer']), {'phone_number'})
+        self.assertEqual(first['balance_due'], '800.00')
+
+        # session, user and the bookings page: no payments prefetch.
+        self.assertEqual(len(queries), 3)
+        page_sql = queries[-1]['sql']
+        self.assertIn('phone_number', page_sql)
+        self.assertNotIn('passport_number', page_sql)
+        self.assertNotIn('hotel_details', page_sql)
+
+    def test_expand_keeps_other_relations_as_ids(self):
+        response = self.client.get(BOOKINGS_URL, {'expand': 'trip', 'page_size': 5})
+        first = response.json()['results'][0]
+        self.assertIsInstance(first['customer'], int)
+        self.assertEqual(len(first['payments']), 2)
+        self.assertIsInstance(first['payments'][0], int)
+        self.assertEqual(first['trip']['available_seats'], 80)
+
+        response = self.client.get(BOOKINGS_URL, {'expand': 'payments', 'fields': 'id,payments', 'page_size': 5})
+        first = response.json()['results'][0]
+        self.assertEqual(set(first), {'id', 'payments'})
+        self.assertEqual(first['payments'][0]['amount_paid'], '100.00')
+
+    def test_trips_and_customers(self):
+        response = self.client.get('/api/v1/trips/trips/', {'fields': 'id,name,available_seats'})
+        self.assertEqual(set(response.json()[0]), {'id', 'name', 'available_seats'})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/crm/customers/', {'fields': 'id,phone_number'})
+        self.assertEqual(set(response.json()[0]), {'id', 'phone_number'})
+        self.assertNotIn('passport_number', queries[-1]['sql'])
+
+    def test_full_representation_is_unchanged_without_parameters(self):
+        first = self.client.get(BOOKINGS_URL, {'page_size': 1}).json()['results'][0]
+        self.assertEqual(first['customer']['full_name'][:7], 'Pilgrim')
+        self.assertIn('occupancy_rate', first['trip'])
@@ -121,4 +121,113 @@ class BookingPaymentModelTest(TestCase):
         self.assertEqual(booking.get_status_badge_class(), 'bg-success')
 
         booking.status = Booking.Status.CANCELLED
-        self.assertEqual(booking.get_status_badge_class(), 'bg-danger')
\ No newline at end of file
+        self.assertEqual(booking.get_status_badge_class(), 'bg-danger')
+
+    def test_cached_total_follows_payment_update_and_delete(self):
+        """
+        Ensures that editing and deleting payments keep the cached
+        amount_paid_total in step, and that reading balances costs no query.
+        """
+        booking = Booking.objects.create(
+            customer=self.customer,
+            trip=self.trip,
+            total_amount=5000.00,
+            created_by=self.user
+        )
+        payment = Payment.objects.create(
+            booking=booking,
+            amount_paid=1000.00,
+            payment_date=timezone.now().date(),
+            recorded_by=self.user
+        )
+        payment.amount_paid = 1200.00
+        payment.save()
+
+        booking = Booking.objects.get(pk=booking.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(booking.amount_paid, 1200)
+            self.assertEqual(booking.balance_due, 3800)
+
+        payment.delete()
+        booking.refresh_from_db()
+        self.assertEqual(booking.amount_paid, 0)
+        self.assertEqual(booking.balance_due, 5000)
+
+    def test_cached_total_follows_update_through_deferred_instance(self):
+        """
+        Ensures that a payment loaded with .only() or .defer() still moves
+        the difference into the cached total when its amount changes.
+        """
+        booking = Booking.objects.create(
+            customer=self.customer, trip=self.trip, total_amount=5000.00, created_by=self.user
+        )
+        payment = Payment.objects.create(
+            booking=booking, amount_paid=1000.00, payment_date=timezone.now().date(), recorded_by=self.user
+        )
+        deferred = Payment.objects.only('id', 'payment_date').get(pk=payment.pk)
+        deferred.amount_paid = 1500.00
+        deferred.save()
+        booking.refresh_from_db()
+        self.assertEqual(booking.amount_paid, 1500)
+
+        deferred = Payment.objects.defer('amount_paid').get(pk=payment.pk)
+        deferred.payment_date = timezone.now().date()
+        deferred.save()
+        booking.refresh_from_db()
+        self.assertEqual(booking.amount_paid, 1500)
+
+    def test_with_financials_annotates_live_totals(self):
+        """
+        Ensures with_financials() computes totals from the payments table.
+        """
+        booking = Booking.objects.create(
+            customer=self.customer,
+            trip=self.trip,
+            total_amount=5000.00,
+            created_by=self.user
+        )
+        for amount in (700, 300):
+            Payment.objects.create(booking=booking, amount_paid=amount, payment_date=timezone.now().date())
+
+        annotated = Booking.objects.with_financials().get(pk=booking.pk)
+        self.assertEqual(annotated.payments_total, 1000)
+        self.assertEqual(annotated.outstanding_balance, 4000)
+        self.assertEqual(annotated.payments_total, annotated.amount_paid)
+
+    def test_refresh_amount_paid_totals_after_bulk_create(self):
+        """
+        Ensures that totals drifted by bulk_create() can be recomputed.
+        """
+        booking = Booking.objects.create(
+            customer=self.customer,
+            trip=self.trip,
+            total_amount=5000.00,
+            created_by=self.user
+        )
+        Payment.objects.bulk_create([
+            Payment(booking=booking, amount_paid=250, payment_date=timezone.now().date()),
+            Payment(booking=booking, amount_paid=750, payment_date=timezone.now().date()),
+        ])
+        Booking.objects.filter(pk=booking.pk).refresh_amount_paid_totals()
+        booking.refresh_from_db()
+        self.assertEqual(booking.amount_paid, 1000)
+
+    def test_cached_total_follows_edits_through_stale_copies(self):
+        """
+        Ensures that two edits of the same payment, each made on a copy
+        loaded before the other was saved, leave the cached total equal to
+        the stored amount.
+        """
+        booking = Booking.objects.create(
+            customer=self.customer, trip=self.trip, total_amount=5000.00, created_by=self.user
+        )
+        payment = Payment.objects.create(
+            booking=booking, amount_paid=1000.00, payment_date=timezone.now().date(), recorded_by=self.user
+        )
+        first, second = Payment.objects.get(pk=payment.pk), Payment.objects.get(pk=payment.pk)
+        first.amount_paid = 1500.00
+        first.save()
+        second.amount_paid = 1200.00
+        second.save()
+        booking.refresh_from_db()
+        self.assertEqual(booking.amount_paid, 1200)
@@ -0,0 +1,136 @@
+# bookings/tests/test_outbox.py
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from bookings.models import Outbox
+from bookings.services.outbox_dispatcher import OutboxDispatcher
+
+
+class StubWebhookServer:
+    """
+    A local HTTP server standing in for n8n. It records every JSON body it
+    receives and answers with `status_code`.
+    """
+    def __init__(self):
+        self.received = []
+        self.status_code = 200
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                stub.received.append((self.path, json.loads(self.rfile.read(length))))
+                self.send_response(stub.status_code)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@override_settings(OUTBOX_RETRY_BASE_SECONDS=30)
+class OutboxDispatcherTest(TestCase):
+    """
+    Tests the delivery, retry and give-up behaviour of the OutboxDispatcher
+    against a local stub webhook server.
+    """
+
+    def test_pending_events_are_delivered_in_one_batch(self):
+        with StubWebhookServer() as stub:
+            for i in range(3):
+                Outbox.enqueue('new_booking', f"{stub.url}/new-booking", {'booking_id': i})
+            dispatcher = OutboxDispatcher(batch_size=10)
+            self.assertEqual(dispatcher.dispatch_batch(), (3, 0))
+            dispatcher.close()
+
+        self.assertEqual(
+            sorted(body['booking_id'] for _, body in stub.received), [0, 1, 2]
+        )
+        self.assertFalse(Outbox.objects.exclude(status=Outbox.Status.SENT).exists())
+        self.assertFalse(Outbox.objects.filter(sent_at__isnull=True).exists())
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        with StubWebhookServer() as stub:
+            stub.status_code = 503
+            event = Outbox.enqueue('payment_receipt', f"{stub.url}/receipt", {'payment_id': 1})
+            dispatcher = OutboxDispatcher(max_attempts=2)
+
+            before = timezone.now()
+            self.assertEqual(dispatcher.dispatch_batch(), (0, 1))
+            event.refresh_from_db()
+            self.assertEqual(event.status, Outbox.Status.PENDING)
+            self.assertEqual(event.attempts, 1)
+            self.assertGreaterEqual((event.next_attempt_at - before).total_seconds(), 30)
+            self.assertIn('503', event.last_error)
+
+            # Not due yet: nothing is claimed.
+            self.assertEqual(dispatcher.dispatch_batch(), (0, 0))
+
+            # Once due again, the last allowed attempt marks the event as failed.
+            Outbox.objects.filter(pk=event.pk).update(next_attempt_at=timezone.now())
+            self.assertEqual(dispatcher.dispatch_batch(), (0, 1))
+            dispatcher.close()
+
+        event.refresh_from_db()
+        self.assertEqual(event.status, Outbox.Status.FAILED)
+        self.assertEqual(len(stub.received), 2)
+
+    def test_dispatch_outbox_command_once(self):
+        with StubWebhookServer() as stub:
+            Outbox.enqueue('new_booking', f"{stub.url}/new-booking", {'booking_id': 7})
+            out = StringIO()
+            call_command('dispatch_outbox', '--once', stdout=out)
+
+        self.assertEqual(stub.received, [('/new-booking', {'booking_id': 7})])
+        self.assertIn('1 sent', out.getvalue())
+
+    def test_crash_mid_batch_only_resends_unrecorded_events(self):
+        with StubWebhookServer() as stub:
+            for i in range(3):
+                Outbox.enqueue('new_booking', f"{stub.url}/new-booking", {'booking_id': i})
+            dispatcher = OutboxDispatcher(batch_size=10)
+            post = dispatcher.session.post
+            calls = []
+
+            def crash_on_second(*args, **kwargs):
+                calls.append(1)
+                if len(calls) == 2:
+                    raise RuntimeError('worker killed')
+                return post(*args, **kwargs)
+
+            dispatcher.session.post = crash_on_second
+            with self.assertRaises(RuntimeError):
+                dispatcher.dispatch_batch()
+            self.assertEqual(Outbox.objects.filter(status=Outbox.Status.SENT).count(), 1)
+            self.assertEqual(Outbox.objects.filter(status=Outbox.Status.SENDING).count(), 2)
+
+            # The leased events are not taken over until the lease runs out.
+            other = OutboxDispatcher(batch_size=10)
+            self.assertEqual(other.dispatch_batch(), (0, 0))
+            Outbox.objects.filter(status=Outbox.Status.SENDING).update(next_attempt_at=timezone.now())
+            self.assertEqual(other.dispatch_batch(), (2, 0))
+            dispatcher.close()
+            other.close()
+
+        self.assertEqual(sorted(body['booking_id'] for _, body in stub.received), [0, 1, 2])
@@ -0,0 +1,154 @@
+# bookings/tests/test_payment_import.py
+
+import datetime
+from io import BytesIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import Workbook
+from rest_framework.test import APIClient
+
+from crm.models import Customer
+from trips.models import Trip
+from users.models import CustomUser
+from bookings.models import Booking, Payment, Outbox
+from bookings.services.payment_import import PaymentImportService
+from core.tests.utils import insert_batches
+
+
+@override_settings(N8N_PAYMENT_RECEIPT_WEBHOOK_URL='http://n8n.test/webhook/payment-receipt')
+class PaymentImportTest(TestCase):
+    """
+    Tests the bulk payment import through the service, the upload view
+    and the API endpoint.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.accountant = CustomUser.objects.create_user(
+            username='accountant', email='accountant@test.com', password='password123', role='accountant'
+        )
+        cls.agent = CustomUser.objects.create_user(
+            username='agent', email='agent@test.com', password='password123', role='agent'
+        )
+        cls.trip = Trip.objects.create(
+            name='Import Test Trip',
+            departure_date=timezone.now() + datetime.timedelta(days=60),
+            return_date=timezone.now() + datetime.timedelta(days=70),
+            total_seats=100,
+            price_per_person=1000
+        )
+        cls.bookings = []
+        for i in range(3):
+            customer = Customer.objects.create(
+                full_name=f'Import Customer {i}',
+                phone_number=f'77700{i}',
+                passport_number=f'IMP{i}',
+                passport_expiry_date=timezone.now().date() + datetime.timedelta(days=365 * 5),
+                date_of_birth=timezone.now().date() - datetime.timedelta(days=365 * 30)
+            )
+            cls.bookings.append(Booking.objects.create(
+                customer=customer, trip=cls.trip, total_amount=1000,
+                status=Booking.Status.PENDING_PAYMENT
+            ))
+        Outbox.objects.all().delete()
+
+    def rows(self):
+        today = timezone.now().date().isoformat()
+        return [
+            {'booking_id': self.bookings[0].pk, 'amount_paid': '1000', 'payment_date': today, 'payment_method': 'bank_transfer'},
+            {'booking_id': self.bookings[1].pk, 'amount_paid': '250.50', 'payment_date': today, 'payment_method': 'cash'},
+            {'booking_id': self.bookings[1].pk, 'amount_paid': '100', 'payment_date': today, 'payment_method': 'online'},
+        ]
+
+    def test_import_updates_totals_statuses_and_queues_receipts(self):
+        result = PaymentImportService.import_rows(self.rows(), self.accountant)
+        self.assertEqual(result, {'created': 3, 'errors': []})
+
+        first, second, untouched = (Booking.objects.get(pk=b.pk) for b in self.bookings)
+        self.assertEqual(first.status, Booking.Status.FULLY_PAID)
+        self.assertEqual(second.status, Booking.Status.CONFIRMED)
+        self.assertEqual(second.amount_paid, 350.50)
+        self.assertEqual(untouched.status, Booking.Status.PENDING_PAYMENT)
+        self.assertEqual(Outbox.objects.filter(event_type='payment_receipt').count(), 3)
+        self.assertEqual(Payment.objects.filter(recorded_by=self.accountant).count(), 3)
+
+    def test_invalid_row_rejects_whole_batch(self):
+        rows = self.rows() + [{'booking_id': 999999, 'amount_paid': '-5', 'payment_date': 'yesterday', 'payment_method': 'cheque'}]
+        result = PaymentImportService.import_rows(rows, self.accountant)
+
+        self.assertEqual(result['created'], 0)
+        self.assertEqual(result['errors'][0]['row'], 4)
+        self.assertEqual(
+            set(result['errors'][0]['errors']),
+            {'booking_id', 'amount_paid', 'payment_date', 'payment_method'}
+        )
+        self.assertFalse(Payment.objects.exists())
+
+    def test_booking_id_must_be_a_whole_number(self):
+        pk = self.bookings[0].pk
+        rows = self.rows()[:1]
+        for booking_id in (float(pk), str(pk), f' {pk} '):
+            rows[0]['booking_id'] = booking_id
+            payments, errors = PaymentImportService.validate(rows)
+            self.assertEqual((errors, payments[0].booking_id), ([], pk))
+        for booking_id in (pk + 0.7, f'{pk}.7', True, None, 'abc'):
+            rows[0]['booking_id'] = booking_id
+            payments, errors = PaymentImportService.validate(rows)
+            self.assertEqual(payments, [])
+            self.assertEqual(set(errors[0]['errors']), {'booking_id'})
+
+    def test_query_count_does_not_grow_with_rows(self):
+        def count_queries(rows):
+            with CaptureQueriesContext(connection) as ctx:
+                PaymentImportService.import_rows(rows, self.accountant)
+            return len(ctx.captured_queries)
+
+        today = timezone.now().date().isoformat()
+        small = [{'booking_id': self.bookings[2].pk, 'amount_paid': '1', 'payment_date': today}] * 10
+        large = [{'booking_id': self.bookings[2].pk, 'amount_paid': '1', 'payment_date': today}] * 500
+        # Only the bulk inserts may take more statements, where the backend
+        # caps the parameters of one (SQLite does).
+        batch_size = PaymentImportService.BATCH_SIZE
+        extra_batches = sum(
+            insert_batches(model, len(large), batch_size) - insert_batches(model, len(small), batch_size)
+            for model in (Payment, Outbox)
+        )
+        self.assertEqual(count_queries(small) + extra_batches, count_queries(large))
+
+    def test_upload_view_accepts_xlsx(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(list(PaymentImportService.COLUMNS))
+        sheet.append([self.bookings[2].pk, 400, datetime.datetime(2026, 1, 15, 9, 30), 'cash'])
+        content = BytesIO()
+        workbook.save(content)
+
+        self.client.force_login(self.accountant)
+        response = self.client.post(reverse('bookings:payment-import'), {
+            'file': SimpleUploadedFile('statement.xlsx', content.getvalue()),
+        })
+        self.assertRedirects(response, reverse('bookings:payment-import'))
+        self.assertEqual(Booking.objects.get(pk=self.bookings[2].pk).amount_paid, 400)
+
+    def test_api_bulk_import(self):
+        client = APIClient()
+        client.force_authenticate(self.agent)
+        url = '/api/v1/bookings/payments/bulk-import/'
+        self.assertEqual(client.post(url, self.rows(), format='json').status_code, 403)
+
+        client.force_authenticate(self.accountant)
+        csv_file = SimpleUploadedFile(
+            'statement.csv',
+            f"booking_id,amount_paid,payment_date,payment_method\n{self.bookings[0].pk},1000,2026-01-15,cash\n".encode()
+        )
+        response = client.post(url, {'file': csv_file}, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 1)
+
+        response = client.post(url, [{'booking_id': 'x'}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][0]['row'], 1)
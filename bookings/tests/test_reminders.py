@@ -0,0 +1,139 @@
+# bookings/tests/test_reminders.py
+
+import datetime
+import threading
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.utils import timezone
+
+from crm.models import Customer, CommunicationLog
+from trips.models import Trip
+from bookings.models import Booking, Outbox
+from bookings.services.reminder_scheduler import ReminderScheduler
+
+WEBHOOKS = {
+    'N8N_PAYMENT_REMINDER_WEBHOOK_URL': 'http://n8n.test/payment-reminder',
+    'N8N_DOCUMENT_REMINDER_WEBHOOK_URL': 'http://n8n.test/document-reminder',
+}
+
+
+def make_bookings(statuses):
+    now = timezone.now()
+    trip = Trip.objects.create(
+        name='Reminder Trip', departure_date=now + datetime.timedelta(days=30),
+        return_date=now + datetime.timedelta(days=40), total_seats=100, price_per_person=1000
+    )
+    bookings = []
+    for i, status in enumerate(statuses):
+        customer = Customer.objects.create(
+            full_name=f'Pilgrim {i}', phone_number=f'820{i:04d}', passport_number=f'M{i:05d}',
+            email=f'pilgrim{i}@test.com' if i % 2 else None,
+            passport_expiry_date=now.date() + datetime.timedelta(days=365 * 5),
+            date_of_birth=datetime.date(1980, 1, 1)
+        )
+        bookings.append(Booking.objects.create(customer=customer, trip=trip, total_amount=1000, status=status))
+    return bookings
+
+
+@override_settings(**WEBHOOKS, REMINDER_INTERVAL_HOURS=20)
+class ReminderSchedulerTest(TestCase):
+    """
+    Tests which bookings the reminder scheduler picks up and what each
+    batch writes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        S = Booking.Status
+        cls.bookings = make_bookings(
+            [S.PENDING_PAYMENT] * 5 + [S.PENDING_DOCUMENTS] * 3 + [S.CONFIRMED, S.CANCELLED]
+        )
+        now = timezone.now()
+        # Reminded an hour ago: not due. Reminded two days ago: due again.
+        Booking.objects.filter(pk=cls.bookings[0].pk).update(last_reminder_sent_at=now - datetime.timedelta(hours=1))
+        Booking.objects.filter(pk=cls.bookings[1].pk).update(last_reminder_sent_at=now - datetime.timedelta(days=2))
+
+    def test_due_bookings_are_reminded_in_batches(self):
+        # Only odd-numbered customers have an email address.
+        started = timezone.now()
+        totals = ReminderScheduler(batch_size=1).run()
+        self.assertEqual(totals, {'payment': 2, 'documents': 2})
+
+        batches = Outbox.objects.filter(event_type__endswith='_reminder_batch').order_by('pk')
+        self.assertEqual(
+            [(e.event_type, len(e.payload['bookings'])) for e in batches],
+            [('payment_reminder_batch', 1), ('payment_reminder_batch', 1),
+             ('documents_reminder_batch', 1), ('documents_reminder_batch', 1)]
+        )
+        self.assertEqual(batches[0].webhook_url, WEBHOOKS['N8N_PAYMENT_REMINDER_WEBHOOK_URL'])
+        self.assertEqual(batches[0].payload['triggered_by'], 'Daily Payment Reminder')
+        item = batches[0].payload['bookings'][0]
+        self.assertEqual(item['booking_id'], self.bookings[1].pk)
+        self.assertEqual(item['balance_due'], '1000.00')
+        self.assertEqual(item['subject'], 'Reminder: Payment Due for your booking on Reminder Trip. Balance: 1000.00')
+
+        reminded = set(Booking.objects.filter(last_reminder_sent_at__gte=started).values_list('pk', flat=True))
+        self.assertEqual(reminded, {self.bookings[i].pk for i in (1, 3, 5, 7)})
+        # n8n logs each reminder once it knows whether the email went out.
+        self.assertFalse(CommunicationLog.objects.exists())
+
+        # Nothing is due on a second run.
+        self.assertEqual(ReminderScheduler(batch_size=1).run(), {'payment': 0, 'documents': 0})
+
+    def test_customers_without_email_are_not_claimed(self):
+        Customer.objects.filter(pk=self.bookings[3].customer_id).update(email='')
+        self.assertEqual(
+            list(ReminderScheduler().due('payment').values_list('pk', flat=True)), [self.bookings[1].pk]
+        )
+
+    def test_batch_cost_does_not_grow_with_its_size(self):
+        # Claim, outbox row, timestamp update.
+        with self.assertNumQueries(5):  # plus savepoint and release
+            self.assertEqual(ReminderScheduler(batch_size=10).send_batch('payment'), 2)
+
+    @override_settings(N8N_PAYMENT_REMINDER_WEBHOOK_URL=None)
+    def test_unconfigured_webhook_sends_nothing(self):
+        self.assertEqual(ReminderScheduler().run(['payment']), {'payment': 0})
+        self.assertFalse(Outbox.objects.exists())
+
+    def test_command(self):
+        out = StringIO()
+        call_command('send_reminders', '--kind', 'documents', stdout=out)
+        self.assertIn('documents: 2 bookings reminded.', out.getvalue())
+        self.assertEqual(Outbox.objects.get().payload['reminder'], 'documents')
+
+
+@skipUnlessDBFeature('has_select_for_update_skip_locked')
+@override_settings(**WEBHOOKS)
+class ReminderClaimTest(TransactionTestCase):
+    """
+    Verifies that a scheduler skips bookings another one has claimed
+    instead of waiting for them or reminding them twice.
+    """
+
+    def test_locked_bookings_are_skipped(self):
+        bookings = make_bookings([Booking.Status.PENDING_PAYMENT] * 4)
+        locked = threading.Event()
+        done = threading.Event()
+
+        def other_scheduler():
+            with transaction.atomic():
+                list(Booking.objects.select_for_update().filter(pk__in=[b.pk for b in bookings[:3]]))
+                locked.set()
+                done.wait(10)
+            connection.close()
+
+        thread = threading.Thread(target=other_scheduler)
+        thread.start()
+        locked.wait(10)
+        try:
+            self.assertEqual(ReminderScheduler().run(['payment']), {'payment': 1})
+        finally:
+            done.set()
+            thread.join()
+        self.assertEqual(
+            list(Booking.objects.filter(last_reminder_sent_at__isnull=False).values_list('pk', flat=True)),
+            [bookings[3].pk]
+        )
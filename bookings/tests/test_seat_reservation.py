@@ -0,0 +1,191 @@
+# bookings/tests/test_seat_reservation.py
+
+import datetime
+import sys
+import threading
+import time
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.urls import reverse
+from django.utils import timezone
+
+from crm.models import Customer
+from trips.models import Trip
+from users.models import CustomUser
+from bookings.models import Booking, SeatHold
+from bookings.services.seat_reservation import SeatReservationService, NoSeatsAvailable
+
+
+def make_customer(index):
+    return Customer.objects.create(
+        full_name=f'Pilgrim {index}',
+        phone_number=f'5550{index:04d}',
+        passport_number=f'R{index:06d}',
+        passport_expiry_date=timezone.now().date() + datetime.timedelta(days=365 * 5),
+        date_of_birth=timezone.now().date() - datetime.timedelta(days=365 * 30)
+    )
+
+
+def make_trip(total_seats):
+    return Trip.objects.create(
+        name='Reservation Test Trip',
+        departure_date=timezone.now() + datetime.timedelta(days=60),
+        return_date=timezone.now() + datetime.timedelta(days=70),
+        total_seats=total_seats,
+        price_per_person=3000.00
+    )
+
+
+class SeatReservationServiceTest(TestCase):
+    """
+    Tests the seat hold and booking rules of the SeatReservationService.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = CustomUser.objects.create_user(username='agent1', email='agent1@test.com', role='agent')
+        cls.other_agent = CustomUser.objects.create_user(username='agent2', email='agent2@test.com', role='agent')
+        cls.trip = make_trip(total_seats=1)
+        cls.customer = make_customer(1)
+
+    def test_hold_blocks_other_agents_until_it_expires(self):
+        """
+        An active hold takes the last seat; once expired, the seat is free again.
+        """
+        hold = SeatReservationService.hold_seat(self.trip.pk, self.agent)
+        with self.assertRaises(NoSeatsAvailable):
+            SeatReservationService.hold_seat(self.trip.pk, self.other_agent)
+
+        SeatHold.objects.filter(pk=hold.pk).update(expires_at=timezone.now() - datetime.timedelta(seconds=1))
+        other_hold = SeatReservationService.hold_seat(self.trip.pk, self.other_agent)
+        self.assertFalse(SeatHold.objects.filter(pk=hold.pk).exists())
+        self.assertEqual(other_hold.held_by, self.other_agent)
+
+    def test_booking_consumes_own_hold(self):
+        """
+        The holder can convert its hold into a booking on a full trip.
+        """
+        hold = SeatReservationService.hold_seat(self.trip.pk, self.agent)
+        booking = SeatReservationService.book_seat(self.trip.pk, self.customer.pk, self.agent, hold_id=hold.pk)
+
+        self.assertEqual(booking.total_amount, self.trip.price_per_person)
+        self.assertFalse(SeatHold.objects.exists())
+        self.trip.refresh_from_db()
+        self.assertEqual(self.trip.available_seats, 0)
+        with self.assertRaises(NoSeatsAvailable):
+            SeatReservationService.book_seat(self.trip.pk, self.customer.pk, self.other_agent)
+
+    def test_extending_a_hold_does_not_take_a_second_seat(self):
+        hold = SeatReservationService.hold_seat(self.trip.pk, self.agent)
+        extended = SeatReservationService.hold_seat(self.trip.pk, self.agent, hold_id=hold.pk)
+        self.assertEqual(extended.pk, hold.pk)
+        self.assertEqual(SeatHold.objects.count(), 1)
+
+
+class SeatAvailabilityBatchTest(TestCase):
+    """
+    Tests the batch availability query and the polled endpoint built on it.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = CustomUser.objects.create_user(username='agent1', email='agent1@test.com', role='agent')
+        cls.full = make_trip(total_seats=1)
+        cls.open = make_trip(total_seats=3)
+        cls.done = make_trip(total_seats=5)
+        Trip.objects.filter(pk=cls.done.pk).update(status=Trip.Status.COMPLETED)
+        Booking.objects.create(customer=make_customer(1), trip=cls.full, total_amount=3000)
+        SeatHold.objects.create(trip=cls.open, expires_at=timezone.now() + datetime.timedelta(minutes=5))
+        SeatHold.objects.create(trip=cls.open, expires_at=timezone.now() - datetime.timedelta(minutes=5))
+        cls.url = reverse('bookings:seat-availability')
+
+    def test_one_query_for_many_trips(self):
+        with self.assertNumQueries(1):
+            rows = SeatReservationService.availability([self.full.pk, self.open.pk, self.done.pk])
+        by_id = {row['id']: row for row in rows}
+        self.assertEqual(by_id[self.full.pk]['available_seats'], 0)
+        self.assertFalse(by_id[self.full.pk]['seats_available'])
+        # One active hold counts, the expired one does not.
+        self.assertEqual(by_id[self.open.pk]['held_seats'], 1)
+        self.assertEqual(by_id[self.open.pk]['available_seats'], 2)
+        self.assertEqual(by_id[self.done.pk]['available_seats'], 5)
+
+    def test_all_bookable_trips_and_own_hold(self):
+        rows = SeatReservationService.availability()
+        self.assertEqual([row['id'] for row in rows], [self.full.pk, self.open.pk])
+
+        hold = SeatHold.objects.get(trip=self.open, expires_at__gt=timezone.now())
+        rows = SeatReservationService.availability([self.open.pk], exclude_hold_id=hold.pk)
+        self.assertEqual(rows[0]['available_seats'], 3)
+
+    def test_endpoint_etag_and_cache_headers(self):
+        self.client.force_login(self.agent)
+        response = self.client.get(self.url, {'trip_ids': f'{self.full.pk},{self.open.pk}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['trips']), 2)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('max-age=', response['Cache-Control'])
+        etag = response['ETag']
+
+        again = self.client.get(self.url, {'trip_ids': f'{self.full.pk},{self.open.pk}'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b'')
+
+        SeatHold.objects.create(trip=self.open, expires_at=timezone.now() + datetime.timedelta(minutes=5))
+        changed = self.client.get(self.url, {'trip_ids': f'{self.full.pk},{self.open.pk}'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+
+    def test_endpoint_rejects_bad_ids(self):
+        self.client.force_login(self.agent)
+        self.assertEqual(self.client.get(self.url, {'trip_ids': '1,abc'}).status_code, 400)
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class SeatReservationConcurrencyTest(TransactionTestCase):
+    """
+    Runs many threads that book the same trip at once, as happens when a
+    Hajj season opens, and verifies that the trip is never oversold.
+    """
+    THREADS = 20
+    SEATS = 7
+
+    def test_concurrent_bookings_never_oversell(self):
+        agent = CustomUser.objects.create_user(username='agent', email='agent@test.com', role='agent')
+        trip = make_trip(total_seats=self.SEATS)
+        customers = [make_customer(i) for i in range(self.THREADS)]
+
+        results = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(self.THREADS)
+
+        def attempt(customer):
+            try:
+                barrier.wait()
+                SeatReservationService.book_seat(trip.pk, customer.pk, agent)
+                outcome = 'booked'
+            except NoSeatsAvailable:
+                outcome = 'rejected'
+            finally:
+                connection.close()
+            with lock:
+                results.append(outcome)
+
+        threads = [threading.Thread(target=attempt, args=(c,)) for c in customers]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        trip.refresh_from_db()
+        self.assertEqual(results.count('booked'), self.SEATS)
+        self.assertEqual(results.count('rejected'), self.THREADS - self.SEATS)
+        self.assertEqual(Booking.objects.filter(trip=trip).count(), self.SEATS)
+        self.assertEqual(trip.booked_seats, self.SEATS)
+
+        sys.stderr.write(
+            f"\n[seat reservation] {self.THREADS} concurrent attempts on {self.SEATS} seats: "
+            f"0 oversold, {elapsed:.3f}s total, {self.THREADS / elapsed:.1f} attempts/s\n"
+        )
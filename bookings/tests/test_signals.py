@@ -2,18 +2,28 @@
 
 import datetime
 from unittest.mock import patch
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from crm.models import Customer
 from trips.models import Trip
 from users.models import CustomUser
-from bookings.models import Booking, Payment
+from bookings.models import Booking, Payment, Outbox
 
+NEW_BOOKING_URL = 'http://n8n.test/webhook/new-booking'
+PAYMENT_RECEIPT_URL = 'http://n8n.test/webhook/payment-receipt'
+
+
+@override_settings(
+    N8N_NEW_BOOKING_WEBHOOK_URL=NEW_BOOKING_URL,
+    N8N_PAYMENT_RECEIPT_WEBHOOK_URL=PAYMENT_RECEIPT_URL,
+)
 class BookingSignalsTest(TestCase):
     """
     Contains tests to ensure that Django signals related to the bookings app
-    are firing correctly and triggering the expected webhooks.
+    are firing correctly and queueing the expected webhook events.
     """
 
     @classmethod
@@ -37,37 +47,41 @@ class BookingSignalsTest(TestCase):
             price_per_person=1000.00
         )
 
-    @patch('bookings.signals.requests.post')
-    def test_new_booking_webhook_is_sent(self, mock_post):
+    @patch('requests.Session.post')
+    @patch('requests.post')
+    def test_new_booking_webhook_is_sent(self, mock_post, mock_session_post):
         """
         Tests that creating a new Booking triggers the `trigger_new_booking_workflow`
-        signal and that `requests.post` is called with the correct data.
+        signal, which queues exactly one outbox event with the correct data
+        and performs no HTTP call during the save.
         """
         # Create a new booking, which should fire the signal
-        Booking.objects.create(
+        booking = Booking.objects.create(
             customer=self.customer,
             trip=self.trip,
             created_by=self.user,
             total_amount=self.trip.price_per_person
         )
 
-        # Assert that requests.post was called exactly once
-        mock_post.assert_called_once()
+        # The webhook is delivered later by the dispatcher, not inside save().
+        mock_post.assert_not_called()
+        mock_session_post.assert_not_called()
+
+        events = Outbox.objects.filter(event_type='new_booking')
+        self.assertEqual(events.count(), 1)
+        event = events.get()
+        self.assertEqual(event.webhook_url, NEW_BOOKING_URL)
 
-        # Get the arguments with which requests.post was called
-        args, kwargs = mock_post.call_args
-        
         # Check that the payload is correct
-        self.assertIn('json', kwargs)
-        payload = kwargs['json']
+        payload = event.payload
+        self.assertEqual(payload['booking_id'], booking.id)
         self.assertEqual(payload['customer_id'], self.customer.id)
         self.assertEqual(payload['trip_id'], self.trip.id)
 
-    @patch('bookings.signals.requests.post')
-    def test_new_payment_webhook_is_sent(self, mock_post):
+    def test_new_payment_webhook_is_sent(self):
         """
         Tests that creating a new Payment triggers the `handle_new_payment`
-        signal and sends the correct webhook.
+        signal and queues the correct receipt event.
         """
         booking = Booking.objects.create(
             customer=self.customer,
@@ -76,20 +90,78 @@ class BookingSignalsTest(TestCase):
         )
 
         # Create a new payment, which should fire the signal
-        Payment.objects.create(
+        payment = Payment.objects.create(
             booking=booking,
             amount_paid=500.00,
             payment_date=timezone.now().date(),
             recorded_by=self.user
         )
 
-        # The signal for booking creation is also called, so we check the last call
-        self.assertTrue(mock_post.called)
-        
-        # Get the arguments of the LAST call to requests.post
-        args, kwargs = mock_post.call_args
-        
-        self.assertIn('json', kwargs)
-        payload = kwargs['json']
+        event = Outbox.objects.get(event_type='payment_receipt')
+        self.assertEqual(event.webhook_url, PAYMENT_RECEIPT_URL)
+        payload = event.payload
+        self.assertEqual(payload['payment_id'], payment.id)
         self.assertEqual(payload['booking_id'], booking.id)
-        self.assertEqual(payload['customer_id'], self.customer.id)
\ No newline at end of file
+        self.assertEqual(payload['customer_id'], self.customer.id)
+
+    @override_settings(N8N_NEW_BOOKING_WEBHOOK_URL=None)
+    def test_unconfigured_webhook_is_skipped(self):
+        """
+        Tests that no event is queued when the webhook URL is not configured.
+        """
+        Booking.objects.create(
+            customer=self.customer,
+            trip=self.trip,
+            total_amount=self.trip.price_per_person
+        )
+        self.assertFalse(Outbox.objects.exists())
+
+    def test_payment_status_transitions(self):
+        """
+        Tests the status rules applied by `handle_new_payment`: a partial
+        payment confirms a pending-payment booking, full payment marks it as
+        fully paid, and cancelled bookings are left alone.
+        """
+        booking = Booking.objects.create(
+            customer=self.customer,
+            trip=self.trip,
+            total_amount=self.trip.price_per_person,
+            status=Booking.Status.PENDING_PAYMENT
+        )
+        Payment.objects.create(booking=booking, amount_paid=400, payment_date=timezone.now().date())
+        self.assertEqual(booking.status, Booking.Status.CONFIRMED)
+        Payment.objects.create(booking=booking, amount_paid=600, payment_date=timezone.now().date())
+        self.assertEqual(booking.status, Booking.Status.FULLY_PAID)
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, Booking.Status.FULLY_PAID)
+
+        cancelled = Booking.objects.create(
+            customer=self.customer,
+            trip=self.trip,
+            total_amount=self.trip.price_per_person,
+            status=Booking.Status.CANCELLED
+        )
+        Payment.objects.create(booking=cancelled, amount_paid=1000, payment_date=timezone.now().date())
+        cancelled.refresh_from_db()
+        self.assertEqual(cancelled.status, Booking.Status.CANCELLED)
+
+    def test_unchanged_status_is_not_written(self):
+        """
+        Tests that a payment costs a single conditional status UPDATE and
+        never a full booking save, and that it matches no row when the
+        status stays the same.
+        """
+        booking = Booking.objects.create(
+            customer=self.customer,
+            trip=self.trip,
+            total_amount=self.trip.price_per_person,
+            status=Booking.Status.PENDING_DOCUMENTS
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            Payment.objects.create(booking_id=booking.pk, amount_paid=100, payment_date=timezone.now().date())
+
+        booking_updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "bookings_booking"')]
+        self.assertEqual(len(booking_updates), 2)  # cached total + conditional status
+        self.assertIn('CASE WHEN', booking_updates[1])
+        self.assertFalse(any('"customer_id" =' in sql.split('WHERE')[0] for sql in booking_updates))
+        self.assertFalse(Booking.objects.exclude(status=Booking.Status.PENDING_DOCUMENTS).exists())
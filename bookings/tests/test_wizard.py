@@ -0,0 +1,43 @@
+# bookings/tests/test_wizard.py
+
+import datetime
+from django.test import TestCase
+from django.urls import reverse
+
+from crm.models import Customer
+from users.models import CustomUser
+
+
+class BookingWizardStepOneTest(TestCase):
+    """
+    Tests the customer step of the booking wizard, which picks the
+    customer through the autocomplete endpoint instead of a full list.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = CustomUser.objects.create_user(username='agent', email='agent@test.com', role='agent')
+        cls.customer = Customer.objects.create(
+            full_name='Wizard Customer', phone_number='5551000', passport_number='W100',
+            passport_expiry_date=datetime.date(2030, 1, 1), date_of_birth=datetime.date(1980, 1, 1)
+        )
+        cls.url = reverse('bookings:booking-create-step', kwargs={'step': 1})
+
+    def setUp(self):
+        self.client.force_login(self.agent)
+
+    def test_step_one_does_not_list_customers(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, reverse('crm:customer-autocomplete'))
+        self.assertNotContains(response, 'Wizard Customer')
+
+    def test_step_one_requires_an_existing_customer(self):
+        response = self.client.post(self.url, {'customer_id': '999999'})
+        self.assertRedirects(response, self.url, fetch_redirect_response=False)
+        self.assertNotIn('booking_wizard_customer_id', self.client.session)
+
+        response = self.client.post(self.url, {'customer_id': str(self.customer.pk)})
+        self.assertRedirects(
+            response, reverse('bookings:booking-create-step', kwargs={'step': 2}), fetch_redirect_response=False
+        )
+        self.assertEqual(self.client.session['booking_wizard_customer_id'], self.customer.pk)
@@ -5,8 +5,10 @@ from .views import (
     BookingListView,
     BookingDetailView,
     AddPaymentView,
+    PaymentImportView,
     BookingCreateWizardView,
     CheckSeatAvailabilityView,
+    SeatAvailabilityBatchView,
 )
 
 app_name = 'bookings'
@@ -15,10 +17,12 @@ urlpatterns = [
     path('', BookingListView.as_view(), name='booking-list'),
     path('<int:pk>/', BookingDetailView.as_view(), name='booking-detail'),
     path('<int:booking_pk>/add-payment/', AddPaymentView.as_view(), name='add-payment'),
+    path('payments/import/', PaymentImportView.as_view(), name='payment-import'),
 
     # Booking Creation Wizard URLs
     path('create/step/<int:step>/', BookingCreateWizardView.as_view(), name='booking-create-step'),
     
     # HTMX URL
     path('htmx/check-seat-availability/', CheckSeatAvailabilityView.as_view(), name='check-seat-availability'),
+    path('htmx/seat-availability/', SeatAvailabilityBatchView.as_view(), name='seat-availability'),
 ]
\ No newline at end of file
@@ -1,18 +1,28 @@
 # bookings/views.py
 
+import hashlib
+import json
+
+from django.conf import settings
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy, reverse
 from django.views.generic import ListView, DetailView, FormView
 from django.views.generic.base import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
+from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
 
 from .models import Booking, Payment
-from .forms import PaymentForm
+from .forms import PaymentForm, PaymentImportForm
+from .services.seat_reservation import SeatReservationService, NoSeatsAvailable
+from .services.payment_import import PaymentImportService
 from trips.models import Trip
 from crm.models import Customer
+from users.mixins import AccountantRequiredMixin
 
 class BookingListView(LoginRequiredMixin, ListView):
     """
@@ -63,12 +73,37 @@ class AddPaymentView(LoginRequiredMixin, FormView):
         messages.error(self.request, _("There was an error in the form. Please correct it and try again."))
         return redirect('bookings:booking-detail', pk=self.kwargs.get('booking_pk'))
 
+class PaymentImportView(LoginRequiredMixin, AccountantRequiredMixin, FormView):
+    """
+    Imports a whole bank statement of payments from a CSV or XLSX upload.
+    Restricted to Accountants and Managers.
+    """
+    form_class = PaymentImportForm
+    template_name = 'bookings/payment_import.html'
+
+    def form_valid(self, form):
+        try:
+            rows = PaymentImportService.parse_file(form.cleaned_data['file'])
+        except (ValidationError, ValueError, KeyError, OSError) as e:
+            messages.error(self.request, _("The file could not be read: %(error)s") % {'error': e})
+            return self.render_to_response(self.get_context_data(form=form))
+
+        result = PaymentImportService.import_rows(rows, self.request.user)
+        if result['errors']:
+            messages.error(self.request, _("No payments were imported. Please fix the rows listed below."))
+            return self.render_to_response(self.get_context_data(form=form, row_errors=result['errors']))
+
+        messages.success(self.request, _("%(count)s payments imported successfully.") % {'count': result['created']})
+        return redirect('bookings:payment-import')
+
 # --- Booking Creation Wizard ---
 
 class BookingCreateWizardView(LoginRequiredMixin, View):
     """
     A view that orchestrates the multi-step booking creation wizard.
-    It uses the session to store data between steps.
+    It uses the session to store data between steps. Choosing a trip in
+    step 2 places a short-lived seat hold, which step 3 converts into the
+    booking, so a seat cannot be taken by another agent in between.
     """
     def get(self, request, *args, **kwargs):
         step = kwargs.get('step', 1)
@@ -77,11 +112,14 @@ class BookingCreateWizardView(LoginRequiredMixin, View):
             # Clear any previous wizard data from the session
             request.session.pop('booking_wizard_customer_id', None)
             request.session.pop('booking_wizard_trip_id', None)
+            SeatReservationService.release_hold(request.session.pop('booking_wizard_seat_hold_id', None))
+            # Customers are picked through the autocomplete endpoint, so the
+            # page itself does not depend on the number of customers.
             template_name = 'bookings/booking_wizard_step1_customer.html'
-            context = {'customers': Customer.objects.all()}
+            context = {}
         elif step == 2:
             template_name = 'bookings/booking_wizard_step2_trip.html'
-            context = {'trips': Trip.objects.filter(status__in=['scheduled', 'active'])}
+            context = {'trips': Trip.objects.filter(status__in=['scheduled', 'active']).with_occupancy()}
         elif step == 3:
             customer_id = request.session.get('booking_wizard_customer_id')
             trip_id = request.session.get('booking_wizard_trip_id')
@@ -102,30 +140,49 @@ class BookingCreateWizardView(LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
         step = kwargs.get('step', 1)
         if step == 1:
-            request.session['booking_wizard_customer_id'] = request.POST.get('customer_id')
+            customer_id = request.POST.get('customer_id', '')
+            if not customer_id.isdigit() or not Customer.objects.filter(pk=customer_id).exists():
+                messages.error(request, _("Please select a customer."))
+                return redirect(reverse('bookings:booking-create-step', kwargs={'step': 1}))
+            request.session['booking_wizard_customer_id'] = int(customer_id)
             return redirect(reverse('bookings:booking-create-step', kwargs={'step': 2}))
         elif step == 2:
-            request.session['booking_wizard_trip_id'] = request.POST.get('trip_id')
+            trip = get_object_or_404(Trip, pk=request.POST.get('trip_id'))
+            hold_id = request.session.get('booking_wizard_seat_hold_id')
+            if str(trip.pk) != str(request.session.get('booking_wizard_trip_id')):
+                SeatReservationService.release_hold(hold_id)
+                hold_id = None
+
+            try:
+                hold = SeatReservationService.hold_seat(trip.pk, request.user, hold_id=hold_id)
+            except NoSeatsAvailable as e:
+                request.session.pop('booking_wizard_seat_hold_id', None)
+                messages.error(request, str(e))
+                return redirect(reverse('bookings:booking-create-step', kwargs={'step': 2}))
+
+            request.session['booking_wizard_trip_id'] = trip.pk
+            request.session['booking_wizard_seat_hold_id'] = hold.pk
             return redirect(reverse('bookings:booking-create-step', kwargs={'step': 3}))
         elif step == 3:
             customer_id = request.session.get('booking_wizard_customer_id')
             trip_id = request.session.get('booking_wizard_trip_id')
-            trip = get_object_or_404(Trip, pk=trip_id)
-
-            if trip.available_seats <= 0:
-                messages.error(request, _("Sorry, no seats are available for this trip."))
+            get_object_or_404(Trip, pk=trip_id)
+
+            try:
+                booking = SeatReservationService.book_seat(
+                    trip_id,
+                    customer_id,
+                    request.user,
+                    hold_id=request.session.get('booking_wizard_seat_hold_id'),
+                )
+            except NoSeatsAvailable as e:
+                messages.error(request, str(e))
                 return redirect(reverse('bookings:booking-create-step', kwargs={'step': 2}))
 
-            booking = Booking.objects.create(
-                customer_id=customer_id,
-                trip_id=trip_id,
-                created_by=request.user,
-                total_amount=trip.price_per_person,
-                status=Booking.Status.PENDING_DOCUMENTS
-            )
             # Clear session data
             del request.session['booking_wizard_customer_id']
             del request.session['booking_wizard_trip_id']
+            request.session.pop('booking_wizard_seat_hold_id', None)
             
             messages.success(request, _("Booking created successfully!"))
             return redirect('bookings:booking-detail', pk=booking.pk)
@@ -138,18 +195,60 @@ class CheckSeatAvailabilityView(LoginRequiredMixin, View):
     """
     An HTMX-powered view that checks for available seats on a trip.
     FIX: This view now returns a JSON response, which is more robust for JavaScript to handle.
+    Kept for single-trip callers; the wizard polls SeatAvailabilityBatchView.
     """
     def get(self, request, *args, **kwargs):
         trip_id = request.GET.get('trip_id')
         if not trip_id:
             return JsonResponse({'error': 'No trip_id provided'}, status=400)
-        
-        try:
-            trip = Trip.objects.get(pk=trip_id)
-            seats_available = trip.available_seats > 0
-            return JsonResponse({
-                'trip_id': trip.id,
-                'seats_available': seats_available
-            })
-        except (Trip.DoesNotExist, ValueError, TypeError):
-            return JsonResponse({'error': 'Invalid trip_id'}, status=404)
\ No newline at end of file
+        if not trip_id.isdigit():
+            return JsonResponse({'error': 'Invalid trip_id'}, status=404)
+
+        rows = SeatReservationService.availability(
+            [int(trip_id)], exclude_hold_id=request.session.get('booking_wizard_seat_hold_id')
+        )
+        if not rows:
+            return JsonResponse({'error': 'Invalid trip_id'}, status=404)
+        return JsonResponse({
+            'trip_id': rows[0]['id'],
+            'seats_available': rows[0]['seats_available']
+        })
+
+
+class SeatAvailabilityBatchView(LoginRequiredMixin, View):
+    """
+    Returns seat availability for many trips in one response, for clients
+    that poll it (the booking wizard) instead of asking trip by trip.
+
+    ?trip_ids=1,2,3 selects trips; without it every bookable trip is
+    returned. Responses carry an ETag and a short private max-age, so a
+    poll within the max-age is answered from the browser cache and a poll
+    after it costs one grouped query and usually a body-less 304.
+    """
+    MAX_TRIP_IDS = 500
+
+    def get(self, request, *args, **kwargs):
+        trip_ids = None
+        raw = request.GET.get('trip_ids')
+        if raw is not None:
+            parts = [p.strip() for p in raw.split(',') if p.strip()]
+            if not all(p.isdigit() for p in parts) or len(parts) > self.MAX_TRIP_IDS:
+                return JsonResponse({'error': 'Invalid trip_ids'}, status=400)
+            trip_ids = [int(p) for p in parts]
+
+        rows = SeatReservationService.availability(
+            trip_ids, exclude_hold_id=request.session.get('booking_wizard_seat_hold_id')
+        )
+        payload = {'trips': rows}
+        etag = quote_etag(hashlib.md5(
+            json.dumps(payload, sort_keys=True).encode(), usedforsecurity=False
+        ).hexdigest())
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = JsonResponse(payload)
+        response['ETag'] = etag
+        # Availability depends on the session's own seat hold.
+        patch_cache_control(response, private=True, max_age=settings.SEAT_AVAILABILITY_MAX_AGE)
+        patch_vary_headers(response, ['Cookie'])
+        return response
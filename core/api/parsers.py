@@ -0,0 +1,40 @@
+# core/api/parsers.py
+
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class InvalidLine:
+    """Stands in for an NDJSON line that is not valid JSON."""
+    def __init__(self, error):
+        self.error = error
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses newline-delimited JSON (one value per line) into a list. The
+    body is read line by line; blank lines are skipped and a line that is
+    not valid JSON becomes an InvalidLine, so one bad line can be reported
+    by row instead of rejecting the whole upload.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if stream is None:
+            return []
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+        rows = []
+        try:
+            for raw in stream:
+                line = raw.decode(encoding).strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except ValueError as e:
+                    rows.append(InvalidLine(str(e)))
+        except UnicodeDecodeError as e:
+            raise ParseError(f"NDJSON parse error - {e}")
+        return rows
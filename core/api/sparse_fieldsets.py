@@ -0,0 +1,176 @@
+# core/api/sparse_fieldsets.py
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def parse_field_tree(value):
+    """
+    Turns "id,status,customer.phone_number" into
+    {'id': {}, 'status': {}, 'customer': {'phone_number': {}}}.
+    Returns None when the parameter is absent.
+    """
+    if value is None:
+        return None
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for part in path.strip().split('.'):
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Lets the client choose which fields a serializer renders.
+
+    `fields` keeps only the named fields; `expand` names the nested
+    relations to render as objects. Once either is given, nested relations
+    that are not expanded are rendered as primary keys. A dotted name in
+    `fields` (e.g. customer.phone_number) expands the relation and picks
+    fields inside it. Without either argument the serializer behaves as
+    before and renders everything.
+
+    `Meta.field_sources` maps computed fields to the model columns they
+    read, so the viewset can trim its queryset with .only().
+    """
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse = fields is not None or expand is not None
+        if not self.sparse:
+            return
+
+        expand = expand or {}
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+        for name, field in list(self.fields.items()):
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if not isinstance(nested, serializers.BaseSerializer):
+                continue
+            options = {'many': nested is not field, 'read_only': True}
+            if field.source != name:
+                options['source'] = field.source
+            sub_fields = (fields or {}).get(name) or None
+            if name in expand or sub_fields:
+                if isinstance(nested, SparseFieldsetSerializerMixin):
+                    self.fields[name] = type(nested)(fields=sub_fields, expand=expand.get(name, {}), **options)
+            else:
+                self.fields[name] = serializers.PrimaryKeyRelatedField(**options)
+
+
+def trim_queryset(queryset, serializer, extra_columns=()):
+    """
+    Restricts a queryset to what `serializer` renders: .only() on the
+    columns it reads, select_related for expanded forward relations and a
+    trimmed Prefetch for expanded or collapsed reverse relations. Falls
+    back to loading full rows when a field's columns are unknown.
+    """
+    only, select, prefetch, complete = _plan(queryset.model, serializer, '')
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if complete:
+        queryset = queryset.only('pk', *only, *extra_columns)
+    return queryset
+
+
+def _plan(model, serializer, prefix):
+    only, select, prefetch = [], [], []
+    complete = True
+    sources = getattr(getattr(serializer, 'Meta', None), 'field_sources', {})
+
+    for name, field in serializer.fields.items():
+        if isinstance(field, serializers.ManyRelatedField) or isinstance(field, serializers.ListSerializer):
+            relation = _relation(model, field.source)
+            if relation is None or not relation.one_to_many:
+                complete = False
+                continue
+            related = relation.related_model
+            fk_name = relation.field.name
+            if isinstance(field, serializers.ListSerializer):
+                child_only, child_select, _, child_complete = _plan(related, field.child, '')
+                related_qs = related._default_manager.select_related(*child_select)
+                if child_complete:
+                    related_qs = related_qs.only('pk', *child_only, fk_name)
+            else:
+                related_qs = related._default_manager.only('pk', fk_name)
+            prefetch.append(Prefetch(prefix + field.source, queryset=related_qs))
+            continue
+
+        if isinstance(field, serializers.BaseSerializer):
+            relation = _relation(model, field.source)
+            if relation is None or not (relation.many_to_one or relation.one_to_one) or relation.auto_created:
+                complete = False
+                continue
+            only.append(prefix + field.source)
+            select.append(prefix + field.source)
+            sub_only, sub_select, sub_prefetch, sub_complete = _plan(
+                relation.related_model, field, f"{prefix}{field.source}__"
+            )
+            select.extend(sub_select)
+            prefetch.extend(sub_prefetch)
+            if sub_complete:
+                only.extend(sub_only)
+            else:
+                complete = False
+            continue
+
+        for column in sources.get(name, [field.source]):
+            try:
+                model._meta.get_field(column)
+            except FieldDoesNotExist:
+                complete = False
+            else:
+                only.append(prefix + column)
+    return only, select, prefetch, complete
+
+
+def _relation(model, source):
+    try:
+        return model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return None
+
+
+class SparseFieldsetViewSetMixin:
+    """
+    Reads ?fields= and ?expand= on GET requests, passes them to the
+    serializer and trims the queryset to match, so payload size and
+    database work follow what the client asked for.
+    """
+    def get_sparse_fieldset(self):
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        fields = parse_field_tree(request.query_params.get('fields'))
+        expand = parse_field_tree(request.query_params.get('expand'))
+        if fields is None and expand is None:
+            return None
+        return fields, expand
+
+    def get_serializer(self, *args, **kwargs):
+        fieldset = self.get_sparse_fieldset()
+        if fieldset is not None and issubclass(self.get_serializer_class(), SparseFieldsetSerializerMixin):
+            kwargs.setdefault('fields', fieldset[0])
+            kwargs.setdefault('expand', fieldset[1])
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.get_sparse_fieldset() is None or not issubclass(
+            self.get_serializer_class(), SparseFieldsetSerializerMixin
+        ):
+            return queryset
+        # Cursor pagination reads its ordering columns from the last row.
+        ordering = getattr(self.paginator, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return trim_queryset(queryset, self.get_serializer(), [o.lstrip('-') for o in ordering])
@@ -6,4 +6,10 @@ from django.utils.translation import gettext_lazy as _
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
-    verbose_name = _('Core')
\ No newline at end of file
+    verbose_name = _('Core')
+
+    def ready(self):
+        """
+        Connects the signals that keep the cached dashboards fresh.
+        """
+        import core.signals
@@ -5,6 +5,11 @@ ASGI config for hajjumrahflow_django project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve it with an ASGI server, e.g. ``uvicorn core.asgi:application``. The
+async views (the streaming AI assistant, ai/ask/stream/) then wait on the
+AI service without holding a worker thread, while the sync views keep
+running in Django's thread pool.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 """
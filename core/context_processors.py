@@ -0,0 +1,12 @@
+# core/context_processors.py
+
+from django.core.handlers.asgi import ASGIRequest
+
+
+def ai_streaming(request):
+    """
+    Tells the templates whether the AI assistant can stream its answers.
+    Under WSGI an async streaming response is buffered to the end, so the
+    chat falls back to the plain ask endpoint there.
+    """
+    return {'ai_streaming': isinstance(request, ASGIRequest)}
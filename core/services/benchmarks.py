@@ -0,0 +1,124 @@
+# core/services/benchmarks.py
+
+"""
+Measures and compares the cost of serving a page or API response: how many
+SQL queries it runs, how long it takes and how many bytes it returns.
+
+Results are kept as JSON baselines per database backend, since query
+counts differ between them (see core/tests/test_benchmarks.py). A run
+regresses when it needs more queries than its baseline, its response
+grows past the configured tolerance or, when BENCHMARK_CHECK_TIME is set,
+its wall time does.
+
+    result = measure(lambda: client.get('/dashboard/'))
+    regressions = find_regressions({'dashboard': result}, load_baselines(path, connection.vendor))
+"""
+
+import gc
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Wall times this far above the baseline are tolerated even when the
+# relative tolerance would be stricter, so that millisecond-fast views do
+# not fail on timer noise.
+MIN_TIME_SLACK_MS = 50
+
+
+def response_size(response):
+    """
+    Returns the body size in bytes, reading streamed responses to the end
+    (the test client closes them once they are exhausted).
+    """
+    if getattr(response, 'streaming', False):
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def measure(call, runs=5):
+    """
+    Runs `call` once to warm up, then `runs` more times with an empty
+    cache, and returns its query count, median wall time in milliseconds
+    and response size. `call` returns an HttpResponse or bytes/str.
+    """
+    call()
+    timings = []
+    for _ in range(runs):
+        cache.clear()
+        # As timeit does: a collection triggered by earlier garbage would
+        # be charged to whichever call happens to run into it.
+        gc.collect()
+        gc.disable()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                result = call()
+                size = len(result) if isinstance(result, (bytes, str)) else response_size(result)
+                timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            gc.enable()
+    return {
+        'queries': len(queries),
+        'time_ms': round(statistics.median(timings), 2),
+        'bytes': size,
+    }
+
+
+def _read(path):
+    try:
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+
+
+def load_baselines(path, backend):
+    """
+    Returns the baselines recorded on `backend` (a connection.vendor), or
+    {} when none were recorded there yet.
+    """
+    return _read(path).get(backend, {})
+
+
+def save_baselines(path, backend, results):
+    """Replaces the baselines of `backend`, keeping those of the others."""
+    baselines = _read(path)
+    baselines[backend] = results
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(baselines, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+
+
+def find_regressions(results, baselines, time_tolerance=None, size_tolerance=None, check_time=None):
+    """
+    Compares measured `results` with `baselines` (both keyed by case name)
+    and returns one message per regression. Cases without a baseline are
+    reported too, so new cases are not left unguarded. Wall times are
+    compared only with `check_time` (default: BENCHMARK_CHECK_TIME).
+    """
+    if check_time is None:
+        check_time = settings.BENCHMARK_CHECK_TIME
+    if time_tolerance is None:
+        time_tolerance = settings.BENCHMARK_TIME_TOLERANCE
+    if size_tolerance is None:
+        size_tolerance = settings.BENCHMARK_SIZE_TOLERANCE
+
+    regressions = []
+    for name, result in sorted(results.items()):
+        baseline = baselines.get(name)
+        if baseline is None:
+            regressions.append(f"{name}: no baseline recorded")
+            continue
+        if result['queries'] > baseline['queries']:
+            regressions.append(f"{name}: {result['queries']} queries, baseline {baseline['queries']}")
+        if result['bytes'] > baseline['bytes'] * size_tolerance:
+            regressions.append(f"{name}: {result['bytes']} bytes, baseline {baseline['bytes']}")
+        time_limit = max(baseline['time_ms'] * time_tolerance, baseline['time_ms'] + MIN_TIME_SLACK_MS)
+        if check_time and result['time_ms'] > time_limit:
+            regressions.append(f"{name}: {result['time_ms']} ms, baseline {baseline['time_ms']} ms")
+    return regressions
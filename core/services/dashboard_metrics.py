@@ -0,0 +1,171 @@
+# core/services/dashboard_metrics.py
+
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum, Count, Q
+from django.utils import timezone
+
+from bookings.models import Booking, Payment
+from trips.models import Trip, Expense
+from crm.models import Customer
+
+VERSION_KEY = 'dashboard:version'
+
+
+class DashboardMetrics:
+    """
+    Computes the KPIs and lists shown on the role dashboards and caches
+    them per role (and per agent). Every cache key carries a data version
+    that is bumped whenever bookings, payments, expenses, trips or
+    customers change, so a cached dashboard is never served stale.
+    """
+    @staticmethod
+    def version():
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, 1, timeout=None)
+            version = cache.get(VERSION_KEY, 1)
+        return version
+
+    @staticmethod
+    def _bump_version():
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.add(VERSION_KEY, 1, timeout=None)
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Drops every cached dashboard once the current transaction commits,
+        so no request can re-cache data that is not visible yet.
+        """
+        transaction.on_commit(cls._bump_version)
+
+    @classmethod
+    def _cached(cls, key, compute):
+        today = timezone.localdate()
+        full_key = f"dashboard:{key}:v{cls.version()}:{today.isoformat()}"
+        data = cache.get(full_key)
+        if data is None:
+            data = compute(today)
+            cache.set(full_key, data, settings.DASHBOARD_CACHE_TIMEOUT)
+        return data
+
+    @classmethod
+    def for_manager(cls):
+        return cls._cached('manager', cls.compute_manager)
+
+    @classmethod
+    def for_agent(cls, agent):
+        return cls._cached(f'agent:{agent.pk}', lambda today: cls.compute_agent(agent, today))
+
+    @classmethod
+    def for_accountant(cls):
+        return cls._cached('accountant', cls.compute_accountant)
+
+    @staticmethod
+    def compute_manager(today):
+        """
+        Gathers the data required for the Manager dashboard.
+        """
+        start_of_month = today.replace(day=1)
+
+        # Key Performance Indicators (KPIs)
+        total_revenue_month = Payment.objects.filter(
+            payment_date__gte=start_of_month
+        ).aggregate(total=Sum('amount_paid'))['total'] or 0
+
+        new_bookings_month = Booking.objects.filter(
+            booking_date__gte=start_of_month
+        ).count()
+
+        active_trips_count = Trip.objects.filter(status=Trip.Status.ACTIVE).count()
+        total_customers_count = Customer.objects.count()
+
+        # Data for the occupancy chart: top 5 upcoming trips. Occupancy is
+        # read from the cached seat counter, not counted per trip.
+        upcoming_trips = Trip.objects.filter(
+            departure_date__gte=today,
+            status__in=[Trip.Status.SCHEDULED, Trip.Status.ACTIVE]
+        ).order_by('departure_date').only('name', 'total_seats', 'booked_seats_count')[:5]
+
+        chart_labels = [trip.name for trip in upcoming_trips]
+        chart_data = [round(trip.occupancy_rate, 2) for trip in upcoming_trips]
+
+        # Recent Activity
+        recent_bookings = list(
+            Booking.objects.select_related('customer', 'trip').order_by('-booking_date')[:5]
+        )
+
+        return {
+            'total_revenue_month': f"{total_revenue_month:,.2f}",
+            'new_bookings_month': new_bookings_month,
+            'active_trips_count': active_trips_count,
+            'total_customers_count': total_customers_count,
+            'chart_labels': json.dumps(chart_labels),
+            'chart_data': json.dumps(chart_data),
+            'recent_bookings': recent_bookings,
+        }
+
+    @staticmethod
+    def compute_agent(agent, today):
+        """
+        Gathers the data required for an Agent's dashboard.
+        """
+        my_bookings = Booking.objects.filter(created_by=agent)
+
+        # KPIs for the specific agent, counted in one pass
+        counts = my_bookings.aggregate(
+            today=Count('pk', filter=Q(booking_date__date=today)),
+            total=Count('pk'),
+        )
+
+        # Actionable Lists
+        pending_docs_bookings = list(my_bookings.filter(
+            status=Booking.Status.PENDING_DOCUMENTS
+        ).select_related('customer', 'trip')[:5])
+
+        pending_payment_bookings = list(my_bookings.filter(
+            status=Booking.Status.PENDING_PAYMENT
+        ).select_related('customer', 'trip')[:5])
+
+        return {
+            'my_bookings_today': counts['today'],
+            'my_total_bookings': counts['total'],
+            'pending_docs_bookings': pending_docs_bookings,
+            'pending_payment_bookings': pending_payment_bookings,
+        }
+
+    @staticmethod
+    def compute_accountant(today):
+        """
+        Gathers the data required for the Accountant dashboard.
+        """
+        # KPIs
+        collected_today = Payment.objects.filter(
+            payment_date=today
+        ).aggregate(total=Sum('amount_paid'))['total'] or 0
+
+        overdue_payments_count = Booking.objects.filter(
+            status=Booking.Status.PENDING_PAYMENT
+        ).count()
+
+        total_expenses_month = Expense.objects.filter(
+            expense_date__gte=today.replace(day=1)
+        ).aggregate(total=Sum('amount'))['total'] or 0
+
+        # Recent Transactions
+        recent_payments = list(Payment.objects.select_related(
+            'booking__customer', 'recorded_by'
+        ).order_by('-payment_date', '-created_at')[:10])
+
+        return {
+            'collected_today': f"{collected_today:,.2f}",
+            'overdue_payments_count': overdue_payments_count,
+            'total_expenses_month': f"{total_expenses_month:,.2f}",
+            'recent_payments': recent_payments,
+        }
@@ -0,0 +1,206 @@
+# core/services/http_client.py
+
+"""
+The outbound HTTP client shared by the webhook outbox and the AI assistant.
+
+Sessions keep a keep-alive connection pool per host, so calls to the same
+service reuse open TCP/TLS connections instead of paying the handshake
+every time. Every session applies default connect/read timeouts and an
+urllib3 retry policy, and every call's latency is logged to the
+"core.http" logger and added to per-host counters (see stats()).
+
+    session = get_session('ai', retry_statuses=(429, 502, 503, 504), retry_methods=('POST',))
+    session.post(url, json=payload)
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger('core.http')
+
+_sessions = {}
+_async_clients = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+_stats = {}
+
+
+def record_call(client, url, started, status=None, error=None):
+    """Logs one outbound call and adds it to the per-host counters."""
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    host = urlsplit(str(url)).netloc
+    failed = error is not None or (status is not None and status >= 400)
+    with _lock:
+        entry = _stats.setdefault((client, host), {'calls': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        entry['calls'] += 1
+        entry['errors'] += int(failed)
+        entry['total_ms'] += elapsed_ms
+        entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+    logger.debug("%s %s -> %s in %.1f ms", client, host, error or status, elapsed_ms)
+
+
+def stats():
+    """
+    Returns {"client host": {calls, errors, avg_ms, max_ms}} for the calls
+    made by this process.
+    """
+    with _lock:
+        return {
+            f"{client} {host}": {
+                'calls': entry['calls'],
+                'errors': entry['errors'],
+                'avg_ms': round(entry['total_ms'] / entry['calls'], 1),
+                'max_ms': round(entry['max_ms'], 1),
+            }
+            for (client, host), entry in _stats.items()
+        }
+
+
+def reset_stats():
+    with _lock:
+        _stats.clear()
+
+
+class InstrumentedSession(requests.Session):
+    """
+    A requests session that applies a default timeout and records the
+    latency of every call under its client name.
+    """
+    def __init__(self, name, timeout):
+        super().__init__()
+        self.name = name
+        self.timeout = timeout
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        started = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.exceptions.RequestException as e:
+            record_call(self.name, url, started, error=type(e).__name__)
+            raise
+        record_call(self.name, url, started, status=response.status_code)
+        return response
+
+
+def build_session(name, pool_size=None, connect_timeout=None, read_timeout=None,
+                  retries=None, retry_statuses=(), retry_methods=Retry.DEFAULT_ALLOWED_METHODS):
+    """
+    Returns a new InstrumentedSession; options default to the HTTP_CLIENT_*
+    settings. Failed connections are retried `retries` times with
+    exponential backoff. Responses with a status in `retry_statuses` are
+    retried only for `retry_methods`, which by default leaves out POST, as
+    a POST may have had an effect. The last response is returned, not
+    raised, so callers still see the final status.
+    """
+    pool_size = pool_size or settings.HTTP_CLIENT_POOL_SIZE
+    retries = settings.HTTP_CLIENT_RETRIES if retries is None else retries
+    session = InstrumentedSession(name, (
+        connect_timeout or settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+        read_timeout or settings.HTTP_CLIENT_READ_TIMEOUT,
+    ))
+    adapter = HTTPAdapter(
+        pool_connections=settings.HTTP_CLIENT_POOL_HOSTS,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=retries,
+            read=0,
+            status_forcelist=retry_statuses,
+            allowed_methods=frozenset(retry_methods),
+            backoff_factor=settings.HTTP_CLIENT_RETRY_BACKOFF,
+            raise_on_status=False,
+        ),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session(name, **options):
+    """
+    Returns the process-wide session called `name`, building it with
+    `options` (see build_session) on first use. Its pools live as long as
+    the process, so do not close it.
+    """
+    session = _sessions.get(name)
+    if session is None:
+        with _lock:
+            session = _sessions.get(name)
+            if session is None:
+                session = _sessions[name] = build_session(name, **options)
+    return session
+
+
+class InstrumentedAsyncTransport(httpx.AsyncHTTPTransport):
+    """
+    The async counterpart of InstrumentedSession: records every request,
+    including the ones that fail to connect, under its client name.
+    """
+    def __init__(self, name, **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+
+    async def handle_async_request(self, request):
+        started = time.perf_counter()
+        try:
+            response = await super().handle_async_request(request)
+        except httpx.HTTPError as e:
+            record_call(self.name, request.url, started, error=type(e).__name__)
+            raise
+        record_call(self.name, request.url, started, status=response.status_code)
+        return response
+
+
+async def _close_on_shutdown(clients):
+    """
+    Parks until the event loop shuts down. asyncio.run() (used by uvicorn
+    and by async_to_sync) closes pending async generators on its way out,
+    which runs the finally block and closes the loop's clients.
+    """
+    try:
+        yield
+    finally:
+        for client in clients.values():
+            await client.aclose()
+
+
+def get_async_client(name, max_connections=None, max_keepalive=None, connect_timeout=None, read_timeout=None):
+    """
+    Returns the pooled httpx.AsyncClient called `name` for the running
+    event loop, building it with the given limits on first use. An
+    AsyncClient cannot be shared between event loops, so each loop (one
+    per ASGI worker) gets its own, closed when that loop shuts down.
+    Calls are recorded like sync calls.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(loop)
+    if entry is None:
+        clients = {}
+        closer = _close_on_shutdown(clients)
+        # Keep the generator referenced: the loop only tracks it weakly.
+        entry = _async_clients[loop] = (clients, closer)
+        loop.create_task(closer.__anext__())
+    clients = entry[0]
+    client = clients.get(name)
+    if client is None or client.is_closed:
+        client = clients[name] = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections or settings.HTTP_CLIENT_POOL_SIZE,
+                max_keepalive_connections=max_keepalive or settings.HTTP_CLIENT_POOL_SIZE,
+            ),
+            timeout=httpx.Timeout(
+                read_timeout or settings.HTTP_CLIENT_READ_TIMEOUT,
+                connect=connect_timeout or settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+            ),
+            transport=InstrumentedAsyncTransport(name, retries=settings.HTTP_CLIENT_RETRIES),
+        )
+    return client
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third-party apps
     'rest_framework',
@@ -87,6 +88,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.context_processors.ai_streaming',
             ],
         },
     },
@@ -96,16 +98,26 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 
 # Database
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': get_env_variable('DB_NAME'),
-        'USER': get_env_variable('DB_USER'),
-        'PASSWORD': get_env_variable('DB_PASSWORD'),
-        'HOST': get_env_variable('DB_HOST'),
-        'PORT': get_env_variable('DB_PORT'),
+if os.getenv('DB_ENGINE', 'postgresql') == 'sqlite':
+    # Lightweight local/test setup; PostgreSQL-only features (trigram
+    # search, SKIP LOCKED) fall back to portable queries.
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME', str(BASE_DIR / 'db.sqlite3')),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': get_env_variable('DB_NAME'),
+            'USER': get_env_variable('DB_USER'),
+            'PASSWORD': get_env_variable('DB_PASSWORD'),
+            'HOST': get_env_variable('DB_HOST'),
+            'PORT': get_env_variable('DB_PORT'),
+        }
     }
-}
 
 
 # Password validation
@@ -167,6 +179,94 @@ LOGOUT_REDIRECT_URL = 'landing-page'
 # Centralized n8n Webhook URLs
 N8N_NEW_BOOKING_WEBHOOK_URL = os.getenv('N8N_NEW_BOOKING_WEBHOOK_URL')
 N8N_PAYMENT_RECEIPT_WEBHOOK_URL = os.getenv('N8N_PAYMENT_RECEIPT_WEBHOOK_URL')
+N8N_PAYMENT_REMINDER_WEBHOOK_URL = os.getenv('N8N_PAYMENT_REMINDER_WEBHOOK_URL')
+N8N_DOCUMENT_REMINDER_WEBHOOK_URL = os.getenv('N8N_DOCUMENT_REMINDER_WEBHOOK_URL')
+
+# Reminder scheduler (see `python manage.py send_reminders`): bookings per
+# batch/webhook, and hours before a booking is reminded again.
+REMINDER_BATCH_SIZE = int(os.getenv('REMINDER_BATCH_SIZE', '500'))
+REMINDER_INTERVAL_HOURS = float(os.getenv('REMINDER_INTERVAL_HOURS', '20'))
+
+# Webhook outbox delivery (see `python manage.py dispatch_outbox`)
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '100'))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '8'))
+OUTBOX_RETRY_BASE_SECONDS = int(os.getenv('OUTBOX_RETRY_BASE_SECONDS', '30'))
+OUTBOX_HTTP_TIMEOUT = float(os.getenv('OUTBOX_HTTP_TIMEOUT', '5'))
+OUTBOX_HTTP_POOL_SIZE = int(os.getenv('OUTBOX_HTTP_POOL_SIZE', '10'))
+# Seconds a claimed batch stays with its worker before other workers may
+# take it over; keep it above OUTBOX_BATCH_SIZE * OUTBOX_HTTP_TIMEOUT.
+OUTBOX_LEASE_SECONDS = int(os.getenv('OUTBOX_LEASE_SECONDS', '900'))
+
+# Outbound HTTP (core/services/http_client.py): keep-alive pools per host,
+# default timeouts in seconds and retries of failed connections.
+HTTP_CLIENT_POOL_HOSTS = int(os.getenv('HTTP_CLIENT_POOL_HOSTS', '10'))
+HTTP_CLIENT_POOL_SIZE = int(os.getenv('HTTP_CLIENT_POOL_SIZE', '10'))
+HTTP_CLIENT_CONNECT_TIMEOUT = float(os.getenv('HTTP_CLIENT_CONNECT_TIMEOUT', '5'))
+HTTP_CLIENT_READ_TIMEOUT = float(os.getenv('HTTP_CLIENT_READ_TIMEOUT', '30'))
+HTTP_CLIENT_RETRIES = int(os.getenv('HTTP_CLIENT_RETRIES', '2'))
+HTTP_CLIENT_RETRY_BACKOFF = float(os.getenv('HTTP_CLIENT_RETRY_BACKOFF', '0.5'))
+
+# Days a communication log stays in the hot table before
+# `python manage.py compact_communication_logs` archives it
+COMMUNICATION_LOG_HOT_DAYS = int(os.getenv('COMMUNICATION_LOG_HOT_DAYS', '180'))
+
+# Booking wizard seat holds (seconds an unconfirmed seat stays reserved)
+SEAT_HOLD_TTL_SECONDS = int(os.getenv('SEAT_HOLD_TTL_SECONDS', '600'))
+# Seconds browsers may reuse a seat availability response before revalidating
+SEAT_AVAILABILITY_MAX_AGE = int(os.getenv('SEAT_AVAILABILITY_MAX_AGE', '5'))
+
+# Background report rendering
+REPORT_WORKER_THREADS = int(os.getenv('REPORT_WORKER_THREADS', '2'))
+# Seconds after which a queued or running job is considered lost (e.g. the
+# process restarted) and is queued again on the next request.
+REPORT_JOB_TIMEOUT_SECONDS = int(os.getenv('REPORT_JOB_TIMEOUT_SECONDS', '600'))
+REPORT_CACHE_DIR = os.path.join(MEDIA_ROOT, 'reports')
+
+# Cache. Set REDIS_URL in production so every worker process shares
+# (and invalidates) the same cached dashboard metrics.
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'hajjumrahflow',
+        }
+    }
+
+# Seconds a computed dashboard stays cached (writes invalidate it sooner)
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_CACHE_TIMEOUT', '300'))
 
 # AI Assistant Settings
-OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY')
\ No newline at end of file
+OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY')
+OPENROUTER_API_URL = os.getenv('OPENROUTER_API_URL', 'https://openrouter.ai/api/v1/chat/completions')
+# Connection limits and timeouts of the AI service's pooled HTTP clients,
+# and how many streamed answers (ai/ask/stream/, served async under
+# core.asgi) one user may have open at once.
+AI_HTTP_MAX_CONNECTIONS = int(os.getenv('AI_HTTP_MAX_CONNECTIONS', '20'))
+AI_HTTP_MAX_KEEPALIVE = int(os.getenv('AI_HTTP_MAX_KEEPALIVE', '10'))
+AI_HTTP_CONNECT_TIMEOUT = float(os.getenv('AI_HTTP_CONNECT_TIMEOUT', '5'))
+AI_HTTP_READ_TIMEOUT = float(os.getenv('AI_HTTP_READ_TIMEOUT', '60'))
+AI_STREAM_MAX_PER_USER = int(os.getenv('AI_STREAM_MAX_PER_USER', '2'))
+# Cached answers to repeated questions: lifetime in seconds and how many
+# are kept before the least recently used is evicted.
+AI_CACHE_TIMEOUT = int(os.getenv('AI_CACHE_TIMEOUT', str(60 * 60 * 24 * 7)))
+AI_CACHE_MAX_ENTRIES = int(os.getenv('AI_CACHE_MAX_ENTRIES', '500'))
+
+# Benchmark suite (core/tests/test_benchmarks.py): how far wall time and
+# response size may grow past the recorded baselines before a run fails.
+# The suite seeds a large dataset, so it only runs with BENCHMARK_RUN=True.
+# Wall times depend on the machine and are only checked with
+# BENCHMARK_CHECK_TIME=True, on the machine that recorded the baselines.
+# Set BENCHMARK_UPDATE_BASELINES=True to record new baselines instead.
+BENCHMARK_RUN = os.getenv('BENCHMARK_RUN', 'False') == 'True'
+BENCHMARK_CHECK_TIME = os.getenv('BENCHMARK_CHECK_TIME', 'False') == 'True'
+BENCHMARK_TIME_TOLERANCE = float(os.getenv('BENCHMARK_TIME_TOLERANCE', '2.0'))
+BENCHMARK_SIZE_TOLERANCE = float(os.getenv('BENCHMARK_SIZE_TOLERANCE', '1.1'))
+BENCHMARK_UPDATE_BASELINES = os.getenv('BENCHMARK_UPDATE_BASELINES', 'False') == 'True'
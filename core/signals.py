@@ -0,0 +1,20 @@
+# core/signals.py
+
+from django.db.models.signals import post_save, post_delete
+
+from bookings.models import Booking, Payment
+from trips.models import Trip, Expense
+from crm.models import Customer
+from core.services.dashboard_metrics import DashboardMetrics
+
+
+def invalidate_dashboards(sender, **kwargs):
+    """
+    Drops the cached dashboards whenever data shown on them changes.
+    """
+    DashboardMetrics.invalidate()
+
+
+for model in (Booking, Payment, Expense, Trip, Customer):
+    post_save.connect(invalidate_dashboards, sender=model, dispatch_uid=f'dashboard-{model.__name__}-save')
+    post_delete.connect(invalidate_dashboards, sender=model, dispatch_uid=f'dashboard-{model.__name__}-delete')
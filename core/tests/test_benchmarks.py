@@ -0,0 +1,207 @@
+# core/tests/test_benchmarks.py
+
+import datetime
+import os
+import unittest
+from io import StringIO
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, tag
+from django.urls import reverse
+from django.utils import timezone
+
+from crm.models import Customer, Document, CommunicationLog
+from trips.models import Trip, Expense
+from users.models import CustomUser
+from bookings.models import Booking, Payment
+from reports.services.manifest_generator import ManifestGenerator
+from core.services.benchmarks import measure, load_baselines, save_baselines, find_regressions
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), 'benchmark_baselines.json')
+
+CUSTOMERS = 3000
+TRIPS = 30
+BOOKINGS = 6000
+
+
+class FindRegressionsTest(SimpleTestCase):
+    """
+    Tests the comparison of benchmark results with their baselines.
+    """
+    baseline = {'page': {'queries': 4, 'time_ms': 100.0, 'bytes': 1000}}
+
+    def regressions(self, **result):
+        return find_regressions(
+            {'page': {**self.baseline['page'], **result}}, self.baseline,
+            time_tolerance=2.0, size_tolerance=1.1, check_time=True,
+        )
+
+    def test_within_tolerance(self):
+        self.assertEqual(self.regressions(queries=3, time_ms=190.0, bytes=1090), [])
+
+    def test_each_threshold(self):
+        self.assertEqual(self.regressions(queries=5), ['page: 5 queries, baseline 4'])
+        self.assertEqual(self.regressions(bytes=1200), ['page: 1200 bytes, baseline 1000'])
+        self.assertEqual(self.regressions(time_ms=250.0), ['page: 250.0 ms, baseline 100.0 ms'])
+
+    def test_fast_views_get_absolute_slack_and_new_cases_need_a_baseline(self):
+        fast = {'page': {'queries': 1, 'time_ms': 2.0, 'bytes': 10}}
+        self.assertEqual(find_regressions({'page': {**fast['page'], 'time_ms': 40.0}}, fast, check_time=True), [])
+        self.assertEqual(find_regressions(fast, {}), ['page: no baseline recorded'])
+
+    def test_wall_time_is_only_checked_when_asked(self):
+        slow = {'page': {**self.baseline['page'], 'time_ms': 900.0}}
+        self.assertEqual(find_regressions(slow, self.baseline, check_time=False), [])
+
+
+@tag('benchmark')
+@unittest.skipUnless(settings.BENCHMARK_RUN, 'set BENCHMARK_RUN=True to run the benchmark suite')
+class BenchmarkSuiteTest(TestCase):
+    """
+    Measures query count, wall time and response size of the main pages,
+    every API list and detail endpoint and both manifest formats on a
+    seeded dataset, and fails when one regresses past its baseline in
+    benchmark_baselines.json.
+
+    Baselines are kept per database backend. The suite only runs with
+    BENCHMARK_RUN=True, and checks wall times only with
+    BENCHMARK_CHECK_TIME=True. Record new baselines after an intended
+    change with
+    BENCHMARK_RUN=True BENCHMARK_UPDATE_BASELINES=True python manage.py test core.tests.test_benchmarks
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.manager = CustomUser.objects.create_user(username='bench_manager', email='bench_manager@test.com', role='manager')
+        cls.agent = CustomUser.objects.create_user(username='bench_agent', email='bench_agent@test.com', role='agent')
+        cls.accountant = CustomUser.objects.create_user(
+            username='bench_accountant', email='bench_accountant@test.com', role='accountant'
+        )
+        cls.admin = CustomUser.objects.create_user(
+            username='bench_admin', email='bench_admin@test.com', role='manager', is_staff=True
+        )
+        agents = [cls.agent] + CustomUser.objects.bulk_create([
+            CustomUser(username=f'bench_agent{i}', email=f'bench_agent{i}@test.com', role='agent') for i in range(9)
+        ])
+
+        trips = Trip.objects.bulk_create([
+            Trip(
+                name=f'Umrah Group {i}',
+                departure_date=now + datetime.timedelta(days=i * 7 - 60),
+                return_date=now + datetime.timedelta(days=i * 7 - 46),
+                total_seats=BOOKINGS // TRIPS + 50, price_per_person=1500,
+                status=Trip.Status.COMPLETED if i < 8 else Trip.Status.SCHEDULED,
+                hotel_details='Makkah, 4 nights; Madinah, 3 nights', flight_details='DAM-JED',
+            ) for i in range(TRIPS)
+        ])
+        customers = []
+        for i in range(CUSTOMERS):
+            customer = Customer(
+                full_name=f'Pilgrim {i:04d} Ahmad' if i % 10 == 0 else f'Pilgrim {i:04d}',
+                phone_number=f'+963 9{i:08d}', passport_number=f'N{i:07d}',
+                passport_expiry_date=datetime.date(2032, 1, 1), nationality='Syrian',
+                date_of_birth=datetime.date(1960 + i % 40, 1, 1),
+            )
+            customer.refresh_search_fields()
+            customers.append(customer)
+        customers = Customer.objects.bulk_create(customers)
+
+        statuses = [Booking.Status.FULLY_PAID] * 6 + [
+            Booking.Status.CONFIRMED, Booking.Status.PENDING_PAYMENT,
+            Booking.Status.PENDING_DOCUMENTS, Booking.Status.CANCELLED,
+        ]
+        bookings = Booking.objects.bulk_create([
+            Booking(
+                customer=customers[i % CUSTOMERS], trip=trips[i % TRIPS], created_by=agents[i % len(agents)],
+                total_amount=1500, status=statuses[i % len(statuses)],
+            ) for i in range(BOOKINGS)
+        ])
+        Payment.objects.bulk_create([
+            Payment(
+                booking=b, amount_paid=750, payment_method=Payment.PaymentMethod.CASH,
+                payment_date=(now - datetime.timedelta(days=i % 90)).date(), recorded_by=cls.accountant,
+            ) for i, b in enumerate(bookings) for _ in range(2)
+        ])
+        Booking.objects.all().refresh_amount_paid_totals()
+        Expense.objects.bulk_create([
+            Expense(trip=t, description=f'Hotel block {j}', amount=2000, expense_date=(now - datetime.timedelta(days=j)).date())
+            for t in trips for j in range(5)
+        ])
+        Document.objects.bulk_create([
+            Document(customer=c, document_type=Document.DocumentType.PASSPORT_COPY, file=f'customer_documents/passport_{c.pk}.pdf')
+            for c in customers[:1000]
+        ])
+        CommunicationLog.objects.bulk_create([
+            CommunicationLog(customer=customers[i % CUSTOMERS], channel='whatsapp', content='Payment reminder', status='sent')
+            for i in range(3000)
+        ])
+        call_command('reconcile_seat_counts', stdout=StringIO())
+        if connection.vendor == 'postgresql':
+            # Plan on statistics of this dataset, as autovacuum would in
+            # production, not on those left behind by earlier tests.
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        # The trip the detail pages and manifests are measured on.
+        cls.trip = trips[10]
+        cls.booking = bookings[10]
+        cls.customer = customers[10]
+        cls.payment = Payment.objects.filter(booking=cls.booking).first()
+        cls.expense = Expense.objects.filter(trip=cls.trip).first()
+        cls.document = Document.objects.first()
+
+    def cases(self):
+        """Returns {name: (user, call)} for every measured case."""
+        manager, trip, client = self.manager, self.trip, self.client
+        pages = {
+            'dashboard_manager': (manager, reverse('dashboard'), None),
+            'dashboard_agent': (self.agent, reverse('dashboard'), None),
+            'dashboard_accountant': (self.accountant, reverse('dashboard'), None),
+            'trip_list': (manager, reverse('trips:trip-list'), None),
+            'trip_detail': (manager, reverse('trips:trip-detail', args=[trip.pk]), None),
+            'booking_list': (manager, reverse('bookings:booking-list'), None),
+            'customer_search': (manager, reverse('crm:customer-list'), {'q': 'ahmad'}),
+        }
+        # Every API viewset with list and detail routes. The communication
+        # log endpoint is write-only and has neither.
+        api = {
+            'users': ('/api/v1/users/', self.admin, self.admin.pk),
+            'customers': ('/api/v1/crm/customers/', manager, self.customer.pk),
+            'documents': ('/api/v1/crm/documents/', manager, self.document.pk),
+            'trips': ('/api/v1/trips/trips/', manager, trip.pk),
+            'expenses': ('/api/v1/trips/expenses/', manager, self.expense.pk),
+            'bookings': ('/api/v1/bookings/bookings/', manager, self.booking.pk),
+            'payments': ('/api/v1/bookings/payments/', manager, self.payment.pk),
+        }
+        for name, (url, user, pk) in api.items():
+            pages[f'api_{name}_list'] = (user, url, None)
+            pages[f'api_{name}_detail'] = (user, f'{url}{pk}/', None)
+
+        cases = {
+            name: (user, lambda url=url, data=data: client.get(url, data))
+            for name, (user, url, data) in pages.items()
+        }
+        cases['manifest_excel'] = (manager, lambda: client.post(
+            reverse('reports:generate-manifest'), {'trip_id': trip.pk, 'format': 'excel'}
+        ))
+        # PDFs are rendered by the report workers; what the code controls
+        # is the HTML they are rendered from.
+        cases['manifest_pdf'] = (manager, lambda: ManifestGenerator(trip).render_html())
+        return cases
+
+    def test_no_regressions(self):
+        results = {}
+        for name, (user, call) in self.cases().items():
+            self.client.force_login(user)
+            results[name] = measure(call)
+
+        if settings.BENCHMARK_UPDATE_BASELINES:
+            save_baselines(BASELINES_PATH, connection.vendor, results)
+            return
+        baselines = load_baselines(BASELINES_PATH, connection.vendor)
+        if not baselines:
+            self.skipTest(f'no baselines recorded on {connection.vendor}')
+        regressions = find_regressions(results, baselines)
+        self.assertEqual(regressions, [], '\n'.join(regressions))
@@ -0,0 +1,94 @@
+# core/tests/test_dashboard_metrics.py
+
+import datetime
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from crm.models import Customer
+from trips.models import Trip, Expense
+from users.models import CustomUser
+from bookings.models import Booking, Payment
+
+
+class DashboardMetricsTest(TestCase):
+    """
+    Tests that the role dashboards are served from the cache and refreshed
+    after bookings, payments and expenses change.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', email='manager@test.com', role='manager')
+        cls.agent = CustomUser.objects.create_user(username='agent', email='agent@test.com', role='agent')
+        cls.other_agent = CustomUser.objects.create_user(username='agent2', email='agent2@test.com', role='agent')
+        cls.accountant = CustomUser.objects.create_user(username='accountant', email='acc@test.com', role='accountant')
+        cls.trip = Trip.objects.create(
+            name='Dashboard Trip',
+            departure_date=timezone.now() + datetime.timedelta(days=20),
+            return_date=timezone.now() + datetime.timedelta(days=30),
+            total_seats=10,
+            price_per_person=1000
+        )
+        for i in range(5):
+            customer = Customer.objects.create(
+                full_name=f'Pilgrim {i}', phone_number=f'600{i}', passport_number=f'D{i}',
+                passport_expiry_date=timezone.now().date() + datetime.timedelta(days=365 * 5),
+                date_of_birth=datetime.date(1980, 1, 1)
+            )
+            Booking.objects.create(
+                customer=customer, trip=cls.trip, total_amount=1000, created_by=cls.agent,
+                status=Booking.Status.PENDING_PAYMENT
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def load(self, user):
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_second_load_is_served_from_cache(self):
+        for user in (self.manager, self.agent, self.accountant):
+            _, first = self.load(user)
+            response, second = self.load(user)
+            # Only the session and user lookups remain on a cached load.
+            self.assertLessEqual(second, 2, user.role)
+            self.assertLess(second, first)
+
+        self.assertEqual(len(response.context['recent_payments']), 0)
+
+    def test_recent_bookings_need_no_extra_queries(self):
+        response, _ = self.load(self.manager)
+        self.assertEqual(len(response.context['recent_bookings']), 5)
+        self.assertEqual(response.context['chart_data'], '[50.0]')
+
+    def test_payment_and_expense_writes_refresh_the_dashboards(self):
+        response, _ = self.load(self.accountant)
+        self.assertEqual(response.context['collected_today'], '0.00')
+
+        booking = Booking.objects.first()
+        with self.captureOnCommitCallbacks(execute=True):
+            Payment.objects.create(booking=booking, amount_paid=250, payment_date=timezone.now().date())
+        response, _ = self.load(self.accountant)
+        self.assertEqual(response.context['collected_today'], '250.00')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Expense.objects.create(trip=self.trip, description='Visa fees', amount=1200)
+        response, _ = self.load(self.accountant)
+        self.assertEqual(response.context['total_expenses_month'], '1,200.00')
+
+    def test_agent_dashboards_are_cached_per_agent(self):
+        response, _ = self.load(self.agent)
+        self.assertEqual(response.context['my_total_bookings'], 5)
+        self.assertEqual(response.context['my_bookings_today'], 5)
+
+        response, _ = self.load(self.other_agent)
+        self.assertEqual(response.context['my_total_bookings'], 0)
+        self.assertEqual(len(response.context['pending_payment_bookings']), 0)
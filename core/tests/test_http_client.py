@@ -0,0 +1,121 @@
+# core/tests/test_http_client.py
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from core.services import http_client
+
+
+class CountingServer:
+    """
+    A local HTTP server that answers with the queued statuses (then 200)
+    and records the client port of every request, i.e. which connection
+    it arrived on.
+    """
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.ports = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def handle_request(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                server.ports.append(self.client_address[1])
+                self.send_response(server.statuses.pop(0) if server.statuses else 200)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            do_GET = do_POST = handle_request
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/hook"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@override_settings(HTTP_CLIENT_RETRY_BACKOFF=0)
+class HttpClientTest(SimpleTestCase):
+    """
+    Tests connection reuse, retries and latency recording of the shared
+    outbound HTTP client.
+    """
+
+    def setUp(self):
+        http_client.reset_stats()
+
+    def test_calls_reuse_one_keep_alive_connection(self):
+        session = http_client.build_session('test')
+        with CountingServer() as server:
+            for _ in range(5):
+                session.post(server.url, json={'ping': True})
+        session.close()
+        self.assertEqual(len(server.ports), 5)
+        self.assertEqual(len(set(server.ports)), 1)
+
+    def test_retry_policy(self):
+        session = http_client.build_session('test', retries=2, retry_statuses=(503,))
+        with CountingServer(statuses=[503, 503]) as server:
+            self.assertEqual(session.get(server.url).status_code, 200)
+            self.assertEqual(len(server.ports), 3)
+
+            # POST is not retried unless allowed: the caller sees the 503.
+            server.statuses = [503]
+            self.assertEqual(session.post(server.url).status_code, 503)
+            self.assertEqual(len(server.ports), 4)
+        session.close()
+
+    def test_latency_is_recorded_per_host(self):
+        session = http_client.build_session('test')
+        with CountingServer(statuses=[500]) as server:
+            session.get(server.url)
+            session.get(server.url)
+        session.close()
+
+        host = server.url.split('/')[2]
+        entry = http_client.stats()[f'test {host}']
+        self.assertEqual((entry['calls'], entry['errors']), (2, 1))
+        self.assertGreaterEqual(entry['max_ms'], entry['avg_ms'])
+
+    def test_named_sessions_are_shared(self):
+        self.assertIs(http_client.get_session('shared-test'), http_client.get_session('shared-test'))
+        self.assertEqual(
+            http_client.get_session('shared-test').timeout,
+            (settings.HTTP_CLIENT_CONNECT_TIMEOUT, settings.HTTP_CLIENT_READ_TIMEOUT)
+        )
+
+    def test_async_clients_record_errors_and_close_with_their_loop(self):
+        async def call(url):
+            client = http_client.get_async_client('async-test', connect_timeout=1)
+            try:
+                await client.get(url)
+            except httpx.HTTPError:
+                pass
+            return client
+
+        with CountingServer() as server:
+            client = asyncio.run(call(server.url))
+            port = server.url.split('/')[2].split(':')[1]
+        self.assertTrue(client.is_closed)
+
+        # The server is gone: the connection fails and is counted as an error.
+        asyncio.run(call(server.url))
+        entry = http_client.stats()[f'async-test 127.0.0.1:{port}']
+        self.assertEqual((entry['calls'], entry['errors']), (2, 1))
@@ -0,0 +1,143 @@
+# core/tests/test_query_plans.py
+
+import datetime
+import json
+import unittest
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from crm.models import Customer
+from trips.models import Trip, Expense
+from users.models import CustomUser
+from bookings.models import Booking, Payment
+from bookings.services.reminder_scheduler import ReminderScheduler
+from reports.services.financial_reports import FinancialReportsGenerator
+
+TRIPS = 2000
+BOOKINGS = 20000
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'query plans are checked on PostgreSQL only')
+class QueryPlanTest(TestCase):
+    """
+    Checks with EXPLAIN that the hot dashboard, report and API queries are
+    served by the indexes declared on the models. The dataset is seeded
+    with a realistic spread (most trips in the past, few pending bookings)
+    and analyzed, so the planner picks what it would pick in production.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.agents = CustomUser.objects.bulk_create([
+            CustomUser(username=f'planner{i}', email=f'planner{i}@test.com', role='agent') for i in range(50)
+        ])
+        # One trip in a hundred is still ahead; the rest have completed.
+        trips = Trip.objects.bulk_create([
+            Trip(
+                name=f'Trip {i}',
+                departure_date=now + datetime.timedelta(days=i % 100 + 1) if i % 100 == 0
+                else now - datetime.timedelta(days=i + 30),
+                return_date=now + datetime.timedelta(days=i % 100 + 10) if i % 100 == 0
+                else now - datetime.timedelta(days=i + 20),
+                total_seats=50, price_per_person=1000,
+                status=Trip.Status.SCHEDULED if i % 100 == 0 else Trip.Status.COMPLETED,
+            ) for i in range(TRIPS)
+        ])
+        customers = Customer.objects.bulk_create([
+            Customer(
+                full_name=f'Pilgrim {i}', phone_number=f'870{i:05d}', passport_number=f'P{i:06d}',
+                passport_expiry_date=datetime.date(2035, 1, 1), date_of_birth=datetime.date(1970, 1, 1)
+            ) for i in range(1000)
+        ])
+        # Two percent of bookings are still pending, five percent cancelled.
+        statuses = (
+            [Booking.Status.PENDING_PAYMENT] + [Booking.Status.PENDING_DOCUMENTS]
+            + [Booking.Status.CANCELLED] * 5 + [Booking.Status.FULLY_PAID] * 93
+        )
+        bookings = Booking.objects.bulk_create([
+            Booking(
+                customer=customers[i % 1000], trip=trips[i % TRIPS], created_by=cls.agents[i % 50],
+                total_amount=1000, amount_paid_total=1000, status=statuses[i % 100],
+            ) for i in range(BOOKINGS)
+        ])
+        Payment.objects.bulk_create([
+            Payment(booking=b, amount_paid=1000, payment_date=(now - datetime.timedelta(days=i % 700)).date())
+            for i, b in enumerate(bookings)
+        ])
+        Expense.objects.bulk_create([
+            Expense(trip=t, description='Hotel', amount=500, expense_date=(now - datetime.timedelta(days=i)).date())
+            for i, t in enumerate(trips)
+        ])
+        cls.trip = trips[7]
+        cls.booking = bookings[7]
+        with connection.cursor() as cursor:
+            # booking_date is auto_now_add, so spread it after the insert.
+            cursor.execute(
+                "UPDATE bookings_booking SET booking_date = booking_date - (id % 700) * interval '1 day'"
+            )
+            for table in ('trips_trip', 'trips_expense', 'bookings_booking', 'bookings_payment'):
+                cursor.execute(f'ANALYZE {table}')
+
+    def indexes_used(self, queryset):
+        plan = json.loads(queryset.explain(format='json'))[0]['Plan']
+        return {node['Index Name'] for node in plan_nodes(plan) if 'Index Name' in node}
+
+    def assertUsesIndex(self, queryset, *names):
+        used = self.indexes_used(queryset)
+        self.assertTrue(used & set(names), f'expected one of {names}, plan used {used or "no index"}')
+
+    def test_agent_dashboard_lists(self):
+        queryset = Booking.objects.filter(
+            created_by=self.agents[3], status=Booking.Status.PENDING_DOCUMENTS
+        ).order_by('-booking_date')[:5]
+        self.assertUsesIndex(queryset, 'booking_agent_status_idx')
+
+    def test_bookings_by_status(self):
+        queryset = Booking.objects.filter(status=Booking.Status.PENDING_PAYMENT).order_by('-booking_date', '-id')
+        self.assertUsesIndex(queryset, 'booking_status_cursor_idx', 'booking_reminder_due_idx')
+        queryset = ReminderScheduler().due('payment')
+        self.assertUsesIndex(queryset, 'booking_reminder_due_idx', 'booking_status_cursor_idx')
+
+    def test_bookings_of_a_trip(self):
+        # The manifest and the trip page.
+        queryset = Booking.objects.filter(trip=self.trip).exclude(status=Booking.Status.CANCELLED)
+        self.assertUsesIndex(queryset, 'booking_trip_active_idx', 'booking_trip_status_idx')
+        queryset = Booking.objects.filter(trip=self.trip, status=Booking.Status.FULLY_PAID)
+        self.assertUsesIndex(queryset, 'booking_trip_status_idx', 'booking_trip_active_idx')
+
+    def test_trip_profitability_revenue(self):
+        queryset = FinancialReportsGenerator.with_profitability(Trip.objects.filter(pk=self.trip.pk))
+        self.assertUsesIndex(queryset, 'booking_trip_active_idx')
+
+    def test_bookings_this_month(self):
+        start_of_month = timezone.now() - datetime.timedelta(days=10)
+        self.assertUsesIndex(Booking.objects.filter(booking_date__gte=start_of_month), 'booking_date_cursor_idx')
+
+    def test_payments_by_date(self):
+        today = timezone.localdate()
+        self.assertUsesIndex(Payment.objects.filter(payment_date=today).values('amount_paid'), 'payment_date_idx')
+        recent = Payment.objects.order_by('-payment_date', '-created_at')[:10]
+        self.assertUsesIndex(recent, 'payment_date_idx')
+
+    def test_payments_of_a_booking(self):
+        queryset = Payment.objects.filter(booking=self.booking).values('amount_paid')
+        self.assertUsesIndex(queryset, 'payment_booking_amount_idx')
+
+    def test_expenses_this_month(self):
+        queryset = Expense.objects.filter(expense_date__gte=timezone.localdate().replace(day=1)).values('amount')
+        self.assertUsesIndex(queryset, 'expense_date_idx')
+
+    def test_upcoming_trips(self):
+        queryset = Trip.objects.filter(
+            departure_date__gte=timezone.now(), status__in=[Trip.Status.SCHEDULED, Trip.Status.ACTIVE]
+        ).order_by('departure_date')[:5]
+        self.assertUsesIndex(queryset, 'trip_status_departure_idx')
+        self.assertUsesIndex(Trip.objects.filter(status=Trip.Status.ACTIVE), 'trip_status_departure_idx')
@@ -0,0 +1,20 @@
+# core/tests/utils.py
+
+"""
+Helpers shared by the test suites of several apps.
+"""
+
+import math
+
+from django.db import connection
+
+
+def insert_batches(model, rows, batch_size):
+    """
+    Number of INSERT statements bulk_create(batch_size=batch_size) needs
+    for `rows` objects of `model` on the current backend, which may split
+    them further (SQLite bounds the parameters of a query).
+    """
+    fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+    max_batch = max(connection.ops.bulk_batch_size(fields, [None] * rows), 1)
+    return math.ceil(rows / min(batch_size, max_batch))
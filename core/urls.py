@@ -5,6 +5,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.conf.urls.i18n import i18n_patterns
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 from .views.authentication_views import CustomLoginView, CustomLogoutView
 from .views.dashboard_views import DashboardView
@@ -44,4 +45,6 @@ urlpatterns += i18n_patterns(
 )
 
 if settings.DEBUG:
+    # runserver serves static files itself; an ASGI server does not.
+    urlpatterns += staticfiles_urlpatterns()
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
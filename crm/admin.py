@@ -1,7 +1,7 @@
 # crm/admin.py
 
 from django.contrib import admin
-from .models import Customer, Document, CommunicationLog
+from .models import Customer, Document, CommunicationLog, ArchivedCommunicationLog
 
 class DocumentInline(admin.TabularInline):
     """
@@ -15,7 +15,8 @@ class DocumentInline(admin.TabularInline):
 class CommunicationLogInline(admin.TabularInline):
     """
     Shows a read-only log of communications on the customer's admin page.
-    This is useful for quick reference by admins.
+    This is useful for quick reference by admins. Only the hot logs are
+    listed; older ones are under Archived Communication Logs.
     """
     model = CommunicationLog
     extra = 0
@@ -60,4 +61,22 @@ class DocumentAdmin(admin.ModelAdmin):
     """
     list_display = ('customer', 'document_type', 'status', 'uploaded_at')
     list_filter = ('document_type', 'status')
-    search_fields = ('customer__full_name', 'customer__passport_number')
\ No newline at end of file
+    search_fields = ('customer__full_name', 'customer__passport_number')
+
+
+@admin.register(ArchivedCommunicationLog)
+class ArchivedCommunicationLogAdmin(admin.ModelAdmin):
+    """
+    Read-only admin view of archived communication logs.
+    """
+    list_display = ('customer', 'channel', 'status', 'triggered_by', 'created_at')
+    list_filter = ('channel', 'status')
+    search_fields = ('customer__full_name', 'customer__passport_number')
+    raw_id_fields = ('customer',)
+    list_select_related = ('customer',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
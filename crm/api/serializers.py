@@ -2,8 +2,9 @@
 
 from rest_framework import serializers
 from crm.models import Customer, Document, CommunicationLog
+from core.api.sparse_fieldsets import SparseFieldsetSerializerMixin
 
-class CustomerSerializer(serializers.ModelSerializer):
+class CustomerSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Customer model.
     Provides a comprehensive, read-only representation of a customer's data.
@@ -18,7 +19,7 @@ class CustomerSerializer(serializers.ModelSerializer):
         read_only_fields = fields # Make all fields read-only for now via API
 
 
-class DocumentSerializer(serializers.ModelSerializer):
+class DocumentSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Document model.
     """
@@ -1,11 +1,17 @@
 # crm/api/viewsets.py
 
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from core.api.parsers import NDJSONParser
+from core.api.sparse_fieldsets import SparseFieldsetViewSetMixin
 from crm.models import Customer, Document, CommunicationLog
+from crm.services.communication_log_import import CommunicationLogImportService
 from .serializers import CustomerSerializer, DocumentSerializer, CommunicationLogSerializer
 from users.permissions import IsManager, IsAgent, IsAccountant
 
-class CustomerViewSet(viewsets.ReadOnlyModelViewSet):
+class CustomerViewSet(SparseFieldsetViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows customers to be viewed.
     Access is restricted based on user roles as per the permission matrix.
@@ -16,7 +22,7 @@ class CustomerViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsManager | IsAgent | IsAccountant]
 
 
-class DocumentViewSet(viewsets.ModelViewSet):
+class DocumentViewSet(SparseFieldsetViewSetMixin, viewsets.ModelViewSet):
     """
     API endpoint for viewing and managing customer documents.
     Accessible by Managers and Agents.
@@ -37,4 +43,33 @@ class CommunicationLogViewSet(viewsets.ModelViewSet):
     # Only authenticated users (like our n8n service) can create logs.
     # Listing, updating, or deleting logs via this API is not a primary use case.
     permission_classes = [permissions.IsAuthenticated]
-    http_method_names = ['post', 'head', 'options'] # Restrict to POST only for creation
\ No newline at end of file
+    http_method_names = ['post', 'head', 'options'] # Restrict to POST only for creation
+
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        """
+        Creates many logs in one request, e.g. after a broadcast.
+        Endpoint: /api/v1/crm/communication-logs/bulk/
+        Accepts a JSON list of log objects, or NDJSON (one object per line,
+        Content-Type: application/x-ndjson). Valid rows are written even if
+        others fail; the response has a result per row. Answers 201 when
+        every row was created, 207 when some failed and 400 when none was.
+        """
+        rows = request.data
+        if not isinstance(rows, list):
+            return Response(
+                {'detail': 'Send a JSON list of log objects or NDJSON.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(rows) > CommunicationLogImportService.MAX_ROWS:
+            return Response(
+                {'detail': f'At most {CommunicationLogImportService.MAX_ROWS} logs per request.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        result = CommunicationLogImportService.import_rows(rows)
+        if not result['failed']:
+            return Response(result, status=status.HTTP_201_CREATED)
+        if result['created']:
+            return Response(result, status=status.HTTP_207_MULTI_STATUS)
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
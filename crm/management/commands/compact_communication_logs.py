@@ -0,0 +1,31 @@
+# crm/management/commands/compact_communication_logs.py
+
+from django.core.management.base import BaseCommand
+
+from crm.models import CommunicationLog
+from crm.services.communication_history import CommunicationHistory
+
+
+class Command(BaseCommand):
+    """
+    A Django management command that moves old communication logs from the
+    hot table to the archive, keeping the hot table small. Safe to run
+    daily from cron and to interrupt: each batch is its own transaction.
+    Usage: python manage.py compact_communication_logs [--older-than-days N] [--batch-size N] [--dry-run]
+    """
+    help = 'Archives communication logs older than COMMUNICATION_LOG_HOT_DAYS.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=None, help='Archive logs older than this.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Logs moved per transaction.')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the logs that would be archived.')
+
+    def handle(self, *args, **options):
+        cutoff = CommunicationHistory.cutoff(options['older_than_days'])
+        if options['dry_run']:
+            count = CommunicationLog.objects.filter(created_at__lt=cutoff).count()
+            self.stdout.write(f"{count} logs created before {cutoff:%Y-%m-%d %H:%M} would be archived.")
+            return
+
+        moved = CommunicationHistory.compact(cutoff, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} communication logs created before {cutoff:%Y-%m-%d %H:%M}."))
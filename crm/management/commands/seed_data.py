@@ -3,6 +3,7 @@
 import random
 from datetime import timedelta, date, datetime
 from decimal import Decimal
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.utils import timezone
@@ -12,6 +13,7 @@ from users.models import CustomUser
 from crm.models import Customer
 from trips.models import Trip, Expense
 from bookings.models import Booking, Payment
+from core.services.dashboard_metrics import DashboardMetrics
 
 class Command(BaseCommand):
     """
@@ -98,6 +100,9 @@ class Command(BaseCommand):
                 created_by=random.choice(self.users.filter(role=CustomUser.Roles.AGENT))
             ) for _ in range(self.NUM_CUSTOMERS)
         ]
+        # bulk_create bypasses save(), so fill the search columns here.
+        for customer in customers:
+            customer.refresh_search_fields()
         Customer.objects.bulk_create(customers)
         self.customers = Customer.objects.all()
 
@@ -187,6 +192,8 @@ class Command(BaseCommand):
             used_customer_trip_pairs.add((customer.id, trip.id))
         
         Booking.objects.bulk_create(bookings)
+        # bulk_create bypasses Booking.save(), so refresh the trip seat counters.
+        call_command('reconcile_seat_counts', stdout=self.stdout)
         
         payments = []
         for booking in Booking.objects.all():
@@ -198,6 +205,9 @@ class Command(BaseCommand):
                 payments.append(self.create_payment_instance(booking, booking.total_amount))
         
         Payment.objects.bulk_create(payments)
+        # Likewise for the cached payment totals on each booking.
+        Booking.objects.all().refresh_amount_paid_totals()
+        DashboardMetrics.invalidate()
 
     def create_payment_instance(self, booking, amount):
         """Helper to create a Payment object instance."""
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:04
+
+import logging
+
+from django.db import DatabaseError, migrations, models, transaction
+
+from crm.services.text_normalization import normalize_name, normalize_digits
+
+logger = logging.getLogger(__name__)
+
+TRIGRAM_INDEXES = {
+    "customer_search_name_trgm": "search_name",
+    "customer_phone_digits_trgm": "phone_digits",
+}
+
+
+def populate_search_fields(apps, schema_editor):
+    Customer = apps.get_model("crm", "Customer")
+    batch = []
+    for customer in Customer.objects.only("pk", "full_name", "phone_number").iterator(chunk_size=2000):
+        customer.search_name = normalize_name(customer.full_name)[:255]
+        customer.phone_digits = normalize_digits(customer.phone_number)[:20]
+        batch.append(customer)
+        if len(batch) >= 2000:
+            Customer.objects.bulk_update(batch, ["search_name", "phone_digits"])
+            batch = []
+    if batch:
+        Customer.objects.bulk_update(batch, ["search_name", "phone_digits"])
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    Adds GIN trigram indexes for substring and fuzzy search when the
+    pg_trgm extension can be enabled. Without it, search still works using
+    the prefix (btree) indexes and sequential scans for substrings.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for name, column in TRIGRAM_INDEXES.items():
+                schema_editor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON crm_customer USING gin ({column} gin_trgm_ops)"
+                )
+    except DatabaseError as e:
+        logger.warning(
+            "Skipped the trigram indexes %s (%s). Customer search by substring "
+            "will scan the table until pg_trgm is installed and they are created.",
+            ", ".join(TRIGRAM_INDEXES), e,
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("crm", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customer",
+            name="phone_digits",
+            field=models.CharField(
+                blank=True, db_index=True, default="", editable=False, max_length=20
+            ),
+        ),
+        migrations.AddField(
+            model_name="customer",
+            name="search_name",
+            field=models.CharField(
+                blank=True, db_index=True, default="", editable=False, max_length=255
+            ),
+        ),
+        migrations.RunPython(populate_search_fields, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
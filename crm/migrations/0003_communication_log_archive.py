@@ -0,0 +1,87 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("crm", "0002_customer_search_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedCommunicationLog",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                (
+                    "channel",
+                    models.CharField(
+                        choices=[
+                            ("email", "Email"),
+                            ("whatsapp", "WhatsApp"),
+                            ("sms", "SMS"),
+                        ],
+                        max_length=20,
+                        verbose_name="Channel",
+                    ),
+                ),
+                (
+                    "direction",
+                    models.CharField(
+                        choices=[("outgoing", "Outgoing"), ("incoming", "Incoming")],
+                        max_length=10,
+                        verbose_name="Direction",
+                    ),
+                ),
+                ("content", models.TextField(verbose_name="Content")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("sent", "Sent"),
+                            ("delivered", "Delivered"),
+                            ("failed", "Failed"),
+                        ],
+                        max_length=20,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "triggered_by",
+                    models.CharField(max_length=255, verbose_name="Triggered By"),
+                ),
+                ("created_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Archived Communication Log",
+                "verbose_name_plural": "Archived Communication Logs",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="communicationlog",
+            index=models.Index(
+                fields=["customer", "-created_at", "-id"],
+                name="commlog_customer_recent_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedcommunicationlog",
+            name="customer",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_communication_logs",
+                to="crm.customer",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedcommunicationlog",
+            index=models.Index(
+                fields=["customer", "-created_at", "-id"],
+                name="commlog_archive_recent_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:10
+
+import logging
+
+from django.db import DatabaseError, migrations, transaction
+
+logger = logging.getLogger(__name__)
+
+# Matches the UPPER(...::text) LIKE that Django emits for icontains.
+INDEX_NAME = "customer_passport_upper_trgm"
+
+
+def create_passport_trigram_index(apps, schema_editor):
+    """
+    Adds a GIN trigram index for substring passport search when pg_trgm can
+    be enabled (see crm.0002); otherwise the search falls back to a scan.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON crm_customer "
+                f"USING gin ((UPPER(passport_number::text)) gin_trgm_ops)"
+            )
+    except DatabaseError as e:
+        logger.warning(
+            "Skipped the trigram index %s (%s). Passport search by substring "
+            "will scan the table until pg_trgm is installed and it is created.",
+            INDEX_NAME, e,
+        )
+
+
+def drop_passport_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("crm", "0003_communication_log_archive"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_passport_trigram_index, drop_passport_trigram_index),
+    ]
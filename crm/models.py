@@ -4,6 +4,8 @@ from django.db import models
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
+from .services.text_normalization import normalize_name, normalize_digits
+
 class Customer(models.Model):
     """
     Represents a customer (pilgrim) in the system.
@@ -27,9 +29,29 @@ class Customer(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Normalized copies used by CustomerSearch; kept in sync by save().
+    search_name = models.CharField(max_length=255, blank=True, default='', db_index=True, editable=False)
+    phone_digits = models.CharField(max_length=20, blank=True, default='', db_index=True, editable=False)
+
+    SEARCH_SOURCES = {'full_name': 'search_name', 'phone_number': 'phone_digits'}
+
     def __str__(self):
         return f"{self.full_name} ({self.passport_number})"
 
+    def refresh_search_fields(self):
+        """Recomputes the normalized search columns from name and phone."""
+        self.search_name = normalize_name(self.full_name)[:255]
+        self.phone_digits = normalize_digits(self.phone_number)[:20]
+
+    def save(self, *args, **kwargs):
+        self.refresh_search_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            update_fields |= {target for source, target in self.SEARCH_SOURCES.items() if source in update_fields}
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _("Customer")
         verbose_name_plural = _("Customers")
@@ -99,4 +121,37 @@ class CommunicationLog(models.Model):
     class Meta:
         verbose_name = _("Communication Log")
         verbose_name_plural = _("Communication Logs")
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # A customer's history, newest first (see CommunicationHistory.page).
+            models.Index(fields=['customer', '-created_at', '-id'], name='commlog_customer_recent_idx'),
+        ]
+
+
+class ArchivedCommunicationLog(models.Model):
+    """
+    A communication log moved out of the hot CommunicationLog table by the
+    `compact_communication_logs` command once it is older than
+    COMMUNICATION_LOG_HOT_DAYS. Rows keep their original id and created_at,
+    so a customer's history reads as one sequence across both tables.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='archived_communication_logs')
+    channel = models.CharField(_("Channel"), max_length=20, choices=CommunicationLog.ChannelType.choices)
+    direction = models.CharField(_("Direction"), max_length=10, choices=CommunicationLog.DirectionType.choices)
+    content = models.TextField(_("Content"))
+    status = models.CharField(_("Status"), max_length=20, choices=CommunicationLog.StatusType.choices)
+    triggered_by = models.CharField(_("Triggered By"), max_length=255)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.get_channel_display()} to customer {self.customer_id} at {self.created_at} (archived)"
+
+    class Meta:
+        verbose_name = _("Archived Communication Log")
+        verbose_name_plural = _("Archived Communication Logs")
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['customer', '-created_at', '-id'], name='commlog_archive_recent_idx'),
+        ]
\ No newline at end of file
@@ -0,0 +1,102 @@
+# crm/services/communication_history.py
+
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from crm.models import CommunicationLog, ArchivedCommunicationLog
+
+ARCHIVED_FIELDS = ('id', 'customer_id', 'channel', 'direction', 'content', 'status', 'triggered_by', 'created_at')
+
+
+class CommunicationHistory:
+    """
+    A service class for the hot/archive split of communication logs.
+
+    CommunicationLog keeps the recent rows that are written and read most;
+    compact() moves older ones to ArchivedCommunicationLog in batches. A
+    customer's history is read newest first with keyset pagination on
+    (created_at, id), served by the (customer, -created_at, -id) index of
+    each table, so a page costs the same for a customer with ten messages
+    as for one with ten thousand.
+    """
+    PAGE_SIZE = 20
+
+    @staticmethod
+    def encode_cursor(log):
+        return f"{log.created_at.isoformat()}|{log.pk}"
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Returns (created_at, id) from a cursor, or None if it is invalid."""
+        try:
+            created_at, pk = cursor.rsplit('|', 1)
+            moment = parse_datetime(created_at)
+            return (moment, int(pk)) if moment else None
+        except (AttributeError, ValueError):
+            return None
+
+    @staticmethod
+    def _before(queryset, position):
+        if position is not None:
+            created_at, pk = position
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+        return queryset.order_by('-created_at', '-id')
+
+    @classmethod
+    def page(cls, customer_id, cursor=None, size=None):
+        """
+        Returns (logs, next_cursor) for one page of a customer's history,
+        newest first. Archived logs follow once the hot ones run out; they
+        are all older, as only logs past the cutoff are archived.
+        """
+        size = size or cls.PAGE_SIZE
+        position = cls.decode_cursor(cursor) if cursor else None
+        logs = list(cls._before(CommunicationLog.objects.filter(customer_id=customer_id), position)[:size + 1])
+        if len(logs) <= size:
+            archived = ArchivedCommunicationLog.objects.filter(customer_id=customer_id)
+            logs += list(cls._before(archived, position)[:size + 1 - len(logs)])
+        if len(logs) > size:
+            return logs[:size], cls.encode_cursor(logs[size - 1])
+        return logs, None
+
+    @staticmethod
+    def cutoff(days=None):
+        days = settings.COMMUNICATION_LOG_HOT_DAYS if days is None else days
+        return timezone.now() - datetime.timedelta(days=days)
+
+    @staticmethod
+    def compact_batch(cutoff, batch_size):
+        """
+        Moves up to `batch_size` logs created before `cutoff` to the archive
+        in one transaction and returns how many were moved. Rows are
+        claimed with SKIP LOCKED, so overlapping runs never copy a log twice.
+        """
+        with transaction.atomic():
+            rows = list(
+                CommunicationLog.objects.select_for_update(skip_locked=True)
+                .filter(created_at__lt=cutoff)
+                .order_by('pk')
+                .values(*ARCHIVED_FIELDS)[:batch_size]
+            )
+            if not rows:
+                return 0
+            ArchivedCommunicationLog.objects.bulk_create(
+                [ArchivedCommunicationLog(**row) for row in rows], batch_size=batch_size
+            )
+            CommunicationLog.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+        return len(rows)
+
+    @classmethod
+    def compact(cls, cutoff, batch_size=5000):
+        """Archives every log created before `cutoff`; returns the count."""
+        total = 0
+        while True:
+            moved = cls.compact_batch(cutoff, batch_size)
+            total += moved
+            if moved < batch_size:
+                return total
@@ -0,0 +1,95 @@
+# crm/services/communication_log_import.py
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.translation import gettext as _
+
+from core.api.parsers import InvalidLine
+from crm.models import Customer, CommunicationLog
+
+
+class CommunicationLogImportService:
+    """
+    A service class for writing many communication logs at once, e.g.
+    after n8n sends a WhatsApp broadcast. All customer ids are checked
+    with a single query and the valid rows are inserted with bulk_create
+    in chunks. Unlike the payment import, rows are independent: valid
+    rows are written even when others are rejected, and every row gets
+    its own result.
+    """
+    FIELDS = ('channel', 'direction', 'content', 'status', 'triggered_by')
+    CHUNK_SIZE = 1000
+    MAX_ROWS = 10000
+
+    @classmethod
+    def validate(cls, rows):
+        """
+        Converts raw rows into unsaved CommunicationLog instances.
+        Returns (logs, results): `logs` pairs each valid row number with
+        its instance; `results` holds one entry per row, with the errors
+        of the rejected ones.
+        """
+        model_fields = {name: CommunicationLog._meta.get_field(name) for name in cls.FIELDS}
+
+        customer_ids = set()
+        for row in rows:
+            if isinstance(row, dict):
+                try:
+                    customer_ids.add(int(row.get('customer')))
+                except (TypeError, ValueError):
+                    pass
+        existing = set(Customer.objects.filter(pk__in=customer_ids).values_list('pk', flat=True))
+
+        logs, results = [], []
+        for number, row in enumerate(rows, 1):
+            if isinstance(row, InvalidLine):
+                results.append({'row': number, 'status': 'error', 'errors': {'row': _("Invalid JSON: %s") % row.error}})
+                continue
+            if not isinstance(row, dict):
+                results.append({'row': number, 'status': 'error', 'errors': {'row': _("Each row must be an object.")}})
+                continue
+
+            row_errors, values = {}, {}
+            try:
+                values['customer_id'] = int(row.get('customer'))
+                if values['customer_id'] not in existing:
+                    row_errors['customer'] = _("Customer does not exist.")
+            except (TypeError, ValueError):
+                row_errors['customer'] = _("A valid customer id is required.")
+
+            for name, field in model_fields.items():
+                value = row.get(name)
+                if value is None and field.has_default():
+                    value = field.get_default()
+                try:
+                    values[name] = field.clean(value, None)
+                except ValidationError as e:
+                    row_errors[name] = ' '.join(e.messages)
+
+            if row_errors:
+                results.append({'row': number, 'status': 'error', 'errors': row_errors})
+                continue
+            logs.append((number, CommunicationLog(**values)))
+            results.append({'row': number, 'status': 'created'})
+        return logs, results
+
+    @classmethod
+    def import_rows(cls, rows):
+        """
+        Validates rows and writes the valid ones. Returns the number of
+        created and failed rows and a result per row; created rows carry
+        the new log id.
+        """
+        logs, results = cls.validate(rows)
+        if logs:
+            with transaction.atomic():
+                CommunicationLog.objects.bulk_create([log for number, log in logs], batch_size=cls.CHUNK_SIZE)
+            ids = {number: log.pk for number, log in logs}
+            for result in results:
+                if result['status'] == 'created':
+                    result['id'] = ids[result['row']]
+        return {
+            'created': len(logs),
+            'failed': len(results) - len(logs),
+            'results': results,
+        }
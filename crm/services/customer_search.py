@@ -0,0 +1,115 @@
+# crm/services/customer_search.py
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from crm.models import Customer
+from .text_normalization import normalize_name, normalize_digits
+
+# Shortest digit run treated as (part of) a phone number.
+MIN_PHONE_DIGITS = 3
+
+_trigram_state = {}
+
+
+def trigram_available():
+    """
+    True when the database is PostgreSQL with pg_trgm enabled, i.e. the
+    GIN trigram indexes from crm.0002 exist. Checked once per database.
+    """
+    if connection.vendor != 'postgresql':
+        return False
+    key = connection.settings_dict['NAME']
+    if key not in _trigram_state:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            _trigram_state[key] = cursor.fetchone() is not None
+    return _trigram_state[key]
+
+
+class CustomerSearch:
+    """
+    A service class for ranked customer search by name, phone or passport.
+
+    Names are matched on Customer.search_name and phones on
+    Customer.phone_digits, both normalized copies (see
+    text_normalization), so Arabic spelling variants, accents, case and
+    phone punctuation do not matter. On PostgreSQL with pg_trgm, substring
+    filters use the GIN trigram indexes and misspelled names still match by
+    word similarity; elsewhere (e.g. SQLite) plain LIKE queries are used.
+
+    Results are ranked: exact phone or passport, exact name, prefix
+    matches, then any other match.
+    """
+    @classmethod
+    def search(cls, query, queryset=None, prefix_only=False):
+        """
+        Returns the customers matching `query`, best matches first. With
+        `prefix_only`, names, phones and passports only match from their
+        start, so every filter can use a btree index.
+        """
+        queryset = Customer.objects.all() if queryset is None else queryset
+        raw = (query or '').strip()
+        name = normalize_name(raw)
+        digits = normalize_digits(raw)
+        passport = raw.upper()
+        if not name and not digits:
+            return queryset.none()
+
+        use_trigram = not prefix_only and trigram_available()
+        if prefix_only:
+            matches = Q(passport_number__startswith=passport)
+        else:
+            # Any part of a passport number; served by the trigram index
+            # from crm.0004 where pg_trgm is available.
+            matches = Q(passport_number__icontains=raw)
+        if name and prefix_only:
+            matches |= Q(search_name__startswith=name)
+        elif name:
+            name_match = Q()
+            for token in name.split():
+                name_match &= Q(search_name__contains=token)
+            matches |= name_match
+            if use_trigram:
+                matches |= Q(search_name__trigram_word_similar=name)
+        if len(digits) >= MIN_PHONE_DIGITS:
+            if prefix_only:
+                matches |= Q(phone_digits__startswith=digits)
+            else:
+                matches |= Q(phone_digits__contains=digits)
+
+        ranks = [When(passport_number=passport, then=Value(0))]
+        if len(digits) >= MIN_PHONE_DIGITS:
+            ranks.append(When(phone_digits=digits, then=Value(0)))
+        if name:
+            ranks += [
+                When(search_name=name, then=Value(1)),
+                When(search_name__startswith=name, then=Value(2)),
+            ]
+        if len(digits) >= MIN_PHONE_DIGITS:
+            ranks.append(When(phone_digits__startswith=digits, then=Value(2)))
+        ranks.append(When(passport_number__startswith=passport, then=Value(2)))
+
+        queryset = queryset.filter(matches).annotate(
+            search_rank=Case(*ranks, default=Value(3), output_field=IntegerField())
+        )
+        ordering = ['search_rank']
+        if use_trigram and name:
+            queryset = queryset.annotate(similarity=TrigramWordSimilarity(name, 'search_name'))
+            ordering.append('-similarity')
+        return queryset.order_by(*ordering, 'full_name', 'pk')
+
+    @classmethod
+    def autocomplete(cls, query, limit, offset=0):
+        """
+        Returns up to `limit` lightweight customers for a typeahead, and
+        whether more follow. One extra row is fetched instead of running a
+        COUNT. Without the trigram indexes only prefix matching is used, so
+        the lookup stays an index range scan on any table size.
+        """
+        queryset = Customer.objects.only('id', 'full_name', 'phone_number', 'passport_number')
+        results = list(
+            cls.search(query, queryset, prefix_only=not trigram_available())[offset:offset + limit + 1]
+        )
+        return results[:limit], len(results) > limit
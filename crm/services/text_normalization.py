@@ -0,0 +1,37 @@
+# crm/services/text_normalization.py
+
+import re
+import unicodedata
+
+# Harakat, Quranic marks and the tatweel carry no meaning for matching.
+ARABIC_MARKS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')
+ARABIC_LETTERS = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ى': 'ي', 'ئ': 'ي', 'ؤ': 'و', 'ة': 'ه',
+})
+# Arabic-Indic and Eastern Arabic-Indic (Persian) digits.
+EASTERN_DIGITS = str.maketrans('٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹', '0123456789' * 2)
+NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_name(value):
+    """
+    Folds a name for matching: Arabic letter variants (alef with hamza,
+    alef maqsura, taa marbuta) are unified and diacritics dropped, Latin
+    accents are removed, case is folded and punctuation becomes single
+    spaces. "Muḥammad  Al-Ḥasan" and "muhammad al hasan" normalize alike,
+    as do "أحمد" and "احمد".
+    """
+    value = unicodedata.normalize('NFKC', value or '').translate(EASTERN_DIGITS)
+    value = ARABIC_MARKS.sub('', value).translate(ARABIC_LETTERS)
+    value = ''.join(c for c in unicodedata.normalize('NFKD', value) if not unicodedata.combining(c))
+    value = unicodedata.normalize('NFC', value).casefold()
+    return NON_WORD.sub(' ', value).strip()
+
+
+def normalize_digits(value):
+    """
+    Keeps only the digits of a phone number, converting Arabic-Indic
+    digits, so "+966 (55) ٥٥٥-1234" becomes "966555551234".
+    """
+    return ''.join(c for c in (value or '').translate(EASTERN_DIGITS) if c.isdigit() and c.isascii())
@@ -18,9 +18,9 @@ class CrmApiTests(APITestCase):
     @classmethod
     def setUpTestData(cls):
         # Create users with different roles
-        cls.manager = CustomUser.objects.create_user(username='manager', password='password123', role='manager')
-        cls.agent = CustomUser.objects.create_user(username='agent', password='password123', role='agent')
-        cls.accountant = CustomUser.objects.create_user(username='accountant', password='password123', role='accountant')
+        cls.manager = CustomUser.objects.create_user(username='manager', email='manager@test.com', password='password123', role='manager')
+        cls.agent = CustomUser.objects.create_user(username='agent', email='agent@test.com', password='password123', role='agent')
+        cls.accountant = CustomUser.objects.create_user(username='accountant', email='accountant@test.com', password='password123', role='accountant')
 
         # Create tokens for authentication
         cls.manager_token = Token.objects.create(user=cls.manager)
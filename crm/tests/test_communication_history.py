@@ -0,0 +1,99 @@
+# crm/tests/test_communication_history.py
+
+import datetime
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from users.models import CustomUser
+from crm.models import Customer, CommunicationLog, ArchivedCommunicationLog
+from crm.services.communication_history import CommunicationHistory
+
+
+class CommunicationHistoryTest(TestCase):
+    """
+    Tests the hot/archive split of communication logs and the paginated
+    log on the customer page.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = CustomUser.objects.create_user(username='agent', email='agent@test.com', role='agent')
+        cls.customer = Customer.objects.create(
+            full_name='Long-time Pilgrim', phone_number='840000', passport_number='H000001',
+            passport_expiry_date=datetime.date(2030, 1, 1), date_of_birth=datetime.date(1960, 1, 1)
+        )
+        cls.other = Customer.objects.create(
+            full_name='Other Pilgrim', phone_number='840001', passport_number='H000002',
+            passport_expiry_date=datetime.date(2030, 1, 1), date_of_birth=datetime.date(1960, 1, 1)
+        )
+        logs = CommunicationLog.objects.bulk_create([
+            CommunicationLog(
+                customer=cls.customer, channel='whatsapp', content=f'Message {i}',
+                status='sent', triggered_by=f'Campaign {i}'
+            ) for i in range(50)
+        ] + [CommunicationLog(customer=cls.other, channel='sms', content='x', status='sent', triggered_by='x')])
+        # Message i was sent i days ago.
+        now = timezone.now()
+        for i, log in enumerate(logs[:50]):
+            CommunicationLog.objects.filter(pk=log.pk).update(created_at=now - datetime.timedelta(days=i))
+
+    def walk(self, size):
+        seen, cursor = [], None
+        while True:
+            logs, cursor = CommunicationHistory.page(self.customer.pk, cursor, size=size)
+            seen.extend(log.content for log in logs)
+            if cursor is None:
+                return seen
+
+    def test_compaction_moves_old_logs_and_keeps_the_history_whole(self):
+        before = self.walk(size=7)
+        self.assertEqual(before, [f'Message {i}' for i in range(50)])
+
+        moved = CommunicationHistory.compact(CommunicationHistory.cutoff(days=30), batch_size=8)
+        self.assertEqual(moved, 20)
+        self.assertEqual(CommunicationLog.objects.filter(customer=self.customer).count(), 30)
+        oldest = ArchivedCommunicationLog.objects.order_by('created_at').first()
+        self.assertEqual(oldest.content, 'Message 49')
+        self.assertFalse(CommunicationLog.objects.filter(pk=oldest.pk).exists())
+
+        # Pages that straddle the two tables still list every log once, in order.
+        self.assertEqual(self.walk(size=7), before)
+        self.assertEqual(CommunicationHistory.compact(CommunicationHistory.cutoff(days=30)), 0)
+
+    def test_page_queries_do_not_grow_with_history(self):
+        with self.assertNumQueries(1):
+            logs, cursor = CommunicationHistory.page(self.customer.pk, size=20)
+        with self.assertNumQueries(2):  # hot table runs out, archive fills the page
+            CommunicationHistory.page(self.customer.pk, CommunicationHistory.encode_cursor(logs[-1]), size=40)
+
+    def test_command_dry_run_and_compaction(self):
+        out = StringIO()
+        call_command('compact_communication_logs', '--older-than-days', '45', '--dry-run', stdout=out)
+        self.assertIn('5 logs', out.getvalue())
+        self.assertFalse(ArchivedCommunicationLog.objects.exists())
+
+        call_command('compact_communication_logs', '--older-than-days', '45', stdout=out)
+        self.assertEqual(ArchivedCommunicationLog.objects.count(), 5)
+
+    def test_customer_page_loads_the_log_lazily(self):
+        self.client.force_login(self.agent)
+        detail = self.client.get(reverse('crm:customer-detail', args=[self.customer.pk]))
+        self.assertNotContains(detail, 'Campaign 0')
+        url = reverse('crm:customer-communication-logs', args=[self.customer.pk])
+        self.assertContains(detail, url)
+
+        first = self.client.get(url, HTTP_HX_REQUEST='true')
+        self.assertContains(first, 'Campaign 0')
+        self.assertNotContains(first, 'Campaign 20<')
+        self.assertContains(first, '?cursor=')
+        self.assertContains(first, '<td>WhatsApp</td>', count=20)
+
+        cursor = first.context['next_cursor']
+        second = self.client.get(url, {'cursor': cursor})
+        self.assertContains(second, 'Campaign 20<')
+
+        empty = self.client.get(reverse('crm:customer-communication-logs', args=[self.other.pk]) + '?cursor=bad')
+        self.assertEqual(empty.status_code, 200)
@@ -0,0 +1,90 @@
+# crm/tests/test_communication_log_import.py
+
+import datetime
+import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from users.models import CustomUser
+from crm.models import Customer, CommunicationLog
+from crm.services.communication_log_import import CommunicationLogImportService
+from core.tests.utils import insert_batches
+
+BULK_URL = '/api/v1/crm/communication-logs/bulk/'
+
+
+class CommunicationLogBulkApiTest(APITestCase):
+    """
+    Tests the bulk communication log endpoint used by n8n broadcasts.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(username='n8n', email='n8n@test.com', role='manager')
+        cls.customers = Customer.objects.bulk_create([
+            Customer(
+                full_name=f'Pilgrim {i}', phone_number=f'830{i:04d}', passport_number=f'W{i:05d}',
+                passport_expiry_date=datetime.date(2030, 1, 1), date_of_birth=datetime.date(1980, 1, 1)
+            ) for i in range(3)
+        ])
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def log(self, customer, **extra):
+        return {
+            'customer': customer.pk, 'channel': 'whatsapp', 'content': 'Eid Mubarak',
+            'status': 'sent', 'triggered_by': 'Eid Broadcast', **extra
+        }
+
+    def test_json_array_with_per_row_results(self):
+        rows = [
+            self.log(self.customers[0]),
+            self.log(self.customers[1], direction='incoming'),
+            {'customer': 999999, 'channel': 'pigeon', 'content': '', 'status': 'sent', 'triggered_by': 'x'},
+            'not an object',
+        ]
+        response = self.client.post(BULK_URL, rows, format='json')
+        self.assertEqual(response.status_code, 207)
+        body = response.json()
+        self.assertEqual((body['created'], body['failed']), (2, 2))
+        self.assertEqual([r['status'] for r in body['results']], ['created', 'created', 'error', 'error'])
+        self.assertEqual(set(body['results'][2]['errors']), {'customer', 'channel', 'content'})
+
+        created = CommunicationLog.objects.get(pk=body['results'][1]['id'])
+        self.assertEqual(created.direction, 'incoming')
+        self.assertEqual(CommunicationLog.objects.get(pk=body['results'][0]['id']).direction, 'outgoing')
+
+    def test_ndjson_stream(self):
+        lines = [json.dumps(self.log(c)) for c in self.customers] + ['{broken', '']
+        response = self.client.generic(
+            'POST', BULK_URL, '\n'.join(lines).encode(), content_type='application/x-ndjson'
+        )
+        self.assertEqual(response.status_code, 207)
+        body = response.json()
+        self.assertEqual(body['created'], 3)
+        self.assertIn('Invalid JSON', body['results'][3]['errors']['row'])
+        self.assertEqual(CommunicationLog.objects.count(), 3)
+
+    def test_all_rows_valid_and_query_count_is_constant(self):
+        def batches(rows):
+            return insert_batches(CommunicationLog, rows, CommunicationLogImportService.CHUNK_SIZE)
+
+        counts = {}
+        for size in (10, 500):
+            rows = [self.log(self.customers[i % 3]) for i in range(size)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(BULK_URL, rows, format='json')
+            self.assertEqual(response.status_code, 201)
+            counts[size] = len(queries)
+        # Constant apart from the INSERTs, which backends with a bound on
+        # query parameters (SQLite) split into more batches.
+        self.assertEqual(counts[10] - batches(10), counts[500] - batches(500))
+        self.assertEqual(CommunicationLog.objects.count(), 510)
+
+    def test_rejects_non_list_and_all_invalid(self):
+        self.assertEqual(self.client.post(BULK_URL, {'customer': 1}, format='json').status_code, 400)
+        response = self.client.post(BULK_URL, [{'customer': 'x'}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['created'], 0)
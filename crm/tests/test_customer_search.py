@@ -0,0 +1,154 @@
+# crm/tests/test_customer_search.py
+
+import datetime
+import importlib
+from unittest import mock
+from django.db import DatabaseError
+from django.test import TestCase
+from django.urls import reverse
+
+from users.models import CustomUser
+from crm.models import Customer
+from crm.services.customer_search import CustomerSearch
+from crm.services.text_normalization import normalize_name, normalize_digits
+
+
+def make_customer(full_name, phone_number, passport_number):
+    return Customer.objects.create(
+        full_name=full_name,
+        phone_number=phone_number,
+        passport_number=passport_number,
+        passport_expiry_date=datetime.date(2030, 1, 1),
+        date_of_birth=datetime.date(1980, 1, 1)
+    )
+
+
+class TextNormalizationTest(TestCase):
+    """
+    Tests the name and phone normalization used by customer search.
+    """
+
+    def test_arabic_variants_and_latin_accents_fold_together(self):
+        self.assertEqual(normalize_name('أحمد'), normalize_name('احمد'))
+        self.assertEqual(normalize_name('مكّة'), normalize_name('مكه'))
+        self.assertEqual(normalize_name('مصطفى'), normalize_name('مصطفي'))
+        self.assertEqual(normalize_name('  Muḥammad AL-Ḥasan '), 'muhammad al hasan')
+
+    def test_phone_digits(self):
+        self.assertEqual(normalize_digits('+966 (55) ٥٥٥-1234'), '966555551234')
+        self.assertEqual(normalize_digits(''), '')
+
+
+class CustomerSearchTest(TestCase):
+    """
+    Tests matching and ranking of CustomerSearch and its use in the
+    customer list view.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ahmad = make_customer('أحمد الحسن', '+966 55 123 4567', 'A1000001')
+        cls.ahmadi = make_customer('Sara Ahmadi', '0044 20 7946 0000', 'B2000002')
+        cls.ahmad_latin = make_customer('Ahmad Khalil', '+963 944 555 666', 'C3000003')
+        cls.jose = make_customer('José Álvarez', '+34 600 111 222', 'D4000004')
+        cls.agent = CustomUser.objects.create_user(
+            username='agent', email='agent@test.com', password='pass', role='agent'
+        )
+
+    def names(self, query):
+        return [c.full_name for c in CustomerSearch.search(query)]
+
+    def test_search_columns_are_kept_in_sync(self):
+        self.assertEqual(self.ahmad.phone_digits, '966551234567')
+        self.jose.full_name = 'Jose Maria Alvarez'
+        self.jose.save(update_fields=['full_name'])
+        self.jose.refresh_from_db()
+        self.assertEqual(self.jose.search_name, 'jose maria alvarez')
+
+    def test_arabic_name_without_hamza_matches(self):
+        self.assertEqual(self.names('احمد'), ['أحمد الحسن'])
+
+    def test_accents_and_case_are_ignored(self):
+        self.assertEqual(self.names('jose ALVAREZ'), ['José Álvarez'])
+
+    def test_prefix_matches_rank_first(self):
+        self.assertEqual(self.names('ahmad'), ['Ahmad Khalil', 'Sara Ahmadi'])
+
+    def test_phone_search_ignores_formatting(self):
+        self.assertEqual(self.names('55-123-45'), ['أحمد الحسن'])
+        self.assertEqual(self.names('٩٦٣٩٤٤'), ['Ahmad Khalil'])
+
+    def test_passport_search(self):
+        self.assertEqual(self.names('b2000002'), ['Sara Ahmadi'])
+        self.assertEqual(self.names('000003'), ['Ahmad Khalil'])
+        self.assertEqual(self.names('   '), [])
+
+    def test_customer_list_view_uses_search(self):
+        self.client.force_login(self.agent)
+        response = self.client.get(reverse('crm:customer-list'), {'q': 'Ahmad'})
+        self.assertEqual(
+            [c.full_name for c in response.context['customers']], ['Ahmad Khalil', 'Sara Ahmadi']
+        )
+
+
+class CustomerAutocompleteTest(TestCase):
+    """
+    Tests the paginated typeahead endpoint used by the booking wizard.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(25):
+            make_customer(f'Yusuf {i:02d}', f'+90 500 000 {i:04d}', f'Y{i:07d}')
+        make_customer('Zainab Ali', '+20 100 222 3333', 'Z0000001')
+        cls.agent = CustomUser.objects.create_user(
+            username='agent', email='agent@test.com', password='pass', role='agent'
+        )
+        cls.url = reverse('crm:customer-autocomplete')
+
+    def setUp(self):
+        self.client.force_login(self.agent)
+
+    def test_json_pages(self):
+        first = self.client.get(self.url, {'q': 'yusuf'}).json()
+        self.assertEqual(len(first['results']), 10)
+        self.assertEqual(first['next_page'], 2)
+        self.assertEqual(first['results'][0]['full_name'], 'Yusuf 00')
+
+        last = self.client.get(self.url, {'q': 'yusuf', 'page': 3}).json()
+        self.assertEqual([r['full_name'] for r in last['results']], [f'Yusuf {i}' for i in range(20, 25)])
+        self.assertIsNone(last['next_page'])
+
+    def test_short_queries_do_not_hit_the_customers_table(self):
+        with self.assertNumQueries(2):  # session and user
+            body = self.client.get(self.url, {'q': 'y'}).json()
+        self.assertEqual(body['results'], [])
+
+    def test_htmx_fragment(self):
+        response = self.client.get(self.url, {'q': '+20 100'}, HTTP_HX_REQUEST='true')
+        self.assertContains(response, 'data-customer-id=')
+        self.assertContains(response, 'Zainab Ali')
+        self.assertNotContains(response, 'Show more')
+
+        response = self.client.get(self.url, {'q': 'yusuf'}, HTTP_HX_REQUEST='true')
+        self.assertContains(response, 'page=2')
+
+
+class TrigramIndexMigrationTest(TestCase):
+    """
+    Tests that the migrations adding the optional trigram indexes report
+    the indexes they could not create.
+    """
+
+    def test_skipped_indexes_are_logged(self):
+        schema_editor = mock.Mock(**{'execute.side_effect': DatabaseError('pg_trgm is not available')})
+        schema_editor.connection.vendor = 'postgresql'
+        schema_editor.connection.alias = 'default'
+        for name, function, index in (
+            ('0002_customer_search_fields', 'create_trigram_indexes', 'customer_search_name_trgm'),
+            ('0004_customer_passport_trgm', 'create_passport_trigram_index', 'customer_passport_upper_trgm'),
+        ):
+            migration = importlib.import_module(f'crm.migrations.{name}')
+            with self.assertLogs(migration.logger, 'WARNING') as logs:
+                getattr(migration, function)(None, schema_editor)
+            self.assertIn(index, logs.output[0])
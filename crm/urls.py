@@ -6,6 +6,8 @@ from .views import (
     CustomerDetailView,
     CustomerCreateView,
     CustomerUpdateView,
+    CustomerAutocompleteView,
+    CustomerCommunicationLogView,
 )
 
 app_name = 'crm'
@@ -13,6 +15,8 @@ app_name = 'crm'
 urlpatterns = [
     path('', CustomerListView.as_view(), name='customer-list'),
     path('create/', CustomerCreateView.as_view(), name='customer-create'),
+    path('autocomplete/', CustomerAutocompleteView.as_view(), name='customer-autocomplete'),
     path('<int:pk>/', CustomerDetailView.as_view(), name='customer-detail'),
     path('<int:pk>/update/', CustomerUpdateView.as_view(), name='customer-update'),
+    path('<int:pk>/communication-logs/', CustomerCommunicationLogView.as_view(), name='customer-communication-logs'),
 ]
\ No newline at end of file
@@ -1,19 +1,22 @@
 # crm/views.py
 
-from django.db.models import Q
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, render
 from django.urls import reverse_lazy
-from django.views.generic import ListView, DetailView, CreateView, UpdateView
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils.translation import gettext_lazy as _
 from django.contrib import messages
 
 from .models import Customer
 from .forms import CustomerForm
+from .services.customer_search import CustomerSearch
+from .services.communication_history import CommunicationHistory
 
 class CustomerListView(LoginRequiredMixin, ListView):
     """
     Displays a paginated list of customers.
-    Includes a search functionality that filters by name, phone, or passport number.
+    Includes a ranked search by name, phone, or passport number.
     This fulfills requirement 003-FR-CRM.
     """
     model = Customer
@@ -24,16 +27,12 @@ class CustomerListView(LoginRequiredMixin, ListView):
     def get_queryset(self):
         """
         Overrides the default queryset to implement search functionality.
+        Matches are ranked best first (see CustomerSearch).
         """
         queryset = super().get_queryset()
-        query = self.request.GET.get('q')
+        query = self.request.GET.get('q', '').strip()
         if query:
-            # The Q object allows for complex queries with OR conditions.
-            queryset = queryset.filter(
-                Q(full_name__icontains=query) |
-                Q(phone_number__icontains=query) |
-                Q(passport_number__icontains=query)
-            )
+            queryset = CustomerSearch.search(query, queryset)
         return queryset
 
     def get_context_data(self, **kwargs):
@@ -49,6 +48,8 @@ class CustomerDetailView(LoginRequiredMixin, DetailView):
     Displays the detailed profile of a single customer.
     The template for this view will show related documents, communication logs,
     and booking history as per requirements 004-FR-CRM and 005-FR-CRM.
+    The communication log is loaded page by page over HTMX
+    (CustomerCommunicationLogView), not rendered with the page.
     """
     model = Customer
     template_name = 'crm/customer_detail.html'
@@ -97,4 +98,63 @@ class CustomerUpdateView(LoginRequiredMixin, UpdateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['page_title'] = _("Update Customer")
-        return context
\ No newline at end of file
+        return context
+
+class CustomerAutocompleteView(LoginRequiredMixin, View):
+    """
+    Typeahead lookup for picking a customer, e.g. in booking wizard step 1.
+    Returns one page of matches: an HTML fragment for HTMX requests,
+    otherwise JSON. Cost depends on the page size, not the customer count.
+    """
+    PAGE_SIZE = 10
+    MIN_QUERY_LENGTH = 2
+
+    def get(self, request, *args, **kwargs):
+        query = request.GET.get('q', '').strip()
+        try:
+            page = max(int(request.GET.get('page', 1)), 1)
+        except ValueError:
+            page = 1
+
+        customers, has_more = [], False
+        if len(query) >= self.MIN_QUERY_LENGTH:
+            customers, has_more = CustomerSearch.autocomplete(
+                query, limit=self.PAGE_SIZE, offset=(page - 1) * self.PAGE_SIZE
+            )
+
+        if request.htmx:
+            return render(request, 'crm/htmx/customer_autocomplete.html', {
+                'customers': customers,
+                'query': query,
+                'next_page': page + 1 if has_more else None,
+                'too_short': len(query) < self.MIN_QUERY_LENGTH,
+            })
+        return JsonResponse({
+            'results': [
+                {
+                    'id': c.pk,
+                    'full_name': c.full_name,
+                    'phone_number': c.phone_number,
+                    'passport_number': c.passport_number,
+                }
+                for c in customers
+            ],
+            'next_page': page + 1 if has_more else None,
+        })
+
+
+class CustomerCommunicationLogView(LoginRequiredMixin, View):
+    """
+    Renders one page of a customer's communication history as table rows,
+    newest first, for the lazily loaded log on the customer page. The last
+    row links to the next page with a keyset cursor.
+    """
+    def get(self, request, pk, *args, **kwargs):
+        customer = get_object_or_404(Customer.objects.only('pk'), pk=pk)
+        logs, next_cursor = CommunicationHistory.page(customer.pk, request.GET.get('cursor'))
+        return render(request, 'crm/htmx/communication_log_rows.html', {
+            'customer': customer,
+            'logs': logs,
+            'next_cursor': next_cursor,
+            'first_page': not request.GET.get('cursor'),
+        })
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reportjob",
+            name="language",
+            field=models.CharField(
+                default="en", max_length=10, verbose_name="Language"
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# reports/models.py
+
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ReportJob(models.Model):
+    """
+    Tracks a report rendered in the background, such as a PDF manifest.
+    The rendered file is stored on disk under a name derived from the trip,
+    language and data version, so an unchanged manifest is rendered only
+    once per language.
+    """
+    class ReportType(models.TextChoices):
+        MANIFEST_PDF = 'manifest_pdf', _('Passenger Manifest (PDF)')
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', _('Queued')
+        RUNNING = 'running', _('Running')
+        DONE = 'done', _('Done')
+        FAILED = 'failed', _('Failed')
+
+    report_type = models.CharField(_("Report Type"), max_length=30, choices=ReportType.choices)
+    trip = models.ForeignKey('trips.Trip', on_delete=models.CASCADE, related_name='report_jobs')
+    data_version = models.CharField(_("Data Version"), max_length=64)
+    # The manifest's headings are translated, so each language is rendered on its own.
+    language = models.CharField(_("Language"), max_length=10, default=settings.LANGUAGE_CODE)
+    status = models.CharField(_("Status"), max_length=10, choices=Status.choices, default=Status.QUEUED)
+    file_path = models.CharField(_("File Path"), max_length=500, blank=True)
+    error = models.TextField(_("Error"), blank=True)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='report_jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(_("Finished At"), null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.get_report_type_display()} for trip {self.trip_id} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.DONE, self.Status.FAILED)
+
+    class Meta:
+        verbose_name = _("Report Job")
+        verbose_name_plural = _("Report Jobs")
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['trip', 'report_type', 'data_version'], name='reportjob_lookup_idx'),
+        ]
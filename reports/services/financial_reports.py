@@ -1,37 +1,95 @@
 # reports/services/financial_reports.py
 
-from django.db.models import Sum
-from bookings.models import Booking, Payment
-from trips.models import Trip
+import datetime
+
+from django.db.models import (
+    Case, DecimalField, ExpressionWrapper, F, FloatField, OuterRef, Subquery, Sum, Value, When
+)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+from bookings.models import Booking
+from trips.models import Trip, Expense
+
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+
 
 class FinancialReportsGenerator:
     """
     A service class for generating financial-related reports.
     """
+    PROFITABILITY_FIELDS = (
+        'id', 'name', 'departure_date', 'status', 'total_seats', 'booked_seats_count',
+        'total_revenue', 'total_expenses', 'net_profit', 'expected_revenue', 'occupancy_rate',
+    )
+    PROFITABILITY_SORTS = (
+        'name', 'departure_date', 'total_revenue', 'total_expenses',
+        'net_profit', 'expected_revenue', 'occupancy_rate',
+    )
+    DEFAULT_PROFITABILITY_SORT = '-departure_date'
+
     @staticmethod
-    def get_trip_profitability(trip):
+    def with_profitability(trips):
+        """
+        Annotates a Trip queryset with its financial figures. Revenue and
+        expenses are correlated subqueries over the cached booking totals
+        and the expenses table, so any number of trips is read in one query.
+        """
+        revenue = Booking.objects.filter(trip=OuterRef('pk')).exclude(
+            status=Booking.Status.CANCELLED
+        ).order_by().values('trip').annotate(total=Sum('amount_paid_total')).values('total')
+        expenses = Expense.objects.filter(trip=OuterRef('pk')).order_by().values('trip').annotate(
+            total=Sum('amount')
+        ).values('total')
+
+        return trips.annotate(
+            total_revenue=Coalesce(Subquery(revenue), Value(0), output_field=MONEY),
+            total_expenses=Coalesce(Subquery(expenses), Value(0), output_field=MONEY),
+        ).annotate(
+            net_profit=ExpressionWrapper(F('total_revenue') - F('total_expenses'), output_field=MONEY),
+            expected_revenue=ExpressionWrapper(F('price_per_person') * F('booked_seats_count'), output_field=MONEY),
+            occupancy_rate=Case(
+                When(total_seats=0, then=Value(0.0)),
+                default=Cast('booked_seats_count', FloatField()) * Value(100.0) / F('total_seats'),
+                output_field=FloatField(),
+            ),
+        )
+
+    @classmethod
+    def get_trip_profitability(cls, trip):
         """
         Calculates the profitability of a single trip.
         Fulfills requirement 004-FR-REP.
         """
-        bookings = Booking.objects.filter(trip=trip).exclude(status='cancelled')
-        
-        total_collected = Payment.objects.filter(booking__in=bookings).aggregate(
-            total=Sum('amount_paid')
-        )['total'] or 0
+        row = cls.with_profitability(Trip.objects.filter(pk=trip.pk)).values(*cls.PROFITABILITY_FIELDS).get()
+        row['trip_name'] = row['name']
+        return row
 
-        total_expenses = trip.expenses.aggregate(
-            total=Sum('amount')
-        )['total'] or 0
+    @classmethod
+    def get_all_trip_profitability(cls, sort=None, date_from=None, date_to=None):
+        """
+        Returns revenue, expenses, net profit, expected revenue and occupancy
+        for every trip as a list of dicts, computed in a single grouped query.
+        `sort` is one of PROFITABILITY_SORTS, optionally prefixed with '-';
+        `date_from` and `date_to` limit the trips by departure date.
+        """
+        trips = Trip.objects.all()
+        # Compare the column with datetime bounds rather than casting it to
+        # a date, which would keep the departure_date indexes from being used.
+        if date_from:
+            trips = trips.filter(departure_date__gte=cls.start_of_day(date_from))
+        if date_to:
+            trips = trips.filter(departure_date__lt=cls.start_of_day(date_to + datetime.timedelta(days=1)))
 
-        net_profit = total_collected - total_expenses
+        if not sort or sort.lstrip('-') not in cls.PROFITABILITY_SORTS:
+            sort = cls.DEFAULT_PROFITABILITY_SORT
+        return list(
+            cls.with_profitability(trips).order_by(sort, 'pk').values(*cls.PROFITABILITY_FIELDS)
+        )
 
-        return {
-            'trip_name': trip.name,
-            'total_revenue': total_collected,
-            'total_expenses': total_expenses,
-            'net_profit': net_profit,
-        }
+    @staticmethod
+    def start_of_day(date):
+        """Midnight at the start of `date` in the current time zone."""
+        return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
 
     @staticmethod
     def get_overdue_payments():
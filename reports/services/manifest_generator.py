@@ -1,6 +1,9 @@
 # reports/services/manifest_generator.py
 
-from django.http import HttpResponse
+import hashlib
+import tempfile
+
+from django.http import HttpResponse, FileResponse
 from django.template.loader import render_to_string
 from openpyxl import Workbook
 from weasyprint import HTML
@@ -12,48 +15,91 @@ class ManifestGenerator:
     A service class responsible for generating passenger manifests for a trip.
     Fulfills requirement 001-FR-REP.
     """
+    EXCEL_HEADERS = ['#', 'Full Name', 'Passport Number', 'Nationality', 'Date of Birth']
+    # Rows fetched from the database cursor per round trip.
+    CHUNK_SIZE = 2000
+    # Bytes sent to the client per chunk of the streamed file.
+    STREAM_BLOCK_SIZE = 64 * 1024
+
     def __init__(self, trip):
         self.trip = trip
         self.bookings = Booking.objects.filter(trip=self.trip).exclude(status='cancelled').select_related('customer')
 
+    def passenger_rows(self):
+        """
+        Yields the manifest rows as plain tuples straight from a server-side
+        cursor, without building Booking or Customer instances.
+        """
+        rows = self.bookings.values_list(
+            'customer__full_name', 'customer__passport_number',
+            'customer__nationality', 'customer__date_of_birth',
+        ).iterator(chunk_size=self.CHUNK_SIZE)
+        for i, row in enumerate(rows, 1):
+            yield (i, *row)
+
     def generate_excel(self):
         """
         Generates a passenger manifest as an Excel file.
+        Uses a write-only workbook, which flushes rows to a temporary file as
+        they are appended, so peak memory stays flat regardless of the number
+        of passengers. The finished file is streamed to the client in blocks.
         """
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        )
-        response['Content-Disposition'] = f'attachment; filename="manifest_{self.trip.name}.xlsx"'
-
-        workbook = Workbook()
-        worksheet = workbook.active
-        worksheet.title = 'Passenger Manifest'
-
-        # Define headers
-        headers = ['#', 'Full Name', 'Passport Number', 'Nationality', 'Date of Birth']
-        worksheet.append(headers)
-
-        # Populate data
-        for i, booking in enumerate(self.bookings, 1):
-            customer = booking.customer
-            row = [i, customer.full_name, customer.passport_number, customer.nationality, customer.date_of_birth]
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet('Passenger Manifest')
+        worksheet.append(self.EXCEL_HEADERS)
+        for row in self.passenger_rows():
             worksheet.append(row)
 
-        workbook.save(response)
+        output = tempfile.TemporaryFile()
+        workbook.save(output)
+        output.seek(0)
+
+        response = FileResponse(
+            output,
+            as_attachment=True,
+            filename=f"manifest_{self.trip.name}.xlsx",
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+        response.block_size = self.STREAM_BLOCK_SIZE
         return response
 
-    def generate_pdf(self):
+    def data_version(self):
         """
-        Generates a passenger manifest as a PDF file.
+        Returns a stamp that changes whenever the content of the manifest
+        would change: trip details, which bookings are active and their
+        status, or any of their customers' records. Every active booking's
+        id, status and customer timestamp goes into the hash, so swapping
+        one set of bookings for another of the same size is noticed. Costs
+        a single query over three columns per booking.
+        """
+        digest = hashlib.sha1(f"{self.trip.pk}|{self.trip.updated_at.isoformat()}".encode())
+        rows = self.bookings.order_by('pk').values_list('pk', 'status', 'customer__updated_at')
+        for pk, status, customer_updated in rows.iterator(chunk_size=self.CHUNK_SIZE):
+            digest.update(f"|{pk}:{status}:{customer_updated.isoformat()}".encode())
+        return digest.hexdigest()
+
+    def render_html(self):
+        """
+        Returns the HTML document the PDF manifest is rendered from.
         """
         context = {
             'trip': self.trip,
             'bookings': self.bookings,
         }
-        html_string = render_to_string('reports/pdf/manifest_template.html', context)
-        
+        return render_to_string('reports/pdf/manifest_template.html', context)
+
+    def render_pdf(self, target):
+        """
+        Renders the manifest PDF into `target` (a path or writable file).
+        """
+        HTML(string=self.render_html()).write_pdf(target)
+
+    def generate_pdf(self):
+        """
+        Generates a passenger manifest as a PDF file.
+        """
         response = HttpResponse(content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="manifest_{self.trip.name}.pdf"'
 
-        HTML(string=html_string).write_pdf(response)
+        self.render_pdf(response)
         return response
\ No newline at end of file
@@ -0,0 +1,140 @@
+# reports/services/report_jobs.py
+
+import datetime
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone, translation
+
+from reports.models import ReportJob
+from trips.models import Trip
+from .manifest_generator import ManifestGenerator
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Returns the process-wide worker pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.REPORT_WORKER_THREADS,
+                thread_name_prefix='report-job',
+            )
+        return _executor
+
+
+class ReportJobService:
+    """
+    A service class that renders PDF manifests in a background worker pool.
+    Finished files are cached on disk by trip, language and data version,
+    so asking again for an unchanged manifest is answered from the cache,
+    and a manifest that is already being rendered is not queued a second
+    time.
+    """
+    @staticmethod
+    def cache_path(trip_id, data_version, language):
+        return os.path.join(settings.REPORT_CACHE_DIR, 'manifests', f"trip_{trip_id}_{language}_{data_version}.pdf")
+
+    @classmethod
+    def submit_manifest_pdf(cls, trip, user=None, language=None):
+        """
+        Returns a ReportJob for the trip's current manifest in `language`
+        (default: the active language). The job is already DONE when a
+        cached file exists; otherwise an in-flight job for the same data is
+        reused, or a new one is queued. In-flight jobs older than
+        REPORT_JOB_TIMEOUT_SECONDS are marked FAILED and replaced.
+        """
+        language = language or translation.get_language() or settings.LANGUAGE_CODE
+        with transaction.atomic():
+            # Serializes requests for the same trip, so two clicks at once
+            # share one job instead of rendering the manifest twice.
+            Trip.objects.select_for_update().filter(pk=trip.pk).first()
+            data_version = ManifestGenerator(trip).data_version()
+            path = cls.cache_path(trip.pk, data_version, language)
+            jobs = ReportJob.objects.filter(
+                trip=trip, report_type=ReportJob.ReportType.MANIFEST_PDF,
+                data_version=data_version, language=language
+            )
+
+            if os.path.exists(path):
+                job = jobs.filter(status=ReportJob.Status.DONE).first()
+                if job is None:
+                    job = ReportJob.objects.create(
+                        trip=trip, report_type=ReportJob.ReportType.MANIFEST_PDF, data_version=data_version,
+                        language=language, status=ReportJob.Status.DONE, file_path=path, requested_by=user,
+                        finished_at=timezone.now()
+                    )
+                return job
+
+            in_flight = jobs.filter(status__in=[ReportJob.Status.QUEUED, ReportJob.Status.RUNNING])
+            # The worker pool lives in the web process, so a restart loses its
+            # jobs. One that outlived the deadline is given up and queued anew.
+            deadline = timezone.now() - datetime.timedelta(seconds=settings.REPORT_JOB_TIMEOUT_SECONDS)
+            in_flight.filter(created_at__lt=deadline).update(
+                status=ReportJob.Status.FAILED, error='Timed out before a worker finished it.', finished_at=timezone.now()
+            )
+            job = in_flight.first()
+            if job is not None:
+                return job
+
+            job = ReportJob.objects.create(
+                trip=trip, report_type=ReportJob.ReportType.MANIFEST_PDF,
+                data_version=data_version, language=language, requested_by=user
+            )
+            # Only hand the job to a worker once its row is visible to other connections.
+            transaction.on_commit(lambda: get_executor().submit(cls.run_job, job.pk))
+        return job
+
+    @classmethod
+    def run_job(cls, job_id):
+        """
+        Renders a queued job. Runs in a worker thread, so it manages its own
+        database connection.
+        """
+        close_old_connections()
+        try:
+            updated = ReportJob.objects.filter(pk=job_id, status=ReportJob.Status.QUEUED).update(
+                status=ReportJob.Status.RUNNING
+            )
+            if not updated:
+                return
+            job = ReportJob.objects.select_related('trip').get(pk=job_id)
+            try:
+                path = cls.cache_path(job.trip_id, job.data_version, job.language)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Render to a temporary name and rename, so readers never see
+                # a half-written file. Worker threads have no active language.
+                partial = f"{path}.{job.pk}.part"
+                with translation.override(job.language):
+                    ManifestGenerator(job.trip).render_pdf(partial)
+                os.replace(partial, path)
+                cls._remove_stale_files(job.trip_id, job.language, keep=path)
+            except Exception as e:
+                job.status = ReportJob.Status.FAILED
+                job.error = str(e)[:2000]
+            else:
+                job.status = ReportJob.Status.DONE
+                job.file_path = path
+            job.finished_at = timezone.now()
+            job.save(update_fields=['status', 'file_path', 'error', 'finished_at'])
+        finally:
+            close_old_connections()
+
+    @classmethod
+    def _remove_stale_files(cls, trip_id, language, keep):
+        """Deletes cached manifests of older data versions of the trip in `language`."""
+        directory = os.path.dirname(keep)
+        prefix = f"trip_{trip_id}_{language}_"
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.startswith(prefix) and name.endswith('.pdf') and path != keep:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
@@ -0,0 +1,122 @@
+# reports/tests/test_financial_reports.py
+
+import datetime
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from crm.models import Customer
+from trips.models import Trip, Expense
+from users.models import CustomUser
+from bookings.models import Booking, Payment
+from reports.services.financial_reports import FinancialReportsGenerator
+
+
+class TripProfitabilityReportTest(TestCase):
+    """
+    Tests the single-query profitability figures of FinancialReportsGenerator
+    and the pages and API endpoint built on them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(
+            username='manager', email='manager@test.com', password='pass', role='manager'
+        )
+        now = timezone.now()
+        cls.near_trip = Trip.objects.create(
+            name='Near Trip', departure_date=now + datetime.timedelta(days=10),
+            return_date=now + datetime.timedelta(days=20), total_seats=4, price_per_person=1000
+        )
+        cls.far_trip = Trip.objects.create(
+            name='Far Trip', departure_date=now + datetime.timedelta(days=100),
+            return_date=now + datetime.timedelta(days=110), total_seats=10, price_per_person=2000
+        )
+        cls.empty_trip = Trip.objects.create(
+            name='Empty Trip', departure_date=now + datetime.timedelta(days=50),
+            return_date=now + datetime.timedelta(days=60), total_seats=0, price_per_person=500
+        )
+        customers = [
+            Customer.objects.create(
+                full_name=f'Pilgrim {i}', phone_number=f'700{i}', passport_number=f'F{i}',
+                passport_expiry_date=now.date() + datetime.timedelta(days=365 * 5),
+                date_of_birth=datetime.date(1980, 1, 1)
+            ) for i in range(3)
+        ]
+        paid = Booking.objects.create(customer=customers[0], trip=cls.near_trip, total_amount=1000)
+        Payment.objects.create(booking=paid, amount_paid=600, payment_date=now.date())
+        partly = Booking.objects.create(customer=customers[1], trip=cls.near_trip, total_amount=1000)
+        Payment.objects.create(booking=partly, amount_paid=150, payment_date=now.date())
+        cancelled = Booking.objects.create(
+            customer=customers[2], trip=cls.near_trip, total_amount=1000, status=Booking.Status.CANCELLED
+        )
+        Payment.objects.create(booking=cancelled, amount_paid=999, payment_date=now.date())
+        Expense.objects.create(trip=cls.near_trip, description='Hotel', amount=300)
+        Expense.objects.create(trip=cls.near_trip, description='Bus', amount=100)
+        Expense.objects.create(trip=cls.far_trip, description='Deposit', amount=5000)
+
+    def test_all_trips_are_reported_in_one_query(self):
+        with self.assertNumQueries(1):
+            rows = FinancialReportsGenerator.get_all_trip_profitability()
+        by_name = {row['name']: row for row in rows}
+
+        near = by_name['Near Trip']
+        self.assertEqual(near['total_revenue'], Decimal('750.00'))  # the cancelled booking is excluded
+        self.assertEqual(near['total_expenses'], Decimal('400.00'))
+        self.assertEqual(near['net_profit'], Decimal('350.00'))
+        self.assertEqual(near['expected_revenue'], Decimal('2000.00'))
+        self.assertAlmostEqual(near['occupancy_rate'], 50.0)
+
+        far = by_name['Far Trip']
+        self.assertEqual(far['total_revenue'], Decimal('0'))
+        self.assertEqual(far['net_profit'], Decimal('-5000.00'))
+        self.assertEqual(by_name['Empty Trip']['occupancy_rate'], 0)
+
+    def test_matches_the_single_trip_report(self):
+        report = FinancialReportsGenerator.get_trip_profitability(self.near_trip)
+        self.assertEqual(report['trip_name'], 'Near Trip')
+        self.assertEqual(report['total_revenue'], self.near_trip.get_total_collected())
+        self.assertEqual(report['total_expenses'], self.near_trip.get_total_expenses())
+
+    def test_sorting_and_date_range(self):
+        rows = FinancialReportsGenerator.get_all_trip_profitability(sort='-net_profit')
+        self.assertEqual([r['name'] for r in rows], ['Near Trip', 'Empty Trip', 'Far Trip'])
+
+        # Unknown sort keys fall back to the default order.
+        rows = FinancialReportsGenerator.get_all_trip_profitability(sort='password')
+        self.assertEqual([r['name'] for r in rows], ['Far Trip', 'Empty Trip', 'Near Trip'])
+
+        today = timezone.now().date()
+        rows = FinancialReportsGenerator.get_all_trip_profitability(
+            date_from=today + datetime.timedelta(days=30), date_to=today + datetime.timedelta(days=120)
+        )
+        self.assertEqual({r['name'] for r in rows}, {'Far Trip', 'Empty Trip'})
+
+        # Both bounds are whole days in the current time zone.
+        departure_day = timezone.localdate(self.near_trip.departure_date)
+        rows = FinancialReportsGenerator.get_all_trip_profitability(date_from=departure_day, date_to=departure_day)
+        self.assertEqual([r['name'] for r in rows], ['Near Trip'])
+
+    def test_report_page_and_api(self):
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse('reports:all-trips-profitability'), {'sort': 'name', 'date_from': 'bad'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['name'] for r in response.context['rows']], ['Empty Trip', 'Far Trip', 'Near Trip'])
+        self.assertEqual(response.context['totals']['total_expenses'], Decimal('5400.00'))
+
+        response = self.client.get('/api/v1/trips/trips/profitability/', {'sort': '-occupancy_rate'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['name'], 'Near Trip')
+        self.assertEqual(response.json()[0]['net_profit'], '350.00')
+
+        response = self.client.get('/api/v1/trips/trips/profitability/', {'date_to': '2024-02-30'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_trip_detail_summary(self):
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse('trips:trip-detail', kwargs={'pk': self.near_trip.pk}))
+        summary = response.context['financial_summary']
+        self.assertEqual(summary['total_collected'], Decimal('750.00'))
+        self.assertEqual(summary['net_profit'], Decimal('350.00'))
+        self.assertEqual(summary['expected_revenue'], Decimal('2000.00'))
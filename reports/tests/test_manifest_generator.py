@@ -0,0 +1,69 @@
+# reports/tests/test_manifest_generator.py
+
+import datetime
+from io import BytesIO
+from django.test import TestCase
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from crm.models import Customer
+from trips.models import Trip
+from bookings.models import Booking
+from reports.services.manifest_generator import ManifestGenerator
+
+
+class ManifestGeneratorTest(TestCase):
+    """
+    Tests the streamed Excel passenger manifest.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.trip = Trip.objects.create(
+            name='Manifest Trip',
+            departure_date=timezone.now() + datetime.timedelta(days=30),
+            return_date=timezone.now() + datetime.timedelta(days=40),
+            total_seats=500,
+            price_per_person=1000
+        )
+        customers = Customer.objects.bulk_create([
+            Customer(
+                full_name=f'Pilgrim {i:03d}',
+                phone_number=f'900{i:04d}',
+                passport_number=f'M{i:05d}',
+                passport_expiry_date=timezone.now().date() + datetime.timedelta(days=365 * 5),
+                nationality='Syrian',
+                date_of_birth=datetime.date(1980, 1, 1)
+            ) for i in range(250)
+        ])
+        Booking.objects.bulk_create([
+            Booking(customer=c, trip=cls.trip, total_amount=1000,
+                    status=Booking.Status.CANCELLED if i % 50 == 0 else Booking.Status.CONFIRMED)
+            for i, c in enumerate(customers)
+        ])
+
+    def test_excel_manifest_is_streamed_with_all_active_passengers(self):
+        with self.assertNumQueries(1):
+            response = ManifestGenerator(self.trip).generate_excel()
+
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="manifest_Manifest Trip.xlsx"', response['Content-Disposition'])
+
+        content = b''.join(response.streaming_content)
+        response.close()
+        rows = list(load_workbook(BytesIO(content), read_only=True).active.iter_rows(values_only=True))
+
+        self.assertEqual(list(rows[0]), ManifestGenerator.EXCEL_HEADERS)
+        self.assertEqual(len(rows) - 1, 245)  # 5 of the 250 bookings are cancelled
+        self.assertEqual([r[0] for r in rows[1:4]], [1, 2, 3])
+        self.assertTrue(all(r[3] == 'Syrian' for r in rows[1:]))
+
+    def test_data_version_notices_swapped_bookings(self):
+        version = ManifestGenerator(self.trip).data_version()
+        self.assertEqual(ManifestGenerator(self.trip).data_version(), version)
+
+        # Same number of active bookings and the same sum of their ids.
+        pks = list(Booking.objects.filter(trip=self.trip).order_by('pk').values_list('pk', flat=True))
+        Booking.objects.filter(pk__in=[pks[0], pks[100]]).update(status=Booking.Status.CONFIRMED)
+        Booking.objects.filter(pk__in=[pks[40], pks[60]]).update(status=Booking.Status.CANCELLED)
+        self.assertNotEqual(ManifestGenerator(self.trip).data_version(), version)
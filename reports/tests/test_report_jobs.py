@@ -0,0 +1,156 @@
+# reports/tests/test_report_jobs.py
+
+import datetime
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest.mock
+from django.conf import settings
+from django.db import connection
+from django.test import TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.urls import reverse
+from django.utils import timezone, translation
+
+from crm.models import Customer
+from trips.models import Trip
+from users.models import CustomUser
+from bookings.models import Booking
+from reports.models import ReportJob
+from reports.services.manifest_generator import ManifestGenerator
+from reports.services.report_jobs import ReportJobService
+
+
+class ReportJobServiceTest(TransactionTestCase):
+    """
+    Tests background PDF manifest rendering through the worker pool,
+    including the on-disk cache keyed by trip and data version.
+    """
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        override = override_settings(REPORT_CACHE_DIR=self.cache_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+
+        self.manager = CustomUser.objects.create_user(
+            username='manager', email='manager@test.com', password='password123', role='manager'
+        )
+        self.trip = Trip.objects.create(
+            name='PDF Trip',
+            departure_date=timezone.now() + datetime.timedelta(days=30),
+            return_date=timezone.now() + datetime.timedelta(days=40),
+            total_seats=10,
+            price_per_person=1000
+        )
+        self.customer = Customer.objects.create(
+            full_name='PDF Pilgrim',
+            phone_number='4440001',
+            passport_number='PDF001',
+            passport_expiry_date=timezone.now().date() + datetime.timedelta(days=365),
+            nationality='Syrian',
+            date_of_birth=datetime.date(1975, 5, 5)
+        )
+
+    def wait_for(self, job):
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            job.refresh_from_db()
+            if job.is_finished:
+                return job
+            time.sleep(0.05)
+        self.fail(f"Report job {job.pk} did not finish in time.")
+
+    def test_manifest_is_rendered_once_and_then_served_from_cache(self):
+        job = self.wait_for(ReportJobService.submit_manifest_pdf(self.trip, self.manager))
+        self.assertEqual(job.status, ReportJob.Status.DONE)
+        self.assertTrue(os.path.exists(job.file_path))
+        self.assertIn(f"trip_{self.trip.pk}_en_{job.data_version}", job.file_path)
+
+        # Unchanged data: answered from the cache without a new render.
+        again = ReportJobService.submit_manifest_pdf(self.trip, self.manager)
+        self.assertEqual(again.pk, job.pk)
+        self.assertEqual(ReportJob.objects.count(), 1)
+
+        # A new booking changes the data version and triggers a fresh render;
+        # the outdated file is cleaned up.
+        Booking.objects.create(customer=self.customer, trip=self.trip, total_amount=1000)
+        fresh = self.wait_for(ReportJobService.submit_manifest_pdf(self.trip, self.manager))
+        self.assertNotEqual(fresh.data_version, job.data_version)
+        self.assertFalse(os.path.exists(job.file_path))
+        self.assertTrue(os.path.exists(fresh.file_path))
+
+    def test_each_language_gets_its_own_rendering(self):
+        rendered = []
+
+        def render_pdf(generator, path):
+            rendered.append(translation.get_language())
+            with open(path, 'wb') as handle:
+                handle.write(b'%PDF')
+
+        with unittest.mock.patch.object(ManifestGenerator, 'render_pdf', render_pdf):
+            english = self.wait_for(ReportJobService.submit_manifest_pdf(self.trip, self.manager))
+            with translation.override('ar'):
+                arabic = self.wait_for(ReportJobService.submit_manifest_pdf(self.trip, self.manager))
+        self.assertEqual(rendered, ['en', 'ar'])
+        self.assertEqual((english.language, arabic.language), ('en', 'ar'))
+        # Rendering one language leaves the other's file in place.
+        self.assertTrue(os.path.exists(english.file_path))
+        self.assertNotEqual(english.file_path, arabic.file_path)
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_simultaneous_requests_share_one_job(self):
+        barrier = threading.Barrier(4)
+        jobs = []
+
+        def request():
+            barrier.wait(10)
+            try:
+                jobs.append(ReportJobService.submit_manifest_pdf(self.trip).pk)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=request) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(jobs)), 1)
+        self.wait_for(ReportJob.objects.get(pk=jobs[0]))
+        self.assertEqual(ReportJob.objects.count(), 1)
+
+    def test_job_lost_by_a_restart_is_queued_again(self):
+        # A job left RUNNING by a worker that no longer exists.
+        lost = ReportJob.objects.create(
+            trip=self.trip, report_type=ReportJob.ReportType.MANIFEST_PDF,
+            data_version=ManifestGenerator(self.trip).data_version(), status=ReportJob.Status.RUNNING
+        )
+        self.assertEqual(ReportJobService.submit_manifest_pdf(self.trip).pk, lost.pk)
+
+        ReportJob.objects.filter(pk=lost.pk).update(
+            created_at=timezone.now() - datetime.timedelta(seconds=settings.REPORT_JOB_TIMEOUT_SECONDS + 1)
+        )
+        job = self.wait_for(ReportJobService.submit_manifest_pdf(self.trip))
+        self.assertNotEqual(job.pk, lost.pk)
+        self.assertEqual(job.status, ReportJob.Status.DONE)
+        lost.refresh_from_db()
+        self.assertEqual(lost.status, ReportJob.Status.FAILED)
+
+    def test_submit_and_poll_endpoints(self):
+        self.client.force_login(self.manager)
+        response = self.client.post(reverse('reports:submit-manifest-job'), {'trip_id': self.trip.pk})
+        self.assertIn(response.status_code, (200, 202))
+        job = self.wait_for(ReportJob.objects.get(pk=response.json()['id']))
+
+        status = self.client.get(reverse('reports:job-status', kwargs={'pk': job.pk})).json()
+        self.assertEqual(status['status'], 'done')
+        download = self.client.get(status['download_url'])
+        self.assertEqual(download['Content-Type'], 'application/pdf')
+        download.close()
+
+        # The form on the reports dashboard now gets the cached file directly.
+        response = self.client.post(reverse('reports:generate-manifest'), {'trip_id': self.trip.pk, 'format': 'pdf'})
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        response.close()
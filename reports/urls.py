@@ -4,7 +4,12 @@ from django.urls import path
 from .views import (
     ReportDashboardView,
     GenerateManifestView,
-    TripProfitabilityView
+    TripProfitabilityView,
+    AllTripsProfitabilityView,
+    SubmitManifestJobView,
+    ReportJobDetailView,
+    ReportJobStatusView,
+    ReportJobDownloadView,
 )
 
 app_name = 'reports'
@@ -13,4 +18,9 @@ urlpatterns = [
     path('', ReportDashboardView.as_view(), name='dashboard'),
     path('generate/manifest/', GenerateManifestView.as_view(), name='generate-manifest'),
     path('profitability/', TripProfitabilityView.as_view(), name='trip-profitability'),
+    path('profitability/all/', AllTripsProfitabilityView.as_view(), name='all-trips-profitability'),
+    path('jobs/manifest/', SubmitManifestJobView.as_view(), name='submit-manifest-job'),
+    path('jobs/<int:pk>/', ReportJobDetailView.as_view(), name='job-detail'),
+    path('jobs/<int:pk>/status/', ReportJobStatusView.as_view(), name='job-status'),
+    path('jobs/<int:pk>/download/', ReportJobDownloadView.as_view(), name='job-download'),
 ]
\ No newline at end of file
@@ -1,12 +1,19 @@
 # reports/views.py
 
-from django.views.generic import TemplateView, View
-from django.shortcuts import get_object_or_404
+import os
+
+from django.views.generic import TemplateView, View, DetailView
+from django.shortcuts import get_object_or_404, redirect
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import FileResponse, Http404, JsonResponse
+from django.urls import reverse
+from django.utils.dateparse import parse_date
 
 from trips.models import Trip
+from .models import ReportJob
 from .services.manifest_generator import ManifestGenerator
 from .services.financial_reports import FinancialReportsGenerator
+from .services.report_jobs import ReportJobService
 from users.mixins import ManagerRequiredMixin
 
 class ReportDashboardView(LoginRequiredMixin, ManagerRequiredMixin, TemplateView):
@@ -26,19 +33,92 @@ class ReportDashboardView(LoginRequiredMixin, ManagerRequiredMixin, TemplateView
 class GenerateManifestView(LoginRequiredMixin, ManagerRequiredMixin, View):
     """
     Handles the request to generate and download a passenger manifest.
+    Excel manifests are streamed directly. PDF manifests are rendered by the
+    background worker pool: a cached, up-to-date file is returned at once,
+    otherwise the user is sent to a page that waits for the job.
     Restricted to Managers only.
     """
     def post(self, request, *args, **kwargs):
         trip_id = request.POST.get('trip_id')
         report_format = request.POST.get('format', 'pdf')
         trip = get_object_or_404(Trip, pk=trip_id)
-        
-        generator = ManifestGenerator(trip)
 
         if report_format == 'excel':
-            return generator.generate_excel()
-        else: # Default to PDF
-            return generator.generate_pdf()
+            return ManifestGenerator(trip).generate_excel()
+
+        # Default to PDF
+        job = ReportJobService.submit_manifest_pdf(trip, request.user)
+        if job.status == ReportJob.Status.DONE and os.path.exists(job.file_path):
+            return manifest_file_response(job)
+        return redirect('reports:job-detail', pk=job.pk)
+
+
+def manifest_file_response(job):
+    return FileResponse(
+        open(job.file_path, 'rb'),
+        as_attachment=True,
+        filename=f"manifest_{job.trip.name}.pdf",
+        content_type='application/pdf',
+    )
+
+
+def job_status_payload(job):
+    payload = {
+        'id': job.pk,
+        'trip_id': job.trip_id,
+        'status': job.status,
+        'status_url': reverse('reports:job-status', kwargs={'pk': job.pk}),
+        'download_url': None,
+    }
+    if job.status == ReportJob.Status.DONE:
+        payload['download_url'] = reverse('reports:job-download', kwargs={'pk': job.pk})
+    elif job.status == ReportJob.Status.FAILED:
+        payload['error'] = job.error
+    return payload
+
+
+class SubmitManifestJobView(LoginRequiredMixin, ManagerRequiredMixin, View):
+    """
+    Queues a PDF manifest for background rendering and returns the job's
+    ID and status as JSON. Restricted to Managers only.
+    """
+    def post(self, request, *args, **kwargs):
+        trip = get_object_or_404(Trip, pk=request.POST.get('trip_id'))
+        job = ReportJobService.submit_manifest_pdf(trip, request.user)
+        status_code = 200 if job.is_finished else 202
+        return JsonResponse(job_status_payload(job), status=status_code)
+
+
+class ReportJobStatusView(LoginRequiredMixin, ManagerRequiredMixin, View):
+    """
+    Polling endpoint that reports the status of a background report job.
+    """
+    def get(self, request, *args, **kwargs):
+        job = get_object_or_404(ReportJob, pk=kwargs['pk'])
+        return JsonResponse(job_status_payload(job))
+
+
+class ReportJobDetailView(LoginRequiredMixin, ManagerRequiredMixin, DetailView):
+    """
+    A page that polls a report job and offers the download once it is done.
+    """
+    model = ReportJob
+    template_name = 'reports/report_job.html'
+    context_object_name = 'job'
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('trip')
+
+
+class ReportJobDownloadView(LoginRequiredMixin, ManagerRequiredMixin, View):
+    """
+    Serves the rendered file of a finished report job.
+    """
+    def get(self, request, *args, **kwargs):
+        job = get_object_or_404(ReportJob.objects.select_related('trip'), pk=kwargs['pk'], status=ReportJob.Status.DONE)
+        if not os.path.exists(job.file_path):
+            raise Http404("The report file is no longer available. Please generate it again.")
+        return manifest_file_response(job)
 
 class TripProfitabilityView(LoginRequiredMixin, ManagerRequiredMixin, TemplateView):
     """
@@ -53,4 +133,38 @@ class TripProfitabilityView(LoginRequiredMixin, ManagerRequiredMixin, TemplateVi
         if trip_id:
             trip = get_object_or_404(Trip, pk=trip_id)
             context['report_data'] = FinancialReportsGenerator.get_trip_profitability(trip)
-        return context
\ No newline at end of file
+        return context
+
+def parse_date_param(value):
+    """Parses a YYYY-MM-DD query parameter, ignoring missing or invalid values."""
+    try:
+        return parse_date(value or '')
+    except ValueError:
+        return None
+
+
+class AllTripsProfitabilityView(LoginRequiredMixin, ManagerRequiredMixin, TemplateView):
+    """
+    Compares the profitability of all trips side by side, with optional
+    departure date range and sorting. Restricted to Managers only.
+    """
+    template_name = 'reports/all_trips_profitability.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        params = self.request.GET
+        sort = params.get('sort', FinancialReportsGenerator.DEFAULT_PROFITABILITY_SORT)
+        rows = FinancialReportsGenerator.get_all_trip_profitability(
+            sort=sort,
+            date_from=parse_date_param(params.get('date_from')),
+            date_to=parse_date_param(params.get('date_to')),
+        )
+        context['rows'] = rows
+        context['totals'] = {
+            key: sum(row[key] for row in rows)
+            for key in ('total_revenue', 'total_expenses', 'net_profit', 'expected_revenue')
+        }
+        context['current_sort'] = sort
+        context['date_from'] = params.get('date_from', '')
+        context['date_to'] = params.get('date_to', '')
+        return context
@@ -43,6 +43,7 @@ document.addEventListener("DOMContentLoaded", function() {
     const chatHistory = document.getElementById('ai-chat-history');
     // FIX: Read the URL dynamically from the body data attribute
     const aiAskUrl = document.body.dataset.aiAskUrl;
+    const aiStreamUrl = document.body.dataset.aiStreamUrl;
 
     if (chatForm && aiAskUrl) {
         chatForm.addEventListener('submit', function(e) {
@@ -56,6 +57,11 @@ document.addEventListener("DOMContentLoaded", function() {
 
             const thinkingDiv = appendMessage('', 'ai', true);
 
+            if (aiStreamUrl && window.ReadableStream) {
+                streamAnswer(question, thinkingDiv);
+                return;
+            }
+
             fetch(aiAskUrl, {
                 method: 'POST',
                 headers: {
@@ -87,6 +93,65 @@ document.addEventListener("DOMContentLoaded", function() {
         });
     }
 
+    // Reads the server-sent events of the streaming endpoint and shows
+    // the answer as it arrives.
+    async function streamAnswer(question, thinkingDiv) {
+        const messageContentDiv = thinkingDiv.querySelector('.message-content');
+        let started = false;
+        const show = (text, append) => {
+            if (!started) {
+                messageContentDiv.textContent = '';
+                started = true;
+            }
+            messageContentDiv.textContent = append ? messageContentDiv.textContent + text : text;
+            chatHistory.scrollTop = chatHistory.scrollHeight;
+        };
+
+        try {
+            const response = await fetch(aiStreamUrl, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': getCookie('csrftoken')
+                },
+                body: JSON.stringify({ question: question })
+            });
+            if (!response.ok) {
+                const err = await response.json().catch(() => ({}));
+                show(err.error || 'An unexpected error occurred. Please check the browser console.');
+                return;
+            }
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                    const raw = buffer.slice(0, boundary);
+                    buffer = buffer.slice(boundary + 2);
+                    let event = 'message';
+                    let data = '';
+                    raw.split('\n').forEach(line => {
+                        if (line.startsWith('event:')) event = line.slice(6).trim();
+                        else if (line.startsWith('data:')) data += line.slice(5).trim();
+                    });
+                    if (!data) continue;
+                    const payload = JSON.parse(data);
+                    if (event === 'token') show(payload.text, true);
+                    else if (event === 'error') show(payload.error);
+                }
+            }
+            if (!started) show('No answer received.');
+        } catch (error) {
+            console.error('Error:', error);
+            show('An unexpected error occurred. Please check the browser console.');
+        }
+    }
+
     function appendMessage(text, sender, isThinking = false) {
         const messageWrapper = document.createElement('div');
         messageWrapper.classList.add(sender === 'user' ? 'user-message' : 'ai-message');
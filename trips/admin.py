@@ -41,7 +41,18 @@ class TripAdmin(admin.ModelAdmin):
         }),
     )
 
-    @admin.display(description='Occupancy')
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_occupancy()
+
+    @admin.display(description='Booked seats', ordering='seats_booked')
+    def booked_seats(self, obj):
+        return obj.booked_seats
+
+    @admin.display(description='Available seats', ordering='seats_available')
+    def available_seats(self, obj):
+        return obj.available_seats
+
+    @admin.display(description='Occupancy', ordering='occupancy')
     def occupancy_rate_display(self, obj):
         return f"{obj.occupancy_rate:.2f}%"
 
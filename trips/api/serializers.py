@@ -2,8 +2,9 @@
 
 from rest_framework import serializers
 from trips.models import Trip, Expense
+from core.api.sparse_fieldsets import SparseFieldsetSerializerMixin
 
-class TripSerializer(serializers.ModelSerializer):
+class TripSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Trip model.
     Includes calculated properties for seat availability and occupancy.
@@ -22,9 +23,31 @@ class TripSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = fields
+        field_sources = {
+            'booked_seats': ['booked_seats_count'],
+            'available_seats': ['total_seats', 'booked_seats_count'],
+            'occupancy_rate': ['total_seats', 'booked_seats_count'],
+        }
 
 
-class ExpenseSerializer(serializers.ModelSerializer):
+class TripProfitabilitySerializer(serializers.Serializer):
+    """
+    Read-only serializer for one row of the all-trips profitability report.
+    """
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    departure_date = serializers.DateTimeField()
+    status = serializers.CharField()
+    total_seats = serializers.IntegerField()
+    booked_seats = serializers.IntegerField(source='booked_seats_count')
+    occupancy_rate = serializers.FloatField()
+    expected_revenue = serializers.DecimalField(max_digits=12, decimal_places=2)
+    total_revenue = serializers.DecimalField(max_digits=12, decimal_places=2)
+    total_expenses = serializers.DecimalField(max_digits=12, decimal_places=2)
+    net_profit = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
+class ExpenseSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Expense model.
     Allows creating and viewing expenses related to a trip.
@@ -1,21 +1,53 @@
 # trips/api/viewsets.py
 
+from django.utils.dateparse import parse_date
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from core.api.sparse_fieldsets import SparseFieldsetViewSetMixin
 from trips.models import Trip, Expense
-from .serializers import TripSerializer, ExpenseSerializer
+from reports.services.financial_reports import FinancialReportsGenerator
+from .serializers import TripSerializer, ExpenseSerializer, TripProfitabilitySerializer
 from users.permissions import IsManager
 
-class TripViewSet(viewsets.ReadOnlyModelViewSet):
+class TripViewSet(SparseFieldsetViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows trips to be viewed.
     Access is restricted to authenticated staff users.
     """
-    queryset = Trip.objects.all().order_by('-departure_date')
+    queryset = Trip.objects.with_occupancy().order_by('-departure_date')
     serializer_class = TripSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    @action(detail=False, methods=['get'], serializer_class=TripProfitabilitySerializer,
+            permission_classes=[permissions.IsAuthenticated, IsManager])
+    def profitability(self, request):
+        """
+        Revenue, expenses, net profit, expected revenue and occupancy of
+        every trip, computed in one query. Managers only.
+        Endpoint: /api/v1/trips/trips/profitability/
+        Optional query parameters: sort, date_from, date_to (YYYY-MM-DD).
+        """
+        dates = {}
+        for param in ('date_from', 'date_to'):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                dates[param] = parse_date(value)
+            except ValueError:
+                dates[param] = None
+            if dates[param] is None:
+                raise ValidationError({param: "Enter a valid date in YYYY-MM-DD format."})
 
-class ExpenseViewSet(viewsets.ModelViewSet):
+        rows = FinancialReportsGenerator.get_all_trip_profitability(
+            sort=request.query_params.get('sort'), **dates
+        )
+        return Response(self.get_serializer(rows, many=True).data)
+
+
+class ExpenseViewSet(SparseFieldsetViewSetMixin, viewsets.ModelViewSet):
     """
     API endpoint for viewing and managing trip expenses.
     Access should be limited to Managers and Accountants in a real scenario.
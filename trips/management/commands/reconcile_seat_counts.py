@@ -0,0 +1,61 @@
+# trips/management/commands/reconcile_seat_counts.py
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from bookings.models import Booking
+from trips.models import Trip
+from core.services.dashboard_metrics import DashboardMetrics
+
+
+class Command(BaseCommand):
+    """
+    A Django management command that recounts the non-cancelled bookings of
+    every trip and repairs any drift in the denormalized booked_seats_count.
+    Drift can appear after bulk operations that bypass Booking.save().
+    Usage: python manage.py reconcile_seat_counts [--dry-run]
+    """
+    help = 'Recomputes Trip.booked_seats_count from the bookings table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted trips without writing any changes.',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        fixed = 0
+
+        # A correlated subquery (rather than a JOIN + GROUP BY) so the same
+        # expression can be reused as the value of the corrective UPDATE.
+        actual_booked = Coalesce(Subquery(
+            Booking.objects.filter(trip=OuterRef('pk'))
+            .exclude(status=Booking.Status.CANCELLED)
+            .order_by()
+            .values('trip')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ), 0)
+
+        trips = Trip.objects.annotate(actual_booked=actual_booked).only('id', 'name', 'booked_seats_count')
+        for trip in trips:
+            if trip.booked_seats_count == trip.actual_booked:
+                continue
+            fixed += 1
+            self.stdout.write(
+                f"{trip.name}: stored {trip.booked_seats_count}, actual {trip.actual_booked}"
+            )
+            if not dry_run:
+                # Recomputed inside the UPDATE so bookings made since the
+                # read above are taken into account.
+                Trip.objects.filter(pk=trip.pk).update(booked_seats_count=actual_booked)
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"{fixed} trip(s) have drifted seat counters (dry run)."))
+        else:
+            if fixed:
+                DashboardMetrics.invalidate()
+            self.stdout.write(self.style.SUCCESS(f"Reconciled seat counters for {fixed} trip(s)."))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:47
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_booked_seats_count(apps, schema_editor):
+    Trip = apps.get_model("trips", "Trip")
+    trips = Trip.objects.annotate(
+        actual=Count("bookings", filter=~Q(bookings__status="cancelled"))
+    )
+    for trip in trips.iterator():
+        if trip.actual:
+            Trip.objects.filter(pk=trip.pk).update(booked_seats_count=trip.actual)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trips", "0004_remove_expense_category_alter_expense_description"),
+        ("bookings", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="trip",
+            name="booked_seats_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Booked Seats"
+            ),
+        ),
+        migrations.RunPython(populate_booked_seats_count, migrations.RunPython.noop),
+    ]
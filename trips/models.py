@@ -1,11 +1,33 @@
 # trips/models.py
 
 from django.db import models
-from django.db.models import Sum
+from django.db.models import Case, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 
+class TripQuerySet(models.QuerySet):
+    """
+    Custom queryset for trips.
+    """
+    def with_occupancy(self):
+        """
+        Annotates seats_booked, seats_available and occupancy in the same
+        query that loads the trips, so they can also be filtered and
+        ordered on. The Trip properties read these when present.
+        """
+        return self.annotate(
+            seats_booked=F('booked_seats_count'),
+            seats_available=F('total_seats') - F('booked_seats_count'),
+            occupancy=Case(
+                When(total_seats=0, then=Value(0.0)),
+                default=Cast('booked_seats_count', FloatField()) * Value(100.0) / F('total_seats'),
+                output_field=FloatField(),
+            ),
+        )
+
+
 class Trip(models.Model):
     """
     Represents a Hajj or Umrah trip package.
@@ -32,26 +54,75 @@ class Trip(models.Model):
     )
     hotel_details = models.TextField(_("Hotel Details"), null=True, blank=True)
     flight_details = models.TextField(_("Flight Details"), null=True, blank=True)
+    # Denormalized count of non-cancelled bookings, maintained by Booking.save()
+    # so that listings do not have to COUNT the bookings of every trip.
+    booked_seats_count = models.PositiveIntegerField(_("Booked Seats"), default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TripQuerySet.as_manager()
+
+    OCCUPANCY_ANNOTATIONS = ('seats_booked', 'seats_available', 'occupancy')
+
     def __str__(self):
         return f"{self.name} ({self.departure_date.strftime('%Y-%m-%d')})"
 
+    def save(self, *args, **kwargs):
+        # The seat counter is only changed through adjust_booked_seats();
+        # never write back a possibly stale in-memory copy of it.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != 'booked_seats_count' and f.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+    def clear_occupancy_annotations(self):
+        """Drops with_occupancy() values once the seat counter has moved on."""
+        for name in self.OCCUPANCY_ANNOTATIONS:
+            self.__dict__.pop(name, None)
+
+    def refresh_from_db(self, *args, **kwargs):
+        self.clear_occupancy_annotations()
+        super().refresh_from_db(*args, **kwargs)
+
+    # The seat properties prefer the values annotated by
+    # TripQuerySet.with_occupancy() and fall back to the stored columns.
     @property
     def booked_seats(self):
-        return self.bookings.exclude(status='cancelled').count()
+        if 'seats_booked' in self.__dict__:
+            return self.seats_booked
+        return self.booked_seats_count
 
     @property
     def available_seats(self):
+        if 'seats_available' in self.__dict__:
+            return self.seats_available
         return self.total_seats - self.booked_seats
 
     @property
     def occupancy_rate(self):
+        if 'occupancy' in self.__dict__:
+            return self.occupancy
         if self.total_seats == 0:
             return 0
         return (self.booked_seats / self.total_seats) * 100
 
+    @classmethod
+    def adjust_booked_seats(cls, trip_id, delta):
+        """
+        Shifts the persisted seat counter of a trip by `delta` while holding
+        a row lock on it. Must be called inside a transaction.
+        Returns the new counter value, or None if the trip no longer exists.
+        """
+        locked = cls.objects.select_for_update().only('booked_seats_count').filter(pk=trip_id).first()
+        if locked is None:
+            return None
+        new_count = max(locked.booked_seats_count + delta, 0)
+        cls.objects.filter(pk=trip_id).update(booked_seats_count=new_count)
+        return new_count
+
     def get_total_collected(self):
         return self.bookings.exclude(status='cancelled').aggregate(
             total=Sum('payments__amount_paid')
@@ -70,6 +141,11 @@ class Trip(models.Model):
         verbose_name = _("Trip")
         verbose_name_plural = _("Trips")
         ordering = ['departure_date']
+        indexes = [
+            # Upcoming and active trips: the dashboards, the booking wizard
+            # and seat availability.
+            models.Index(fields=['status', 'departure_date'], name='trip_status_departure_idx'),
+        ]
 
 
 class Expense(models.Model):
@@ -89,4 +165,8 @@ class Expense(models.Model):
     class Meta:
         verbose_name = _("Expense")
         verbose_name_plural = _("Expenses")
-        ordering = ['-expense_date']
\ No newline at end of file
+        ordering = ['-expense_date']
+        indexes = [
+            # Monthly expense totals on the accountant dashboard and reports.
+            models.Index(fields=['expense_date', 'amount'], name='expense_date_idx'),
+        ]
@@ -1,5 +1,7 @@
 # trips/tests/test_models.py
 
+from io import StringIO
+from django.core.management import call_command
 from django.test import TestCase
 from django.utils import timezone
 from django.core.exceptions import ValidationError
@@ -94,4 +96,146 @@ class TripModelTest(TestCase):
                 total_seats=5,
                 price_per_person=100
             )
-            trip_with_error.full_clean() # full_clean() must be called to trigger validation
\ No newline at end of file
+            trip_with_error.full_clean() # full_clean() must be called to trigger validation
+
+    def test_booked_seats_reads_persisted_counter(self):
+        """
+        Tests that the occupancy properties are served from the denormalized
+        counter without querying the bookings table.
+        """
+        trip = Trip.objects.get(pk=self.trip.pk)
+        self.assertEqual(trip.booked_seats_count, 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(trip.booked_seats, 2)
+            self.assertEqual(trip.available_seats, 8)
+            self.assertEqual(trip.occupancy_rate, 20.0)
+
+    def test_counter_follows_uncancel_move_and_delete(self):
+        """
+        Tests that un-cancelling, moving and deleting a booking keep the
+        seat counters of the affected trips correct.
+        """
+        other_trip = Trip.objects.create(
+            name='Hajj 2026',
+            departure_date=self.trip.departure_date,
+            return_date=self.trip.return_date,
+            total_seats=5,
+            price_per_person=9000.00
+        )
+        booking = Booking.objects.get(customer=self.customer1)
+        booking.status = Booking.Status.CANCELLED
+        booking.save()
+        booking.status = Booking.Status.PENDING_PAYMENT
+        booking.save()
+        self.trip.refresh_from_db()
+        self.assertEqual(self.trip.booked_seats, 2)
+
+        booking.trip = other_trip
+        booking.save()
+        self.trip.refresh_from_db()
+        other_trip.refresh_from_db()
+        self.assertEqual(self.trip.booked_seats, 1)
+        self.assertEqual(other_trip.booked_seats, 1)
+
+        booking.delete()
+        other_trip.refresh_from_db()
+        self.assertEqual(other_trip.booked_seats, 0)
+
+    def test_cancelling_through_stale_copies_frees_one_seat(self):
+        """
+        Tests that two requests cancelling the same booking, each with its
+        own copy loaded before the other saved, free its seat only once.
+        """
+        first = Booking.objects.get(customer=self.customer1)
+        second = Booking.objects.get(customer=self.customer1)
+        for copy in (first, second):
+            copy.status = Booking.Status.CANCELLED
+            copy.save()
+        self.trip.refresh_from_db()
+        self.assertEqual(self.trip.booked_seats, 1)
+
+    def test_reconcile_seat_counts_command(self):
+        """
+        Tests that the reconcile command repairs a drifted counter.
+        """
+        Trip.objects.filter(pk=self.trip.pk).update(booked_seats_count=7)
+        call_command('reconcile_seat_counts', stdout=StringIO())
+        self.trip.refresh_from_db()
+        self.assertEqual(self.trip.booked_seats, 2)
+
+    def test_saving_stale_trip_keeps_seat_counter(self):
+        """
+        Tests that saving a trip loaded before a booking was made does not
+        overwrite the seat counter with its stale value.
+        """
+        stale_trip = Trip.objects.get(pk=self.trip.pk)
+        customer = Customer.objects.create(
+            full_name='Test Customer Three',
+            phone_number='333333',
+            passport_number='P333',
+            passport_expiry_date=timezone.now().date() + datetime.timedelta(days=365),
+            date_of_birth=timezone.now().date() - datetime.timedelta(days=365 * 50)
+        )
+        Booking.objects.create(customer=customer, trip=self.trip, total_amount=2500.00, created_by=self.user)
+
+        stale_trip.name = 'Umrah Ramadhan 2026 (Renamed)'
+        stale_trip.save()
+        self.trip.refresh_from_db()
+        self.assertEqual(self.trip.name, 'Umrah Ramadhan 2026 (Renamed)')
+        self.assertEqual(self.trip.booked_seats, 3)
+
+
+class TripOccupancyQuerySetTest(TestCase):
+    """
+    Tests TripQuerySet.with_occupancy() and the properties that read it.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agent = CustomUser.objects.create_user(username='occupancy_agent', email='occ@test.com', role='agent')
+        departure = timezone.now() + datetime.timedelta(days=30)
+        cls.trips = [
+            Trip.objects.create(
+                name=f'Occupancy Trip {i}', departure_date=departure,
+                return_date=departure + datetime.timedelta(days=10),
+                total_seats=4, price_per_person=1000
+            ) for i in range(3)
+        ]
+        for i in range(3):
+            customer = Customer.objects.create(
+                full_name=f'Occupancy Customer {i}', phone_number=f'4440{i}', passport_number=f'O{i}',
+                passport_expiry_date=timezone.now().date() + datetime.timedelta(days=365 * 2),
+                date_of_birth=timezone.now().date() - datetime.timedelta(days=365 * 30)
+            )
+            Booking.objects.create(customer=customer, trip=cls.trips[0], total_amount=1000)
+        Trip.objects.create(
+            name='Closed Trip', departure_date=departure, return_date=departure + datetime.timedelta(days=1),
+            total_seats=0, price_per_person=1
+        )
+
+    def test_annotations_are_loaded_with_the_trips(self):
+        with self.assertNumQueries(1):
+            trips = {t.name: t for t in Trip.objects.with_occupancy()}
+            self.assertEqual(trips['Occupancy Trip 0'].booked_seats, 3)
+            self.assertEqual(trips['Occupancy Trip 0'].available_seats, 1)
+            self.assertEqual(trips['Occupancy Trip 0'].occupancy_rate, 75.0)
+            self.assertEqual(trips['Occupancy Trip 1'].available_seats, 4)
+            self.assertEqual(trips['Closed Trip'].occupancy_rate, 0)
+
+    def test_annotations_can_be_filtered_on(self):
+        full_or_closed = Trip.objects.with_occupancy().filter(seats_available__lte=0)
+        self.assertEqual([t.name for t in full_or_closed], ['Closed Trip'])
+        busiest = Trip.objects.with_occupancy().order_by('-occupancy').first()
+        self.assertEqual(busiest, self.trips[0])
+
+    def test_stale_annotations_are_dropped(self):
+        trip = Trip.objects.with_occupancy().get(pk=self.trips[1].pk)
+        customer = Customer.objects.get(phone_number='44400')
+        booking = Booking(customer=customer, trip=trip, total_amount=1000)
+        booking.save()
+        self.assertEqual(trip.available_seats, 3)
+
+        trip = Trip.objects.with_occupancy().get(pk=self.trips[1].pk)
+        Booking.objects.filter(pk=booking.pk).delete()
+        trip.refresh_from_db()
+        self.assertEqual(trip.booked_seats, 0)
@@ -9,6 +9,7 @@ from django.contrib import messages
 from .models import Trip
 from .forms import TripForm
 from bookings.models import Booking
+from reports.services.financial_reports import FinancialReportsGenerator
 from users.mixins import ManagerRequiredMixin
 
 class TripListView(LoginRequiredMixin, ListView):
@@ -22,7 +23,7 @@ class TripListView(LoginRequiredMixin, ListView):
     paginate_by = 10
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().with_occupancy()
         status = self.request.GET.get('status')
         if status in [s[0] for s in Trip.Status.choices]:
             queryset = queryset.filter(status=status)
@@ -45,23 +46,20 @@ class TripDetailView(LoginRequiredMixin, DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        trip = self.get_object()
+        trip = self.object
 
         # Get all non-cancelled bookings for this trip.
-        registered_travelers = trip.bookings.exclude(status='cancelled')
-        
-        # Financial Calculations are now handled by methods on the Trip model itself.
-        total_collected = trip.get_total_collected()
-        total_expenses = trip.get_total_expenses()
-        net_profit = total_collected - total_expenses
-        expected_revenue = trip.price_per_person * trip.booked_seats
-        
+        registered_travelers = trip.bookings.exclude(status='cancelled').select_related('customer')
+
+        # Revenue, expenses, profit and expected revenue come from one annotated query.
+        report = FinancialReportsGenerator.get_trip_profitability(trip)
+
         context['registered_travelers'] = registered_travelers
         context['financial_summary'] = {
-            'expected_revenue': expected_revenue,
-            'total_collected': total_collected,
-            'total_expenses': total_expenses,
-            'net_profit': net_profit
+            'expected_revenue': report['expected_revenue'],
+            'total_collected': report['total_revenue'],
+            'total_expenses': report['total_expenses'],
+            'net_profit': report['net_profit']
         }
         return context
 